@@ -0,0 +1,25 @@
+from collections import defaultdict
+
+
+class GroupedMean:
+    """
+    Running mean per group key, folded from pre-aggregated (sum, count)
+    groups such as summary-table rows, so pooling groups (e.g. subjects that
+    share an acronym) weights each by its number of scores.
+    """
+
+    def __init__(self):
+        self.sums = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    def add_sum(self, key, total, count):
+        """Folds a pre-aggregated group (e.g. a summary-table row) of count values summing to total."""
+        if not count:
+            return
+        self.sums[key] += total
+        self.counts[key] += count
+
+    def means(self):
+        """Returns {key: mean} for every key that has at least one value."""
+        return {key: self.sums[key] / count for key, count in self.counts.items()}
+
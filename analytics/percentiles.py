@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from database.subjects import subject_acronym
+
+
+class PercentileEngine:
+    """
+    Class-wide percentile ranks for comparative analysis.
+
+    Scores are loaded once per semester from (enrolment_id, subject, total_score)
+    rows. Each (semester, acronym) gets a sorted NumPy array, so a single lookup
+    is a binary search and ranking a whole semester is one vectorized pass
+    instead of a sort-and-scan per student per subject.
+
+    The percentile of a score is the share of the class scoring at or below it,
+    e.g. 90 means the student is at or above 90% of the class.
+    """
+
+    def __init__(self):
+        self._frames = {}   # semester -> DataFrame(enrolment_id, subject, acronym, total_score)
+        self._sorted = {}   # (semester, acronym) -> sorted float array
+        self._ranked = {}   # semester -> ranked DataFrame indexed by enrolment_id
+
+    @classmethod
+    def from_class_scores(cls, class_scores):
+        """Builds an engine from {semester: [(enrolment_id, subject, total_score), ...]}."""
+        engine = cls()
+        for semester, rows in class_scores.items():
+            engine.add_semester(semester, rows)
+        return engine
+
+    def add_semester(self, semester, rows):
+        """
+        Loads a semester's class scores: (enrolment_id, subject, total_score)
+        rows, or a DataFrame with those columns (e.g. GradebookSnapshot.semester_scores).
+        """
+        df = pd.DataFrame(rows, columns=['enrolment_id', 'subject', 'total_score'])
+        df = df.dropna(subset=['total_score'])
+        df['total_score'] = df['total_score'].astype(float)
+        # Acronyms are looked up once per distinct subject, not once per row.
+        acronyms = {subject: subject_acronym(subject) for subject in df['subject'].unique()}
+        df['acronym'] = df['subject'].map(acronyms)
+
+        self._frames[semester] = df
+        self._ranked.pop(semester, None)
+        for key in [k for k in self._sorted if k[0] == semester]:
+            del self._sorted[key]
+        for acronym, group in df.groupby('acronym'):
+            self._sorted[(semester, acronym)] = np.sort(group['total_score'].to_numpy())
+
+    def has_semester(self, semester):
+        return semester in self._frames and not self._frames[semester].empty
+
+    def percentile(self, semester, acronym, score):
+        """Percentile rank of one score, or None if the class has no scores for that subject."""
+        scores = self._sorted.get((semester, acronym))
+        if scores is None or len(scores) == 0:
+            return None
+        return float(np.searchsorted(scores, score, side='right')) / len(scores) * 100
+
+    def percentiles(self, semester, acronym, scores):
+        """Percentile ranks of many scores for the same subject in one call."""
+        sorted_scores = self._sorted.get((semester, acronym))
+        scores = np.asarray(scores, dtype=float)
+        if sorted_scores is None or len(sorted_scores) == 0:
+            return np.full(scores.shape, np.nan)
+        return np.searchsorted(sorted_scores, scores, side='right') / len(sorted_scores) * 100
+
+    def rank_semester(self, semester):
+        """
+        Percentile rank and class average for every score row of a semester,
+        computed in one vectorized pass. Returns a DataFrame indexed by
+        enrolment_id with columns: subject, acronym, total_score, avg_score, percentile.
+        The result is cached until the semester is reloaded.
+        """
+        if semester in self._ranked:
+            return self._ranked[semester]
+
+        df = self._frames.get(semester)
+        if df is None or df.empty:
+            ranked = pd.DataFrame(columns=['subject', 'acronym', 'total_score', 'avg_score', 'percentile'])
+            ranked.index.name = 'enrolment_id'
+            self._ranked[semester] = ranked
+            return ranked
+
+        codes, uniques = pd.factorize(df['acronym'], sort=True)
+        scores = df['total_score'].to_numpy()
+
+        # Offset each subject's scores into its own non-overlapping band so a
+        # single sorted array + searchsorted ranks every group at once.
+        low = scores.min()
+        band = scores.max() - low + 1.0
+        keys = codes * band + (scores - low)
+        sorted_keys = np.sort(keys)
+        at_or_below = np.searchsorted(sorted_keys, keys, side='right')
+        group_start = np.searchsorted(sorted_keys, codes * band, side='left')
+        group_size = np.bincount(codes, minlength=len(uniques))[codes]
+        group_mean = (np.bincount(codes, weights=scores, minlength=len(uniques))
+                      / np.bincount(codes, minlength=len(uniques)))[codes]
+
+        ranked = df.assign(
+            avg_score=group_mean,
+            percentile=(at_or_below - group_start) / group_size * 100
+        ).set_index('enrolment_id').sort_index()
+        self._ranked[semester] = ranked
+        return ranked
+
+    def student_comparison(self, semester, enrolment_id):
+        """
+        The student's scores in a semester next to the class average and their
+        percentile rank, one row per subject sorted by acronym:
+          DataFrame(acronym, total_score, avg_score, percentile)
+        Empty if the student has no scores that semester.
+        """
+        ranked = self.rank_semester(semester)
+        columns = ['acronym', 'total_score', 'avg_score', 'percentile']
+        if enrolment_id not in ranked.index:
+            return pd.DataFrame(columns=columns)
+        rows = ranked.loc[[enrolment_id], columns]
+        return rows.sort_values('acronym').reset_index(drop=True)
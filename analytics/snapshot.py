@@ -0,0 +1,263 @@
+"""
+Memory-mapped columnar snapshot of student_scores for analytics.
+
+export_snapshot() writes the table once as typed NumPy arrays, one .npy
+file per column. GradebookSnapshot.open() memory-maps them, so opening a
+snapshot costs almost nothing and every process reading the same snapshot
+shares the operating system's page cache. Nothing is fetched from the
+database or parsed into Python tuples.
+
+Directory layout:
+  CURRENT              name of the version directory to read
+  snapshot-<n>/        one export:
+    manifest.json      format version, row count, creation time, subject names
+                       and the row range of every (semester, subject) group
+    enrolments.npy     enrolment_id dictionary (fixed-width unicode), sorted
+    enrolment.npy      int32 code into enrolments.npy, one per score row
+    subject.npy        int16 code into manifest["subjects"]
+    semester.npy       int8
+    t1.npy .. t4.npy   float32, NaN where the test is NULL
+    total.npy          float32, NaN where total_score is NULL
+
+Rows are sorted by (semester, subject, enrolment_id), so each (semester,
+subject) group is one contiguous slice.
+
+A re-export writes a new version directory and then replaces CURRENT with
+a single os.replace(), so a reader opening the snapshot at any moment
+finds either the old export or the new one, never none or a mix of both.
+
+A snapshot is a point-in-time copy: re-export it (`python main.py snapshot`)
+to pick up later edits. Set APT_ANALYTICS_SNAPSHOT to a snapshot directory
+to make the class trends and comparative analysis read from it.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+SNAPSHOT_FORMAT = 1
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+VERSION_PREFIX = "snapshot-"
+SCORE_COLUMNS = ["t1", "t2", "t3", "t4", "total"]
+
+
+def export_snapshot(db, directory, itersize=None):
+    """
+    Writes student_scores from db (any storage backend) as a new version
+    of the snapshot in directory and points CURRENT at it. Readers that
+    already have the old version open keep reading it; it is deleted at the
+    export after this one. Returns the manifest dict.
+    """
+    enrolment_codes = {}
+    subject_codes = {}
+    chunks = {name: [] for name in ["enrolment", "subject", "semester"] + SCORE_COLUMNS}
+    for rows in db.iter_all_student_scores(itersize=itersize):
+        # rows -> (enrolment_id, subject, T1, T2, T3, T4, total_score, semester)
+        chunks["enrolment"].append(np.fromiter(
+            (enrolment_codes.setdefault(r[0], len(enrolment_codes)) for r in rows), np.int32, len(rows)))
+        chunks["subject"].append(np.fromiter(
+            (subject_codes.setdefault(r[1], len(subject_codes)) for r in rows), np.int16, len(rows)))
+        chunks["semester"].append(np.fromiter((r[7] for r in rows), np.int8, len(rows)))
+        for i, name in enumerate(SCORE_COLUMNS, start=2):
+            chunks[name].append(np.array([r[i] for r in rows], dtype=np.float32))
+
+    columns = {
+        name: np.concatenate(parts) if parts else np.empty(0, np.float32 if name in SCORE_COLUMNS else np.int32)
+        for name, parts in chunks.items()
+    }
+    columns["semester"] = columns["semester"].astype(np.int8)
+    columns["subject"] = columns["subject"].astype(np.int16)
+    columns["enrolment"] = columns["enrolment"].astype(np.int32)
+
+    # Renumber both dictionaries in sorted order, so code order is name order.
+    enrolments = sorted(enrolment_codes)
+    subjects = sorted(subject_codes)
+    enrolment_remap = np.empty(len(enrolments), np.int32)
+    enrolment_remap[[enrolment_codes[e] for e in enrolments]] = np.arange(len(enrolments), dtype=np.int32)
+    subject_remap = np.empty(len(subjects), np.int16)
+    subject_remap[[subject_codes[s] for s in subjects]] = np.arange(len(subjects), dtype=np.int16)
+    columns["enrolment"] = enrolment_remap[columns["enrolment"]]
+    columns["subject"] = subject_remap[columns["subject"]]
+
+    order = np.lexsort((columns["enrolment"], columns["subject"], columns["semester"]))
+    columns = {name: values[order] for name, values in columns.items()}
+
+    groups = []
+    if len(order):
+        keys = columns["semester"].astype(np.int32) * 65536 + columns["subject"]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        groups = [[int(columns["semester"][s]), int(columns["subject"][s]), int(s), int(e)]
+                  for s, e in zip(starts, ends)]
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "rows": int(len(order)),
+        "subjects": subjects,
+        "groups": groups,  # [semester, subject_code, start_row, end_row]
+    }
+
+    directory = os.path.abspath(directory)
+    version_dir = os.path.join(directory, f"{VERSION_PREFIX}{time.time_ns()}")
+    os.makedirs(version_dir)
+    np.save(os.path.join(version_dir, "enrolments.npy"),
+            np.array(enrolments, dtype=f"<U{max((len(e) for e in enrolments), default=1)}"))
+    for name, values in columns.items():
+        np.save(os.path.join(version_dir, f"{name}.npy"), values)
+    with open(os.path.join(version_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+    previous = _current_version(directory)
+    tmp_path = os.path.join(directory, f"{CURRENT}.tmp-{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        f.write(os.path.basename(version_dir))
+    os.replace(tmp_path, os.path.join(directory, CURRENT))
+
+    # Keep the version just replaced, which a reader may have looked up an
+    # instant ago, and delete older ones (and any left by a failed export).
+    keep = {version_dir, previous}
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry.startswith(VERSION_PREFIX) and path not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+        elif directory not in keep and (entry == MANIFEST or entry.endswith(".npy")):
+            try:
+                os.remove(path)  # an unversioned snapshot from before CURRENT
+            except OSError:
+                pass
+    return manifest
+
+
+def _current_version(directory):
+    """
+    The version directory CURRENT names, or directory itself for a snapshot
+    exported before versions were kept side by side.
+    """
+    try:
+        with open(os.path.join(directory, CURRENT)) as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return directory
+
+
+class GradebookSnapshot:
+    """A read-only, memory-mapped view of a snapshot directory."""
+
+    def __init__(self, directory, manifest, columns, enrolments):
+        self.directory = directory
+        self.manifest = manifest
+        self.columns = columns
+        self.enrolments = enrolments
+        self.subjects = np.array(manifest["subjects"], dtype=object)
+
+    @classmethod
+    def open(cls, directory):
+        while True:
+            version_dir = _current_version(directory)
+            try:
+                return cls._open_version(version_dir)
+            except FileNotFoundError:
+                # Deleted by re-exports since CURRENT was read; read it again.
+                if _current_version(directory) == version_dir:
+                    raise
+
+    @classmethod
+    def _open_version(cls, directory):
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r} in {directory}")
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in ["enrolment", "subject", "semester"] + SCORE_COLUMNS
+        }
+        enrolments = np.load(os.path.join(directory, "enrolments.npy"), mmap_mode="r")
+        return cls(directory, manifest, columns, enrolments)
+
+    @property
+    def rows(self):
+        return self.manifest["rows"]
+
+    @property
+    def created_at(self):
+        return self.manifest["created_at"]
+
+    def _groups(self, semester=None):
+        for sem, subject_code, start, end in self.manifest["groups"]:
+            if semester is None or sem == semester:
+                yield sem, self.subjects[subject_code], start, end
+
+    def class_subject_summary(self, semester=None):
+        """
+        Same rows as StorageBackend.fetch_class_subject_summary, computed
+        from the snapshot:
+          (semester, subject, score_count, score_sum, avg_score, min_score, max_score, stddev_score)
+        """
+        total = self.columns["total"]
+        summary = []
+        for sem, subject, start, end in self._groups(semester):
+            scores = total[start:end]
+            scores = scores[~np.isnan(scores)].astype(np.float64)
+            count = len(scores)
+            if count:
+                score_sum = scores.sum()
+                mean = score_sum / count
+                stddev = float(np.sqrt(max((scores * scores).sum() / count - mean * mean, 0.0)))
+                summary.append((sem, subject, count, int(score_sum), float(mean),
+                                int(scores.min()), int(scores.max()), stddev))
+            else:
+                summary.append((sem, subject, 0, 0, None, None, None, None))
+        return summary
+
+    def semester_scores(self, semester):
+        """
+        The rows of StorageBackend.fetch_semester_scores_all_students as a
+        DataFrame(enrolment_id, subject, total_score), ordered by subject;
+        total_score is NaN where it is NULL. PercentileEngine.add_semester
+        accepts it directly.
+        """
+        import pandas as pd
+
+        groups = list(self._groups(semester))
+        if not groups:
+            return pd.DataFrame(columns=["enrolment_id", "subject", "total_score"])
+        # A semester's groups are contiguous too.
+        start, end = groups[0][2], groups[-1][3]
+        return pd.DataFrame({
+            "enrolment_id": self.enrolments[self.columns["enrolment"][start:end]].astype(object),
+            "subject": self.subjects[self.columns["subject"][start:end]],
+            "total_score": self.columns["total"][start:end].astype(np.float64),
+        })
+
+
+_snapshot = None
+_snapshot_key = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    """
+    Returns the snapshot named by APT_ANALYTICS_SNAPSHOT, or None if the
+    variable is unset or the directory holds no snapshot. The open snapshot
+    is reused until the directory is re-exported.
+    """
+    global _snapshot, _snapshot_key
+    directory = os.environ.get("APT_ANALYTICS_SNAPSHOT")
+    if not directory:
+        return None
+    try:
+        version_dir = _current_version(directory)
+        key = (version_dir, os.stat(os.path.join(version_dir, MANIFEST)).st_mtime_ns)
+    except OSError:
+        return None
+    with _snapshot_lock:
+        if _snapshot_key != key:
+            _snapshot = GradebookSnapshot.open(version_dir)
+            _snapshot_key = key
+        return _snapshot
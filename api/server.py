@@ -0,0 +1,424 @@
+"""
+Read-only JSON HTTP API for students' scores.
+
+Lets students (and scripts) read their scores without the interactive CLI
+or matplotlib. Endpoints:
+
+  POST /api/login      {"role": "student" | "faculty", "id": ..., "password": ...}
+                       -> {"token": ..., "expires_at": ...}
+  POST /api/logout     revokes the bearer token
+  GET  /api/students/<enrolment_id>/scores[?semester=N]
+  GET  /api/students/<enrolment_id>/comparison?semester=N
+                       scores next to the class average and percentile rank
+  GET  /api/health     {"status": "ok", "data_version": ...}
+
+Reads need "Authorization: Bearer <token>" with a session token from
+/api/login (see auth/sessions.py). A student token only gives access to
+that student's data; a faculty token gives access to every student's.
+
+Every response carries an ETag derived from the data version, a number
+that moves on every change to students, student_scores or subjects (see
+migrations/0005_data_version.sql). On PostgreSQL the server LISTENs for
+committed changes and takes a new version after each; other backends are
+polled at most every
+APT_API_VERSION_POLL seconds. A request whose If-None-Match still matches
+gets 304 Not Modified without a query. Responses and the per-semester
+class rankings behind /comparison are cached in memory until the version
+changes, so many students polling at once cost one query per change.
+
+Start it with `python main.py serve`. Settings (environment variables):
+  APT_API_HOST           interface to bind (default 127.0.0.1)
+  APT_API_PORT           port (default 8080)
+  APT_API_CACHE_ENTRIES  responses kept in memory (default 4096)
+  APT_API_VERSION_POLL   seconds between data version checks without LISTEN (default 1)
+"""
+import json
+import os
+import re
+import select
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from analytics.percentiles import PercentileEngine
+from auth.faculty_auth import faculty_login
+from auth.sessions import get_login_throttle, get_sessions
+from auth.student_auth import student_login
+from database.subjects import load_subject_acronyms, subject_acronym
+from utils.error_handling import log_error
+
+DEFAULT_HOST = os.environ.get("APT_API_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.environ.get("APT_API_PORT", "8080"))
+CACHE_ENTRIES = int(os.environ.get("APT_API_CACHE_ENTRIES", "4096"))
+VERSION_POLL_INTERVAL = float(os.environ.get("APT_API_VERSION_POLL", "1"))
+
+# Bump when a response format changes, so clients' old ETags stop matching.
+API_FORMAT_VERSION = 1
+
+# Seconds between liveness checks of the LISTEN connection, and before
+# reconnecting after it failed.
+LISTEN_PING_INTERVAL = 10
+LISTEN_RETRY_INTERVAL = 5
+
+MAX_BODY_BYTES = 4096
+
+STUDENT_PATH = re.compile(r"^/api/students/([^/]+)/(scores|comparison)$")
+
+
+class DataVersion:
+    """
+    The current data version, or None while it is unknown (responses are
+    then neither cached nor given an ETag).
+
+    For DBOperations a background thread LISTENs on DATA_VERSION_CHANNEL
+    and, after each batch of commit notifications, draws the version from
+    the data version sequence. A value drawn after the commit is higher than
+    any version a reader could have used before it, which a value taken
+    from the writer would not be once writers commit out of order. Reading
+    the version costs nothing. Other backends are asked with
+    fetch_data_version() at most every poll_interval seconds.
+    """
+
+    def __init__(self, db, poll_interval=VERSION_POLL_INTERVAL):
+        from database.db_operations import DBOperations
+
+        self.db = db
+        self.poll_interval = poll_interval
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._listening = isinstance(db, DBOperations)
+        if self._listening:
+            threading.Thread(target=self._listen, name="data-version-listener", daemon=True).start()
+
+    def current(self):
+        if self._listening:
+            return self._version
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.poll_interval:
+            version = self.db.fetch_data_version()
+            with self._lock:
+                self._version, self._checked_at = version, now
+        return self._version
+
+    def stop(self):
+        self._stopped.set()
+
+    def _listen(self):
+        from database.db_operations import DATA_VERSION_CHANNEL, get_connection
+
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = get_connection()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {DATA_VERSION_CHANNEL}")
+                    # Drawn after LISTEN, so no change in between is missed.
+                    cur.execute("SELECT nextval('data_version_seq')")
+                    self._version = cur.fetchone()[0]
+                    while not self._stopped.is_set():
+                        if select.select([conn], [], [], LISTEN_PING_INTERVAL)[0]:
+                            conn.poll()
+                        else:
+                            cur.execute("SELECT 1")  # raises if the connection died
+                        if conn.notifies:
+                            conn.notifies.clear()
+                            cur.execute("SELECT nextval('data_version_seq')")
+                            with self._lock:
+                                self._version = cur.fetchone()[0]
+            except Exception as e:
+                self._version = None
+                log_error("Data version listener failed; retrying", e)
+                self._stopped.wait(LISTEN_RETRY_INTERVAL)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+class ResponseCache:
+    """Rendered response bodies by request path, for the current data version only."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, path, version):
+        with self._lock:
+            if version is None or version != self._version:
+                return None
+            body = self._entries.get(path)
+            if body is not None:
+                self._entries.move_to_end(path)
+            return body
+
+    def put(self, path, version, body):
+        if version is None or self.max_entries <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                if self._version is not None and version < self._version:
+                    return  # computed before the latest change
+                self._entries.clear()
+                self._version = version
+            self._entries[path] = body
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ScoresAPI:
+    """The endpoints, independent of the HTTP plumbing."""
+
+    def __init__(self, db, version=None, cache=None):
+        self.db = db
+        self.version = version or DataVersion(db)
+        self.cache = cache or ResponseCache()
+        self._engines = {}  # semester -> (version, PercentileEngine)
+        self._engine_locks = {}
+        self._subjects_version = None  # data version the acronyms were read at
+        self._lock = threading.Lock()
+
+    def refresh_subjects(self, version):
+        """
+        Rereads the subject acronyms when the data version has moved, since
+        edits to the subjects table move it too.
+        """
+        if version is not None and version != self._subjects_version:
+            load_subject_acronyms(self.db)
+            self._subjects_version = version
+
+    def scores(self, enrolment_id, semester=None):
+        if semester is None:
+            rows = self.db.fetch_all_semester_scores(enrolment_id)
+        else:
+            rows = [(semester,) + tuple(row) for row in self.db.fetch_student_scores(enrolment_id, semester)]
+        return {
+            "enrolment_id": enrolment_id,
+            "semester": semester,
+            "scores": [
+                {"semester": sem, "subject": subject, "acronym": subject_acronym(subject),
+                 "T1": t1, "T2": t2, "T3": t3, "T4": t4, "total_score": total}
+                for sem, subject, t1, t2, t3, t4, total in rows
+            ],
+        }
+
+    def comparison(self, enrolment_id, semester, version):
+        engine = self._class_engine(semester, version)
+        if engine is None:
+            return {"enrolment_id": enrolment_id, "semester": semester, "subjects": []}
+        merged = engine.student_comparison(semester, enrolment_id)
+        return {
+            "enrolment_id": enrolment_id,
+            "semester": semester,
+            "subjects": [
+                {"acronym": acronym, "total_score": float(total),
+                 "class_avg": round(float(avg), 2), "percentile": round(float(percentile), 1)}
+                for acronym, total, avg, percentile in merged.itertuples(index=False)
+            ],
+        }
+
+    def _class_engine(self, semester, version):
+        """
+        The semester's PercentileEngine for this data version. Concurrent
+        requests for the same semester wait for one of them to build it.
+        """
+        with self._lock:
+            cached = self._engines.get(semester)
+            if cached is not None and version is not None and cached[0] == version:
+                return cached[1]
+            lock = self._engine_locks.setdefault(semester, threading.Lock())
+        with lock:
+            cached = self._engines.get(semester)
+            if cached is not None and version is not None and cached[0] == version:
+                return cached[1]
+            rows = self.db.fetch_semester_scores_all_students(semester)
+            if not rows:
+                return None  # nothing to rank, or the query failed; not cached
+            engine = PercentileEngine()
+            engine.add_semester(semester, rows)
+            if version is not None:
+                with self._lock:
+                    self._engines[semester] = (version, engine)
+            return engine
+
+
+def _etag(version):
+    return f'"{API_FORMAT_VERSION}.{version}"'
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pollers reuse their connection
+    server_version = "AcademicPerformanceTracker"
+
+    @property
+    def api(self):
+        return self.server.api
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send_json(status, {"error": message}, headers)
+
+    def _session(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return None
+        return get_sessions().validate(header[len("Bearer "):].strip())
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/api/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok", "data_version": self.api.version.current()})
+            return
+        match = STUDENT_PATH.match(url.path)
+        if not match:
+            self._error(HTTPStatus.NOT_FOUND, "not found")
+            return
+        enrolment_id, resource = match.groups()
+
+        session = self._session()
+        if session is None:
+            self._error(HTTPStatus.UNAUTHORIZED, "missing or invalid session token",
+                        {"WWW-Authenticate": "Bearer"})
+            return
+        if session.role != "faculty" and session.subject != enrolment_id:
+            self._error(HTTPStatus.FORBIDDEN, "students can only read their own scores")
+            return
+
+        query = parse_qs(url.query)
+        semester = query.get("semester", [None])[0]
+        if semester is not None:
+            try:
+                semester = int(semester)
+            except ValueError:
+                semester = 0
+            if semester not in (1, 2, 3):
+                self._error(HTTPStatus.BAD_REQUEST, "semester must be 1, 2 or 3")
+                return
+        elif resource == "comparison":
+            self._error(HTTPStatus.BAD_REQUEST, "semester is required")
+            return
+
+        # The version is read before any query, so a cached body is never
+        # older than the version it is filed under.
+        version = self.api.version.current()
+        cache_headers = {"Cache-Control": "private, no-cache"}
+        if version is not None:
+            etag = cache_headers["ETag"] = _etag(version)
+            if _etag_matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                for name, value in cache_headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+
+        cache_key = f"{url.path}?semester={semester}"
+        body = self.api.cache.get(cache_key, version)
+        if body is None:
+            try:
+                self.api.refresh_subjects(version)
+                if resource == "scores":
+                    payload = self.api.scores(enrolment_id, semester)
+                    empty = not payload["scores"]
+                else:
+                    payload = self.api.comparison(enrolment_id, semester, version)
+                    empty = not payload["subjects"]
+            except Exception as e:
+                log_error("API request failed", e)
+                self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal error")
+                return
+            body = json.dumps(payload).encode()
+            if empty:
+                # The backends return [] on errors too; never let a failed
+                # query be served from the cache or revalidated.
+                cache_headers = {"Cache-Control": "no-store"}
+            else:
+                self.api.cache.put(cache_key, version, body)
+        self._send_json(HTTPStatus.OK, body, cache_headers)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path == "/api/logout":
+            header = self.headers.get("Authorization", "")
+            if header.startswith("Bearer "):
+                get_sessions().revoke(header[len("Bearer "):].strip())
+            self._send_json(HTTPStatus.OK, {"status": "logged out"})
+            return
+        if url.path != "/api/login":
+            self._error(HTTPStatus.NOT_FOUND, "not found")
+            return
+
+        try:
+            header = self.headers.get("Content-Length", "0").strip()
+            # int() would also take "-1", "+5" or "1_0"; a negative length
+            # would make rfile.read() wait for the client to disconnect.
+            if not (header.isascii() and header.isdigit()):
+                raise ValueError("Content-Length must be a non-negative integer")
+            length = int(header)
+            if length > MAX_BODY_BYTES:
+                raise ValueError("request body too large")
+            credentials = json.loads(self.rfile.read(length) or b"{}")
+            role, user_id, password = credentials["role"], str(credentials["id"]), str(credentials["password"])
+            if role not in ("student", "faculty"):
+                raise ValueError("role must be 'student' or 'faculty'")
+        except (ValueError, KeyError, TypeError) as e:
+            self.close_connection = True
+            self._error(HTTPStatus.BAD_REQUEST, f"expected JSON with role, id and password ({e})")
+            return
+
+        wait = get_login_throttle().retry_after(role, user_id)
+        if wait:
+            self._error(HTTPStatus.TOO_MANY_REQUESTS, "too many failed attempts",
+                        {"Retry-After": str(int(wait) + 1)})
+            return
+        login = student_login if role == "student" else faculty_login
+        token = login(user_id, password)
+        if not token:
+            self._error(HTTPStatus.UNAUTHORIZED, "invalid credentials")
+            return
+        session = get_sessions().validate(token)
+        self._send_json(HTTPStatus.OK, {"token": token, "expires_at": session.expires_at})
+
+
+class APIServer(ThreadingHTTPServer):
+    """One thread per connection; idle keep-alive connections only cost a thread each."""
+
+    daemon_threads = True
+    request_queue_size = 128  # connections waiting to be accepted during a burst
+
+    def __init__(self, address, db, access_log=False):
+        if not get_sessions().enabled:
+            raise ValueError("The API needs session tokens; set APT_SESSION_TTL to a positive number of seconds")
+        self.api = ScoresAPI(db)
+        self.access_log = access_log
+        super().__init__(address, APIRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.api.version.stop()
@@ -1,17 +1,32 @@
+import os
+import threading
+
 import bcrypt
-from database.db_operations import DBOperations
+from auth.sessions import authenticate
+from database.backend import get_db
 from utils.error_handling import log_error
 
-def faculty_login(faculty_id, password):
-    db = DBOperations()
+# bcrypt is deliberately slow; however many logins arrive at once (e.g.
+# through the HTTP API), at most this many hashes are computed in parallel.
+_bcrypt_slots = threading.BoundedSemaphore(int(os.environ.get("APT_LOGIN_BCRYPT_CONCURRENCY", "2")))
+
+
+def check_faculty_password(faculty_id, password):
+    db = get_db()
     try:
-        with db.conn.cursor() as cur:
-            cur.execute("SELECT password FROM faculty WHERE faculty_id = %s", (faculty_id,))
-            result = cur.fetchone()
-            if result and bcrypt.checkpw(password.encode(), result[0].encode()):
-                return True
-            else:
-                return False
+        stored_hash = db.fetch_faculty_password(faculty_id)
+        if not stored_hash:
+            return False
+        with _bcrypt_slots:
+            return bcrypt.checkpw(password.encode(), stored_hash.encode())
     except Exception as e:
         log_error("Faculty login error", e)
         return False
+
+
+def faculty_login(faculty_id, password):
+    """
+    Checks the password and returns a session token (see auth.sessions),
+    or None if it is wrong or the ID is locked out after failed attempts.
+    """
+    return authenticate("faculty", faculty_id, lambda: check_faculty_password(faculty_id, password))
@@ -0,0 +1,429 @@
+"""
+Signed, expiring login sessions and per-ID login throttling.
+
+After one successful password check, faculty_login/student_login issue a
+session token: the role, the user's ID, issue and expiry times and a
+random token ID, signed with HMAC-SHA256. Validating a token means
+checking the signature, the expiry and the revocation list. That takes
+microseconds, with no bcrypt and no database query. The CLI keeps the
+last token issued in each terminal, so logging in again from that same
+terminal before it expires only asks for the ID. A saved token is never
+used by another terminal, so knowing someone's ID is not enough to take
+over their session. Logging out revokes the token.
+
+Revocation is recorded in revoked.json in the session directory, so it
+applies to every process using that directory. A single token can be
+revoked, or every token issued to a user before now:
+
+    python -m auth.sessions revoke faculty F001
+
+Failed logins are counted per role and ID. After APT_LOGIN_MAX_FAILURES
+failures, further attempts for that ID are refused for
+APT_LOGIN_LOCKOUT seconds, without running the password check. The lockout
+doubles on every further failure, up to an hour. A burst of guesses
+against one account therefore costs one bcrypt check per lockout, not one
+per guess. Lockouts are kept in failures.json next to revoked.json, so
+restarting the CLI does not reset them.
+
+Settings (environment variables):
+  APT_SESSION_DIR         key, revocation list, failed logins and saved tokens
+                          (default ~/.config/academic_performance_tracker/sessions)
+  APT_SESSION_SECRET      signing key; if unset, a random key is created in APT_SESSION_DIR
+  APT_SESSION_TTL         session lifetime in seconds (default 3600; 0 disables sessions)
+  APT_LOGIN_MAX_FAILURES  failed attempts per ID before a lockout (default 5)
+  APT_LOGIN_LOCKOUT       first lockout in seconds (default 30)
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+ROLES = ("faculty", "student")
+
+DEFAULT_SESSION_DIR = os.path.join(os.path.expanduser("~"), ".config", "academic_performance_tracker", "sessions")
+
+TOKEN_VERSION = "v1"
+
+MAX_LOCKOUT = 3600
+
+Session = namedtuple("Session", ["role", "subject", "token_id", "issued_at", "expires_at"])
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _write_private(path, data):
+    """Atomically writes bytes to path, readable by the owner only."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        os.chmod(tmp_path, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _terminal_id():
+    """
+    Identifies the terminal this process runs in: its tty and the session
+    (usually the login shell) it belongs to. None without a terminal.
+    """
+    try:
+        return f"{os.ttyname(0)}:{os.getsid(0)}"
+    except (AttributeError, OSError):
+        return None
+
+
+class SessionManager:
+    def __init__(self, directory=None, secret=None, ttl=None):
+        self.directory = directory or os.environ.get("APT_SESSION_DIR", DEFAULT_SESSION_DIR)
+        if ttl is None:
+            ttl = int(os.environ.get("APT_SESSION_TTL", "3600"))
+        self.ttl = ttl
+        self.enabled = ttl > 0
+        self._secret = secret if secret is not None else os.environ.get("APT_SESSION_SECRET", "").encode() or None
+        self._lock = threading.Lock()
+        # Revocation list as last read from disk, and that file's mtime.
+        self._revoked_tokens = {}  # token_id -> expires_at
+        self._revoked_users = {}   # "role:subject" -> revoked_at
+        self._revoked_mtime = None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _key(self):
+        if self._secret is None:
+            with self._lock:
+                if self._secret is None:
+                    self._secret = self._load_or_create_key()
+        return self._secret
+
+    def _load_or_create_key(self):
+        path = self._path("session.key")
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(path, "rb") as f:
+                return f.read()
+        key = secrets.token_bytes(32)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    def _sign(self, payload):
+        return hmac.new(self._key(), payload, hashlib.sha256).digest()
+
+    def issue(self, role, subject):
+        """Returns a new session token for the user."""
+        now = time.time()
+        claims = {"r": role, "s": subject, "i": now, "e": now + self.ttl, "j": secrets.token_hex(8)}
+        payload = json.dumps(claims, separators=(",", ":")).encode()
+        return f"{TOKEN_VERSION}.{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def validate(self, token, role=None, subject=None):
+        """
+        Returns the Session of a token, or None if it is malformed, forged,
+        expired, revoked, or for another role or subject than requested.
+        """
+        try:
+            version, payload, signature = token.split(".")
+            if version != TOKEN_VERSION:
+                return None
+            payload = _b64decode(payload)
+            if not hmac.compare_digest(_b64decode(signature), self._sign(payload)):
+                return None
+            claims = json.loads(payload)
+            session = Session(claims["r"], claims["s"], claims["j"], claims["i"], claims["e"])
+        except (AttributeError, ValueError, KeyError, TypeError):
+            return None
+        if session.expires_at <= time.time():
+            return None
+        if (role is not None and session.role != role) or (subject is not None and session.subject != subject):
+            return None
+        self._refresh_revoked()
+        if session.token_id in self._revoked_tokens:
+            return None
+        if session.issued_at <= self._revoked_users.get(f"{session.role}:{session.subject}", -1):
+            return None
+        return session
+
+    def revoke(self, token):
+        """Revokes one token; does nothing for an invalid one."""
+        session = self.validate(token)
+        if session:
+            self._update_revoked(tokens={session.token_id: session.expires_at})
+
+    def revoke_user(self, role, subject):
+        """Revokes every token issued to the user up to now."""
+        now = time.time()
+        self._update_revoked(users={f"{role}:{subject}": now})
+
+    def _read_revoked(self):
+        try:
+            with open(self._path("revoked.json")) as f:
+                data = json.load(f)
+            return data.get("tokens", {}), data.get("users", {})
+        except (OSError, ValueError):
+            return {}, {}
+
+    def _refresh_revoked(self):
+        # A stat per validation; the file is only re-read when it changed.
+        try:
+            mtime = os.stat(self._path("revoked.json")).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._revoked_mtime:
+            tokens, users = self._read_revoked()
+            with self._lock:
+                self._revoked_tokens, self._revoked_users, self._revoked_mtime = tokens, users, mtime
+
+    def _update_revoked(self, tokens=None, users=None):
+        """Adds entries to the revocation list on disk."""
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        with self._lock:
+            revoked_tokens, revoked_users = self._read_revoked()
+            tokens = {**revoked_tokens, **(tokens or {})}
+            users = {**revoked_users, **(users or {})}
+            now = time.time()
+            # Expired tokens no longer need to be listed; neither do user
+            # revocations older than any token that could still be valid.
+            tokens = {token_id: exp for token_id, exp in tokens.items() if exp > now}
+            users = {user: at for user, at in users.items() if at + self.ttl > now}
+            _write_private(self._path("revoked.json"), json.dumps({"tokens": tokens, "users": users}).encode())
+            self._revoked_mtime = None  # re-read on the next validation
+
+    def _token_path(self):
+        """The file holding this terminal's last token; None without a terminal."""
+        terminal = _terminal_id()
+        if terminal is None:
+            return None
+        name = hashlib.sha256(terminal.encode()).hexdigest()[:32]
+        return self._path(f"terminal-{name}.token")
+
+    def _saved_token(self):
+        path = self._token_path()
+        if path is None:
+            return None
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def save(self, token):
+        """
+        Keeps the token as this terminal's session, replacing any earlier
+        one, so a later login from this terminal can resume it.
+        """
+        path = self._token_path()
+        if not self.enabled or path is None:
+            return
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            _write_private(path, token.encode())
+        except OSError:
+            pass  # best-effort; the user just logs in with a password next time
+
+    def resume(self, role, subject):
+        """
+        Returns this terminal's saved token if it belongs to the user and is
+        still valid, else None. Sessions saved by other terminals are never
+        resumed, whatever ID is typed.
+        """
+        if not self.enabled:
+            return None
+        token = self._saved_token()
+        if token is None:
+            return None
+        session = self.validate(token)
+        if session is None:
+            self.forget()
+            return None
+        if (session.role, session.subject) != (role, subject):
+            return None
+        return token
+
+    def forget(self):
+        """Removes this terminal's saved token."""
+        path = self._token_path()
+        if path is None:
+            return
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def logout(self, token):
+        """Revokes a token and, if this terminal saved it, removes it."""
+        self.revoke(token)
+        if self._saved_token() == token:
+            self.forget()
+
+
+class LoginThrottle:
+    """
+    Counts failed logins per (role, ID) and locks out IDs with too many.
+
+    Lockouts are kept in failures.json in the session directory, so they
+    survive restarts and apply to every process using that directory. The
+    file is only written when an ID's lockout changes, not on every failed
+    attempt; failures short of a lockout are counted in memory.
+    """
+
+    def __init__(self, max_failures=None, lockout=None, directory=None):
+        if max_failures is None:
+            max_failures = int(os.environ.get("APT_LOGIN_MAX_FAILURES", "5"))
+        if lockout is None:
+            lockout = float(os.environ.get("APT_LOGIN_LOCKOUT", "30"))
+        self.max_failures = max_failures
+        self.lockout = lockout
+        self.directory = directory or os.environ.get("APT_SESSION_DIR", DEFAULT_SESSION_DIR)
+        self._lock = threading.Lock()
+        self._counts = {}  # "role:subject" -> failures not yet locked out
+        # Lockouts as last read from disk, and that file's mtime.
+        self._lockouts = {}  # "role:subject" -> [failures, locked_until]
+        self._mtime = None
+
+    def _path(self):
+        return os.path.join(self.directory, "failures.json")
+
+    def _read(self):
+        try:
+            with open(self._path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _refresh(self):
+        # As with revoked.json: a stat per check, a read only after a change.
+        try:
+            mtime = os.stat(self._path()).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            lockouts = self._read()
+            with self._lock:
+                self._lockouts, self._mtime = lockouts, mtime
+
+    def _write(self, lockouts):
+        """Writes the lockouts to disk; call with self._lock held."""
+        now = time.time()
+        # Expired lockouts of IDs nobody retried are dropped, so sprayed IDs
+        # do not pile up.
+        if len(lockouts) > 10000:
+            lockouts = {key: entry for key, entry in lockouts.items() if entry[1] > now}
+        self._lockouts = lockouts
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            _write_private(self._path(), json.dumps(lockouts).encode())
+            self._mtime = None  # re-read on the next check
+        except OSError:
+            pass  # not writable: the lockout still applies to this process
+
+    def retry_after(self, role, subject):
+        """Seconds until the ID may try again; 0 if it may now."""
+        self._refresh()
+        with self._lock:
+            entry = self._lockouts.get(f"{role}:{subject}")
+        if entry is None:
+            return 0
+        return max(0.0, entry[1] - time.time())
+
+    def failure(self, role, subject):
+        key = f"{role}:{subject}"
+        with self._lock:
+            lockouts = self._read()
+            if key in lockouts:
+                failures = lockouts[key][0] + 1
+            else:
+                failures = self._counts.get(key, 0) + 1
+            if failures < self.max_failures:
+                self._counts[key] = failures
+                if len(self._counts) > 10000:
+                    self._counts.clear()
+                return
+            self._counts.pop(key, None)
+            locked_until = time.time() + min(self.lockout * 2 ** (failures - self.max_failures), MAX_LOCKOUT)
+            self._write({**lockouts, key: [failures, locked_until]})
+
+    def success(self, role, subject):
+        key = f"{role}:{subject}"
+        with self._lock:
+            self._counts.pop(key, None)
+            lockouts = self._read()
+            if lockouts.pop(key, None) is not None:
+                self._write(lockouts)
+
+
+_sessions = None
+_throttle = None
+_init_lock = threading.Lock()
+
+
+def get_sessions():
+    """Returns this process's SessionManager, created on first use."""
+    global _sessions
+    if _sessions is None:
+        with _init_lock:
+            if _sessions is None:
+                _sessions = SessionManager()
+    return _sessions
+
+
+def get_login_throttle():
+    """Returns this process's LoginThrottle, created on first use."""
+    global _throttle
+    if _throttle is None:
+        with _init_lock:
+            if _throttle is None:
+                _throttle = LoginThrottle()
+    return _throttle
+
+
+def authenticate(role, subject, check_password):
+    """
+    Runs check_password() unless the ID is locked out, records the outcome,
+    and returns a new session token on success or None otherwise.
+    """
+    throttle = get_login_throttle()
+    if throttle.retry_after(role, subject) > 0:
+        return None
+    if not check_password():
+        throttle.failure(role, subject)
+        return None
+    throttle.success(role, subject)
+    return get_sessions().issue(role, subject)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    revoke = subparsers.add_parser("revoke", help="revoke every session of a user")
+    revoke.add_argument("role", choices=ROLES)
+    revoke.add_argument("user_id")
+    args = parser.parse_args()
+
+    get_sessions().revoke_user(args.role, args.user_id)
+    print(f"Revoked all sessions of {args.role} {args.user_id}.")
+
+
+if __name__ == "__main__":
+    main()
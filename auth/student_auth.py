@@ -0,0 +1,32 @@
+import hmac
+
+from auth.sessions import authenticate
+from database.backend import get_db
+from utils.error_handling import log_error
+
+
+def expected_student_password(fullname, enrolment_id):
+    """A student's password: the first word of their name and the last four digits of their enrolment ID."""
+    return fullname.split()[0] + enrolment_id[-4:]
+
+
+def check_student_password(enrolment_id, password, student=None):
+    try:
+        # student -> (enrolment_id, fullname, password, semester)
+        student = student or get_db().fetch_student_by_enrolment(enrolment_id)
+        if not student:
+            return False
+        expected = expected_student_password(student[1], enrolment_id)
+        return hmac.compare_digest(password.encode(), expected.encode())
+    except Exception as e:
+        log_error("Student login error", e)
+        return False
+
+
+def student_login(enrolment_id, password, student=None):
+    """
+    Checks the password and returns a session token (see auth.sessions),
+    or None if it is wrong or the ID is locked out after failed attempts.
+    Pass the student's row if it was already fetched.
+    """
+    return authenticate("student", enrolment_id, lambda: check_student_password(enrolment_id, password, student))
@@ -0,0 +1,82 @@
+"""
+Menu-action latency with and without the shared connection pool.
+
+"Before" mimics the old behaviour: every action opens a fresh psycopg2
+connection (and, unlike the old code, closes it so the benchmark does not
+exhaust the server). "After" runs the same action through DBOperations
+backed by the pool.
+
+Usage (from the project root, against a running PostgreSQL):
+    python -m benchmarks.bench_connection_pool --iterations 200 --enrolment-id 23002171410016
+"""
+import argparse
+import statistics
+import time
+
+from database.connection_pool import ConnectionPool
+from database.db_operations import DBOperations, get_connection
+
+
+def menu_action_unpooled(enrolment_id):
+    # The same work a view did before pooling: connect and query. The old code
+    # leaked the connection; it is closed here (see the module docstring).
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM students WHERE enrolment_id = %s", (enrolment_id,))
+            cur.fetchone()
+            cur.execute(
+                "SELECT sc.semester, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score "
+                "FROM student_scores sc JOIN subjects sub USING (subject_id) "
+                "WHERE sc.enrolment_id = %s ORDER BY sc.semester, sub.name",
+                (enrolment_id,)
+            )
+            cur.fetchall()
+    finally:
+        conn.close()
+
+
+def menu_action_pooled(pool, enrolment_id):
+    db = DBOperations(pool=pool)
+    db.fetch_student_by_enrolment(enrolment_id)
+    db.fetch_all_semester_scores(enrolment_id)
+
+
+def measure(action, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+    print(f"{label:<10} mean={statistics.mean(timings):8.3f} ms  "
+          f"p50={statistics.median(timings):8.3f} ms  p95={p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--enrolment-id", default="23002171410016")
+    parser.add_argument("--max-size", type=int, default=5)
+    args = parser.parse_args()
+
+    unpooled = measure(lambda: menu_action_unpooled(args.enrolment_id), args.iterations)
+
+    pool = ConnectionPool(get_connection, min_size=1, max_size=args.max_size)
+    try:
+        pooled = measure(lambda: menu_action_pooled(pool, args.enrolment_id), args.iterations)
+    finally:
+        pool.closeall()
+
+    summarize("unpooled", unpooled)
+    summarize("pooled", pooled)
+    print(f"speedup    {statistics.mean(unpooled) / statistics.mean(pooled):.1f}x (mean)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Per-call latency of the hot lookups, sent as plain statements versus as
+prepared statements (db_operations.PREPARED_QUERIES), under concurrent load.
+
+Each of --threads workers checks connections out of one shared pool and
+repeatedly runs the four lookups the student menus issue:
+fetch_student_by_enrolment, fetch_student_scores, fetch_subjects_for_semester
+and fetch_test_scores_for_subject, for students sampled from the database.
+A warm-up round runs first, so the prepared numbers exclude the one-off
+PREPARE on each connection.
+
+Usage (from the project root, against a populated database, e.g. one
+seeded with `python -m benchmarks.datagen`):
+    python -m benchmarks.bench_prepared_statements --threads 8 --iterations 300
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from database.connection_pool import ConnectionPool
+from database.db_operations import DBOperations, get_connection
+
+METHODS = (
+    "fetch_student_by_enrolment",
+    "fetch_student_scores",
+    "fetch_subjects_for_semester",
+    "fetch_test_scores_for_subject",
+)
+
+
+def sample_lookups(db, students):
+    """[(enrolment_id, semester, subject)] for up to `students` students that have scores."""
+    with db.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT ON (sc.enrolment_id) sc.enrolment_id, sc.semester, sub.name
+            FROM student_scores sc
+            JOIN subjects sub USING (subject_id)
+            ORDER BY sc.enrolment_id, sc.semester, sub.name
+            LIMIT %s
+        """, (students,))
+        return cur.fetchall()
+
+
+def run_lookups(db, lookup, timings):
+    enrolment_id, semester, subject = lookup
+    calls = (
+        ("fetch_student_by_enrolment", (enrolment_id,)),
+        ("fetch_student_scores", (enrolment_id, semester)),
+        ("fetch_subjects_for_semester", (enrolment_id, semester)),
+        ("fetch_test_scores_for_subject", (enrolment_id, semester, subject)),
+    )
+    for name, args in calls:
+        start = time.perf_counter()
+        getattr(db, name)(*args)
+        timings[name].append((time.perf_counter() - start) * 1000)
+
+
+def measure(prepare, lookups, threads, iterations):
+    """Returns ({method: [ms]}, wall seconds) for one mode."""
+    pool = ConnectionPool(get_connection, min_size=threads, max_size=threads)
+    db = DBOperations(pool=pool, prepare=prepare)
+    per_thread = [{name: [] for name in METHODS} for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        timings = per_thread[index]
+        # Warm-up: one round per connection, then discard the timings.
+        for lookup in lookups[:threads]:
+            run_lookups(db, lookup, timings)
+        for values in timings.values():
+            values.clear()
+        barrier.wait()
+        for i in range(iterations):
+            run_lookups(db, lookups[(index + i * threads) % len(lookups)], timings)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    try:
+        for w in workers:
+            w.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.closeall()
+    return {name: [ms for timings in per_thread for ms in timings[name]] for name in METHODS}, elapsed
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent workers (and pooled connections)")
+    parser.add_argument("--iterations", type=int, default=300, help="lookup rounds per worker")
+    parser.add_argument("--students", type=int, default=500, help="distinct students to cycle through")
+    args = parser.parse_args()
+
+    pool = ConnectionPool(get_connection, min_size=1, max_size=1)
+    try:
+        lookups = sample_lookups(DBOperations(pool=pool), args.students)
+    finally:
+        pool.closeall()
+    if not lookups:
+        parser.error("no scores in the database; seed it first (python -m benchmarks.datagen)")
+
+    results = {}
+    for label, prepare in (("plain", False), ("prepared", True)):
+        results[label] = measure(prepare, lookups, args.threads, args.iterations)
+
+    calls = args.threads * args.iterations
+    print(f"{args.threads} threads x {args.iterations} rounds, {len(lookups)} students\n")
+    print(f"{'method':<32}{'plain p50':>11}{'p95':>9}{'prepared p50':>14}{'p95':>9}{'p50 change':>12}")
+    for name in METHODS:
+        plain, prepared = results["plain"][0][name], results["prepared"][0][name]
+        p50, q50 = statistics.median(plain), statistics.median(prepared)
+        print(f"{name:<32}{p50:9.3f}ms{percentile(plain, 95):7.3f}ms"
+              f"{q50:12.3f}ms{percentile(prepared, 95):7.3f}ms{(q50 - p50) / p50 * 100:+11.1f}%")
+    for label, (_, elapsed) in results.items():
+        print(f"{label:<10} {calls * len(METHODS) / elapsed:10.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Reports per second when several PDF reports are rendered at the same time.
+
+Uses synthetic score data, so no database is needed: every run renders
+the same report for a number of students through build_student_report,
+which draws all charts into in-memory buffers. Concurrent runs share no
+files, so this also shows that parallel reports no longer collide.
+
+Each concurrency level is run twice against an empty chart cache: the
+cold pass renders every chart, the warm pass reuses the cached PNGs.
+
+Usage (from the project root):
+    python -m benchmarks.bench_report_rendering --reports 40 --concurrency 1 2 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cli.student_cli import build_student_report
+
+SUBJECTS = {
+    1: ["Software Engineering (SE)", "Physics (PHY)", "MATHS I (MATHS-I)", "JAVA-I"],
+    2: ["Data Structures (DS)", "Digital Electronics (DE)", "MATHS II (MATHS-II)", "JAVA-II"],
+    3: ["Operating Systems (OS)", "Database Management Systems (DBMS)",
+        "Computer Networks (CN)", "Probability Theory (IPT)"],
+}
+
+
+def synthetic_class(students, seed=42):
+    """Returns ({enrolment_id: score rows}, {semester: class rows}) for a fake cohort."""
+    rng = random.Random(seed)
+    own_scores = {}
+    class_scores = {sem: [] for sem in SUBJECTS}
+    for i in range(students):
+        enrolment_id = f"2300217141{i:04d}"
+        rows = []
+        for sem, subjects in SUBJECTS.items():
+            for subject in subjects:
+                tests = [rng.randint(0, 25) for _ in range(4)]
+                rows.append((sem, subject, *tests, sum(tests)))
+                class_scores[sem].append((enrolment_id, subject, sum(tests)))
+        own_scores[enrolment_id] = rows
+    return own_scores, class_scores
+
+
+def render_one(args):
+    enrolment_id, rows, class_scores, out_dir = args
+    pdf_file = os.path.join(out_dir, f"student_report_{enrolment_id}.pdf")
+    build_student_report((enrolment_id, f"Student {enrolment_id[-4:]}"), rows, class_scores, pdf_file)
+    return pdf_file
+
+
+def run(concurrency, own_scores, class_scores, out_dir):
+    tasks = [(e, rows, class_scores, out_dir) for e, rows in own_scores.items()]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=concurrency) as executor:
+        files = list(executor.map(render_one, tasks))
+    elapsed = time.perf_counter() - start
+    assert len(set(files)) == len(tasks) and all(os.path.getsize(f) > 0 for f in files)
+    return len(files) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=40, help="reports rendered per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    own_scores, class_scores = synthetic_class(args.reports)
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Read by each worker process when it creates its chart cache.
+            os.environ["APT_CHART_CACHE_DIR"] = cache_dir
+            for label in ["cold", "warm"]:
+                with tempfile.TemporaryDirectory() as out_dir:
+                    rate = run(concurrency, own_scores, class_scores, out_dir)
+                print(f"concurrency={concurrency:<3} {label} cache {rate:7.2f} reports/s")
+
+    stray = [f for f in os.listdir(".") if f.endswith(".png")]
+    print(f"PNG files left in the working directory: {len(stray)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Startup-time budget for `python main.py`.
+
+Reports:
+  1. the slowest top-level imports from `python -X importtime -c "import main"`
+  2. the wall-clock time from launching `python main.py` to its first prompt
+  3. whether any of the plotting / DataFrame / PDF stacks were loaded at startup
+
+Exits with status 1 if the time to the first prompt exceeds --max-seconds
+(median of --runs launches) or a heavy module was imported eagerly, so it
+can guard against regressions in CI.
+
+Usage (from the project root):
+    python -m benchmarks.bench_startup --runs 5 --max-seconds 1.0
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["matplotlib", "pandas", "numpy", "reportlab"]
+FIRST_PROMPT = b"Enter your choice"
+
+
+def import_breakdown(top, max_depth=2):
+    """
+    Returns [(cumulative_us, module)] for the slowest imports triggered by
+    `import main`, down to `max_depth` levels of nesting below main.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, check=True
+    )
+    entries = []
+    for line in result.stderr.decode().splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2 - 1  # nesting shown as 2-space indents
+        if 1 <= depth <= max_depth or name.strip() == "main":
+            entries.append((int(cumulative), name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def time_to_first_prompt():
+    """Launches main.py and returns seconds until its first menu prompt appears."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env
+    )
+    output = b""
+    try:
+        while FIRST_PROMPT not in output:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("main.py exited before showing its menu")
+            output += chunk
+        elapsed = time.perf_counter() - start
+        proc.communicate(b"3\n", timeout=10)  # choose "Exit"
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    return elapsed
+
+
+def eagerly_loaded_heavy_modules():
+    code = ("import sys, main; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+    return [m for m in result.stdout.decode().strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0,
+                        help="budget for the median time to the first prompt")
+    parser.add_argument("--top", type=int, default=10, help="number of imports to list")
+    args = parser.parse_args()
+
+    print("Slowest imports under main (cumulative):")
+    for cumulative, name in import_breakdown(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    timings = [time_to_first_prompt() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"Time to first prompt: median {median * 1000:.0f} ms "
+          f"(min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms, {args.runs} runs)")
+
+    heavy = eagerly_loaded_heavy_modules()
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if median > args.max_seconds:
+        print(f"FAIL: startup budget of {args.max_seconds:.2f}s exceeded")
+        failed = True
+    if not failed:
+        print("OK: within the startup budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Deterministic synthetic gradebook for benchmarks.
+
+Fills students, faculty, student_scores and faculty_logs with a cohort of
+a given size. Every value is derived arithmetically from the row number
+and the seed, so the same (students, seed) always produces exactly the
+same data, on any machine, in seconds even at 500k students.
+
+The target database is wiped first, so point it at a dedicated benchmark
+database, never at production data. With --sqlite the cohort is written
+to a SQLite file instead (same rows), so no PostgreSQL server is needed.
+
+Usage (from the project root):
+    python -m benchmarks.datagen --dbname academic_bench --scale medium
+    python -m benchmarks.datagen --dbname academic_bench --students 2000 --seed 7
+    python -m benchmarks.datagen --sqlite bench.sqlite3 --scale medium
+"""
+import argparse
+import time
+
+from database.db_operations import get_connection
+from database.schema import migrate
+
+SCALES = {"small": 1_000, "medium": 50_000, "large": 500_000}
+
+SUBJECTS = {
+    1: ["Software Engineering (SE)", "Physics (PHY)", "MATHS I (MATHS-I)", "JAVA-I"],
+    2: ["Data Structures (DS)", "Digital Electronics (DE)", "MATHS II (MATHS-II)", "JAVA-II"],
+    3: ["Operating Systems (OS)", "Database Management Systems (DBMS)",
+        "Computer Networks (CN)", "Probability Theory (IPT)"],
+}
+
+# Students per faculty member, and audit entries per student.
+STUDENTS_PER_FACULTY = 50
+LOGS_PER_STUDENT = 2
+
+# Multiplier and per-seed factor of the hash behind each of T1-T4; shared by
+# the PostgreSQL (SQL) and SQLite (Python) generators.
+TEST_HASHES = [(2654435761, 97), (2246822519, 89), (3266489917, 83), (668265263, 79)]
+
+
+def enrolment_id(i):
+    """Enrolment ID of the i-th synthetic student (1-based), e.g. 'B0000000000042'."""
+    return "B" + str(i).rjust(13, "0")
+
+
+def faculty_id(i):
+    return "BF" + str(i).rjust(8, "0")
+
+
+def faculty_count(students):
+    return max(students // STUDENTS_PER_FACULTY, 1)
+
+
+def seed_database(conn, students, seed=42):
+    """
+    Wipes the gradebook tables and inserts the synthetic cohort:
+      - `students` students; student i is currently in semester 1 + i % 3
+        and has scores for every subject of every semester up to it
+      - one faculty member per STUDENTS_PER_FACULTY students
+      - LOGS_PER_STUDENT audit entries per student, one minute apart
+    Test scores are 0-25 from a multiplicative hash of (seed, student, subject, test).
+    Returns a dict of row counts.
+    """
+    subjects = [(sem, subject) for sem, names in SUBJECTS.items() for subject in names]
+    faculties = faculty_count(students)
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE faculty_logs, student_scores, students, faculty RESTART IDENTITY CASCADE")
+        cur.execute("""
+            INSERT INTO students (enrolment_id, fullname, password, semester)
+            SELECT 'B' || lpad(i::text, 13, '0'), 'Bench Student ' || i, 'x', 1 + i %% 3
+            FROM generate_series(1, %s) AS i
+        """, (students,))
+        cur.execute("""
+            INSERT INTO faculty (faculty_id, name, password)
+            SELECT 'BF' || lpad(i::text, 8, '0'), 'Bench Faculty ' || i, 'x'
+            FROM generate_series(1, %s) AS i
+        """, (faculties,))
+
+        cur.execute("""
+            SELECT array_agg(get_subject_id(name) ORDER BY ord)
+            FROM unnest(%s::text[]) WITH ORDINALITY AS s(name, ord)
+        """, ([s[1] for s in subjects],))
+        subject_ids = cur.fetchone()[0]
+
+        # The summary triggers are bypassed for the bulk load and the
+        # summaries rebuilt once afterwards.
+        cur.execute("ALTER TABLE student_scores DISABLE TRIGGER USER")
+        cur.execute(f"""
+            INSERT INTO student_scores (enrolment_id, semester, subject_id, T1, T2, T3, T4, total_score)
+            SELECT 'B' || lpad(i::text, 13, '0'), s.semester, s.subject_id, t.t1, t.t2, t.t3, t.t4,
+                   t.t1 + t.t2 + t.t3 + t.t4
+            FROM generate_series(1, %(students)s) AS i
+            CROSS JOIN unnest(%(semesters)s::int[], %(subject_ids)s::smallint[], %(codes)s::int[])
+                 AS s(semester, subject_id, code)
+            CROSS JOIN LATERAL (
+                SELECT {", ".join(
+                    f"((i::bigint * {multiplier} + s.code * 40503 + %(seed)s * {factor} + {k}) %% 2147483647) %% 26 AS t{k}"
+                    for k, (multiplier, factor) in enumerate(TEST_HASHES, start=1)
+                )}
+            ) t
+            WHERE s.semester <= 1 + i %% 3
+        """, {
+            "students": students,
+            "semesters": [s[0] for s in subjects],
+            "subject_ids": subject_ids,
+            "codes": list(range(1, len(subjects) + 1)),
+            "seed": seed,
+        })
+        cur.execute("ALTER TABLE student_scores ENABLE TRIGGER USER")
+        cur.execute("SELECT rebuild_score_summaries()")
+
+        cur.execute("""
+            INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value, timestamp)
+            SELECT 'BF' || lpad((1 + (i - 1) %% %(faculties)s)::text, 8, '0'),
+                   'B' || lpad((1 + (i - 1) %% %(students)s)::text, 13, '0'),
+                   'Updated Data Structures (DS) T' || (1 + i %% 4) || ': 10 -> 12, new total score = 50',
+                   '10', '12',
+                   TIMESTAMP '2024-01-01' + i * INTERVAL '1 minute'
+            FROM generate_series(1, %(logs)s) AS i
+        """, {"faculties": faculties, "students": students, "logs": students * LOGS_PER_STUDENT})
+
+        counts = {}
+        for table in ["students", "faculty", "student_scores", "faculty_logs"]:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cur.fetchone()[0]
+    conn.commit()
+
+    # Refresh planner statistics so benchmarks see plans for the new sizes.
+    old_autocommit = conn.autocommit
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE")
+    conn.autocommit = old_autocommit
+    return counts
+
+
+def test_scores(i, code, seed):
+    """T1-T4 of student i for subject number code, as generated by seed_database."""
+    return [(i * multiplier + code * 40503 + seed * factor + k) % 2147483647 % 26
+            for k, (multiplier, factor) in enumerate(TEST_HASHES, start=1)]
+
+
+def seed_sqlite(db, students, seed=42, batch_size=50_000):
+    """
+    Same cohort as seed_database, written into a SQLiteOperations database.
+    Returns a dict of row counts.
+    """
+    from datetime import datetime, timedelta
+
+    subjects = [(sem, subject) for sem, names in SUBJECTS.items() for subject in names]
+    faculties = faculty_count(students)
+
+    def score_rows(subject_ids):
+        for i in range(1, students + 1):
+            for code, (semester, subject) in enumerate(subjects, start=1):
+                if semester <= 1 + i % 3:
+                    tests = test_scores(i, code, seed)
+                    yield (enrolment_id(i), semester, subject_ids[subject], *tests, sum(tests))
+
+    def log_rows():
+        start = datetime(2024, 1, 1)
+        for i in range(1, students * LOGS_PER_STUDENT + 1):
+            yield (faculty_id(1 + (i - 1) % faculties), enrolment_id(1 + (i - 1) % students),
+                   f"Updated Data Structures (DS) T{1 + i % 4}: 10 -> 12, new total score = 50",
+                   "10", "12", start + timedelta(minutes=i))
+
+    def insert_batches(cur, query, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                cur.executemany(query, batch)
+                batch = []
+        cur.executemany(query, batch)
+
+    with db.cursor() as cur:
+        for table in ["faculty_logs", "student_scores", "student_semester_summary",
+                      "class_subject_summary", "students", "faculty"]:
+            cur.execute(f"DELETE FROM {table}")
+        cur.executemany("INSERT INTO students (enrolment_id, fullname, password, semester) VALUES (?, ?, 'x', ?)",
+                        [(enrolment_id(i), f"Bench Student {i}", 1 + i % 3) for i in range(1, students + 1)])
+        cur.executemany("INSERT INTO faculty (faculty_id, name, password) VALUES (?, ?, 'x')",
+                        [(faculty_id(i), f"Bench Faculty {i}") for i in range(1, faculties + 1)])
+        cur.executemany("INSERT OR IGNORE INTO subjects (name, acronym) VALUES (?, subject_acronym(?))",
+                        [(subject, subject) for _, subject in subjects])
+        cur.execute("SELECT name, subject_id FROM subjects")
+        subject_ids = dict(cur.fetchall())
+        # As with PostgreSQL, summaries are rebuilt once instead of per row.
+        cur.execute("DROP TRIGGER score_summaries_insert")
+        insert_batches(cur, """
+            INSERT INTO student_scores (enrolment_id, semester, subject_id, T1, T2, T3, T4, total_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, score_rows(subject_ids))
+        insert_batches(cur, """
+            INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, log_rows())
+        counts = {}
+        for table in ["students", "faculty", "student_scores", "faculty_logs"]:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cur.fetchone()[0]
+    db.rebuild_score_summaries()
+    db.ensure_schema()  # restores the dropped trigger
+    with db.cursor() as cur:
+        cur.execute("ANALYZE")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dbname", default="academic_bench", help="benchmark database (it is wiped)")
+    parser.add_argument("--sqlite", metavar="PATH", help="write to this SQLite file instead of PostgreSQL")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=sorted(SCALES), default="small")
+    size.add_argument("--students", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    students = args.students or SCALES[args.scale]
+    start = time.perf_counter()
+    if args.sqlite:
+        from database.sqlite_backend import SQLiteOperations
+        db = SQLiteOperations(args.sqlite)
+        try:
+            counts = seed_sqlite(db, students, seed=args.seed)
+        finally:
+            db.close()
+    else:
+        conn = get_connection(dbname=args.dbname)
+        try:
+            migrate(conn)
+            counts = seed_database(conn, students, seed=args.seed)
+        finally:
+            conn.close()
+    print(f"Seeded {args.sqlite or args.dbname} in {time.perf_counter() - start:.1f}s: "
+          + ", ".join(f"{n} {table}" for table, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
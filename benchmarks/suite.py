@@ -0,0 +1,297 @@
+"""
+Benchmark suite for the database layer, analytics and report generation.
+
+Times every DBOperations query method, the class-trend and comparative
+analytics, and a full student report against a benchmark database seeded
+by benchmarks.datagen. Results (min / median / mean / p95 per case) are
+written as JSON and can be compared against a saved baseline; the run
+exits with status 1 if any case's median regressed by more than
+--tolerance.
+
+Usage (from the project root, against a local PostgreSQL):
+    python -m benchmarks.suite --scale small --seed-data --out results.json
+    python -m benchmarks.suite --students 1000 --baseline baseline.json
+    python -m benchmarks.suite --students 1000 --out baseline.json   # save a new baseline
+
+or against the embedded SQLite backend, with no server:
+    python -m benchmarks.suite --sqlite bench.sqlite3 --scale small --seed-data
+
+The report case renders charts with the chart cache disabled unless
+--chart-cache is given, so it measures rendering rather than cache reads.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.datagen import SCALES, SUBJECTS, enrolment_id, faculty_id, seed_database, seed_sqlite
+from database.connection_pool import ConnectionPool
+from database.db_operations import DBOperations, get_connection
+from database.schema import migrate
+from database.subjects import load_subject_acronyms
+
+# Regressions smaller than this are treated as timer noise whatever the ratio.
+NOISE_FLOOR_SECONDS = 0.001
+
+
+def benchmark_cases(db, students):
+    """
+    Returns [(name, callable)] for every case. Write cases are
+    (name, callable, restore): restore runs untimed after every call and
+    puts the touched rows back as seeded, so each repetition and every later
+    case (and run) sees the same data.
+    """
+    from analytics.percentiles import PercentileEngine
+    from analytics.snapshot import GradebookSnapshot, export_snapshot
+    from cli.faculty_cli import compute_class_trends
+    from cli.student_cli import build_student_report
+    from database.report_data import load_report_bundle
+
+    # A semester-3 student (i % 3 == 2) has scores in every semester.
+    student_no = max(students // 2 - (students // 2) % 3 + 2, 2)
+    student = enrolment_id(min(student_no, students))
+    faculty = faculty_id(1)
+    subject = SUBJECTS[2][0]
+    row = db.fetch_test_scores_for_subject(student, 2, subject) or (10, 10, 10, 10)
+    current_t1 = row[0]
+    edited_t1 = (current_t1 + 1) % 26
+
+    def restore_t1():
+        db.update_student_test_score(student, 2, subject, "T1", current_t1)
+
+    def restore_edits():
+        restore_t1()
+        with db.cursor() as cur:
+            cur.execute("DELETE FROM faculty_logs WHERE action LIKE 'Bench%'")
+
+    def comparative_analysis(snapshot=None):
+        # The computation behind view_comparative_analysis, without the window.
+        engine = PercentileEngine()
+        if snapshot is not None:
+            engine.add_semester(2, snapshot.semester_scores(2))
+        else:
+            engine.add_semester(2, db.fetch_semester_scores_all_students(2))
+        return engine.student_comparison(2, student)
+
+    # The snapshot cases reopen the snapshot each time, as a new process would.
+    snapshot_dir = tempfile.TemporaryDirectory(prefix="apt-bench-snapshot-")
+    snapshot_path = os.path.join(snapshot_dir.name, "snapshot")
+    export_snapshot(db, snapshot_path)
+
+    def open_snapshot():
+        snapshot_dir  # keep the directory alive as long as the cases
+        return GradebookSnapshot.open(snapshot_path)
+
+    def student_report():
+        bundle = load_report_bundle(db, student)
+        with tempfile.TemporaryDirectory() as out_dir:
+            build_student_report(bundle.student, bundle.scores, bundle.class_scores,
+                                 os.path.join(out_dir, "report.pdf"))
+
+    def drain(iterator):
+        return sum(len(chunk) for chunk in iterator)
+
+    # Re-imports the current marks of up to 500 students for one subject,
+    # so the data is unchanged and needs no restore.
+    import_rows = db.fetch_subject_roster(1, SUBJECTS[1][0])[:500]
+    import_csv = "enrolment_id,semester,subject,T1,T2,T3,T4\n" + "".join(
+        f"{r[0]},1,{SUBJECTS[1][0]},{r[2]},{r[3]},{r[4]},{r[5]}\n" for r in import_rows
+    )
+
+    def bulk_import():
+        return db.bulk_import_scores(io.StringIO(import_csv))
+
+    return [
+        ("db.fetch_student_by_enrolment", lambda: db.fetch_student_by_enrolment(student)),
+        ("db.fetch_faculty_password", lambda: db.fetch_faculty_password(faculty)),
+        ("db.fetch_student_scores", lambda: db.fetch_student_scores(student, 2)),
+        ("db.fetch_all_semester_scores", lambda: db.fetch_all_semester_scores(student)),
+        ("db.fetch_semester_scores_all_students", lambda: db.fetch_semester_scores_all_students(2)),
+        ("db.fetch_test_scores_for_subject", lambda: db.fetch_test_scores_for_subject(student, 2, subject)),
+        ("db.fetch_subjects_for_semester", lambda: db.fetch_subjects_for_semester(student, 2)),
+        ("db.fetch_all_scores", db.fetch_all_scores),
+        ("db.fetch_all_students", db.fetch_all_students),
+        ("db.fetch_student_overall_averages", db.fetch_student_overall_averages),
+        ("db.fetch_all_student_scores", db.fetch_all_student_scores),
+        ("db.iter_all_student_scores", lambda: drain(db.iter_all_student_scores())),
+        ("db.fetch_student_semester_summary", lambda: db.fetch_student_semester_summary(student)),
+        ("db.fetch_class_subject_summary", db.fetch_class_subject_summary),
+        ("db.fetch_faculty_logs", lambda: db.fetch_faculty_logs(faculty)),
+        ("db.fetch_faculty_logs_page", lambda: db.fetch_faculty_logs_page(faculty, 20)),
+        ("db.fetch_subject_roster", lambda: db.fetch_subject_roster(2, subject)),
+        ("db.fetch_semester_subjects", lambda: db.fetch_semester_subjects(2)),
+        ("db.fetch_subjects", db.fetch_subjects),
+        ("db.fetch_data_version", db.fetch_data_version),
+        ("db.update_student_test_score",
+         lambda: db.update_student_test_score(student, 2, subject, "T1", edited_t1), restore_t1),
+        ("db.apply_score_edits",
+         lambda: db.apply_score_edits(faculty, [(student, 2, subject, "T1", edited_t1)], action_prefix="Bench"),
+         restore_edits),
+        ("db.bulk_import_scores", bulk_import),
+        ("analytics.class_semester_trends", lambda: compute_class_trends(db)),
+        ("analytics.comparative_analysis", comparative_analysis),
+        ("snapshot.export", lambda: export_snapshot(db, snapshot_path)),
+        ("snapshot.class_semester_trends", lambda: compute_class_trends(snapshot=open_snapshot())),
+        ("snapshot.comparative_analysis", lambda: comparative_analysis(open_snapshot())),
+        ("report.generate_student_report", student_report),
+    ]
+
+
+def time_case(func, repeat, warmup=1, restore=None):
+    for _ in range(warmup):
+        result = func()
+        if restore:
+            restore()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+        if restore:
+            restore()
+    timings.sort()
+    return {
+        "min": timings[0],
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "p95": timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+        "repeat": repeat,
+        "rows": len(result) if isinstance(result, (list, tuple, dict)) else None,
+    }
+
+
+def run_suite(db, students, repeat, only=None):
+    results = {}
+    for name, func, *restore in benchmark_cases(db, students):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results[name] = time_case(func, repeat, restore=restore[0] if restore else None)
+        print(f"{name:45s} median {results[name]['median'] * 1000:9.2f} ms"
+              f"   p95 {results[name]['p95'] * 1000:9.2f} ms")
+    return results
+
+
+def environment(backend, students, seed):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "students": students,
+        "seed": seed,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "backend": backend,
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints each case's median against the baseline and returns the names
+    of cases that got slower by more than `tolerance` (e.g. 0.2 = 20%).
+    """
+    regressions = []
+    print(f"\n{'case':45s} {'baseline':>10s} {'now':>10s} {'change':>8s}")
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:45s} {'-':>10s} {now['median'] * 1000:8.2f}ms {'new':>8s}")
+            continue
+        change = now["median"] / before["median"] - 1 if before["median"] else 0.0
+        regressed = change > tolerance and now["median"] - before["median"] > NOISE_FLOOR_SECONDS
+        if regressed:
+            regressions.append(name)
+        print(f"{name:45s} {before['median'] * 1000:8.2f}ms {now['median'] * 1000:8.2f}ms "
+              f"{change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dbname", default="academic_bench", help="benchmark database")
+    parser.add_argument("--sqlite", metavar="PATH", help="benchmark the SQLite backend on this file instead")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=sorted(SCALES), default="small")
+    size.add_argument("--students", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-data", action="store_true",
+                        help="(re)generate the synthetic data before running (wipes the database)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--only", nargs="+", help="run only cases whose name contains one of these")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed median slowdown before a case counts as a regression")
+    parser.add_argument("--chart-cache", action="store_true", help="leave the chart cache enabled")
+    args = parser.parse_args()
+
+    if not args.chart_cache:
+        os.environ["APT_CHART_CACHE_MAX_MB"] = "0"
+    # Database cases always read the database; snapshot cases use their own.
+    os.environ.pop("APT_ANALYTICS_SNAPSHOT", None)
+    students = args.students or SCALES[args.scale]
+
+    counts = None
+    if args.sqlite:
+        import sqlite3
+        from database.sqlite_backend import SQLiteOperations
+
+        db = SQLiteOperations(args.sqlite)
+        if args.seed_data:
+            counts = seed_sqlite(db, students, seed=args.seed)
+        meta = environment(f"sqlite {sqlite3.sqlite_version}", students, args.seed)
+        close = db.close
+    else:
+        conn = get_connection(dbname=args.dbname)
+        try:
+            migrate(conn)
+            if args.seed_data:
+                counts = seed_database(conn, students, seed=args.seed)
+            with conn.cursor() as cur:
+                cur.execute("SHOW server_version")
+                meta = environment(f"postgres {cur.fetchone()[0]}", students, args.seed)
+        finally:
+            conn.close()
+        pool = ConnectionPool(lambda: get_connection(dbname=args.dbname), min_size=1, max_size=4)
+        db = DBOperations(pool=pool)
+        close = pool.closeall
+    if counts:
+        print("Seeded " + ", ".join(f"{n} {table}" for table, n in counts.items()))
+    # Reports look acronyms up through the subjects table of this database.
+    load_subject_acronyms(db)
+
+    try:
+        results = run_suite(db, students, args.repeat, args.only)
+    finally:
+        close()
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("students") != students:
+            print(f"warning: baseline was recorded with {baseline['meta'].get('students')} students, "
+                  f"this run used {students}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} case(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+        print(f"\nOK: no case regressed by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import time
+
+from rich.console import Console
+from rich.table import Table
+from database.backend import get_db
+
+console = Console()
+
+# Class-wide scores (and their percentile ranks) shared by every report a
+# worker builds; set once per worker process by _init_worker instead of
+# being pickled and re-ranked with every task.
+_worker_class_scores = None
+_worker_percentiles = None
+
+
+def _init_worker(class_scores):
+    global _worker_class_scores, _worker_percentiles
+    from analytics.percentiles import PercentileEngine
+    _worker_class_scores = class_scores
+    _worker_percentiles = PercentileEngine.from_class_scores(class_scores)
+
+
+def _build_report_task(student, all_scores, pdf_file):
+    """
+    Runs in a worker process. Returns (enrolment_id, error) where error is
+    None on success, so one bad report never aborts the batch.
+    """
+    from cli.student_cli import build_student_report
+    try:
+        build_student_report(student, all_scores, _worker_class_scores, pdf_file,
+                             percentiles=_worker_percentiles)
+        return student[0], None
+    except Exception as e:
+        return student[0], f"{type(e).__name__}: {e}"
+
+
+def load_batch_report_data(db, enrolment_ids=None, semester=None):
+    """
+    Fetches everything a batch of reports needs in one query (see
+    database.report_data): the selected students (by enrolment ID list or
+    current semester), each one's own score rows, and the class-wide
+    {semester: [(enrolment_id, subject, total_score)]} data for the
+    semesters they have taken.
+    Returns (students, scores_by_student, class_scores, missing_ids).
+    """
+    from database.report_data import load_report_bundles
+
+    if enrolment_ids is not None:
+        wanted = list(dict.fromkeys(enrolment_ids))
+        bundles, class_scores = load_report_bundles(db, enrolment_ids=wanted)
+        students = [bundles[e].student for e in wanted if e in bundles]
+        missing_ids = [e for e in wanted if e not in bundles]
+    else:
+        bundles, class_scores = load_report_bundles(db, semester=semester)
+        students = [bundle.student for bundle in bundles.values()]
+        missing_ids = []
+
+    scores_by_student = {e: bundle.scores for e, bundle in bundles.items()}
+    return students, scores_by_student, class_scores, missing_ids
+
+
+def generate_batch_reports(enrolment_ids=None, semester=None, output_dir="reports", workers=None,
+                           db=None, quiet=False):
+    """
+    Builds PDF reports for many students in parallel.
+    Pass either a list of enrolment IDs or a semester (all students currently
+    in that semester); with neither, reports are built for every student.
+    Class-wide data is fetched once and shared with the worker processes.
+    With quiet=True nothing is printed (for scripted use).
+    Returns a dict with the generated files, failures and throughput.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from rich.progress import Progress, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+    db = db or get_db()
+    students, scores_by_student, class_scores, missing_ids = load_batch_report_data(
+        db, enrolment_ids=enrolment_ids, semester=semester
+    )
+    failures = [(e, "Student record not found") for e in missing_ids]
+    generated = []
+
+    if not students:
+        if not quiet:
+            console.print("[yellow]No students selected for report generation.[/yellow]")
+        return {"generated": generated, "failures": failures, "elapsed": 0.0, "reports_per_second": 0.0}
+
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    with Progress(
+        "[progress.description]{task.description}",
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+        disable=quiet
+    ) as progress:
+        task = progress.add_task("Generating reports", total=len(students))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(class_scores,)) as executor:
+            futures = {}
+            for student in students:
+                pdf_file = os.path.join(output_dir, f"student_report_{student[0]}.pdf")
+                future = executor.submit(_build_report_task, student, scores_by_student.get(student[0], []), pdf_file)
+                futures[future] = (student[0], pdf_file)
+
+            for future in as_completed(futures):
+                enrolment_id, pdf_file = futures[future]
+                try:
+                    _, error = future.result()
+                except Exception as e:  # e.g. a worker process died
+                    error = f"{type(e).__name__}: {e}"
+                if error:
+                    failures.append((enrolment_id, error))
+                    if not quiet:
+                        progress.console.print(f"[red]Report failed for {enrolment_id}: {error}[/red]")
+                else:
+                    generated.append(pdf_file)
+                progress.advance(task)
+
+    elapsed = time.perf_counter() - start
+    rate = len(generated) / elapsed if elapsed > 0 else 0.0
+    if not quiet:
+        console.print(
+            f"[green]Generated {len(generated)} report(s) in {elapsed:.1f}s "
+            f"({rate:.2f} reports/s) into {output_dir}[/green]"
+        )
+        if failures:
+            table = Table(title="Failed Reports")
+            table.add_column("Enrolment ID", style="cyan", no_wrap=True)
+            table.add_column("Error", style="red")
+            for enrolment_id, error in failures:
+                table.add_row(enrolment_id, error)
+            console.print(table)
+
+    return {"generated": generated, "failures": failures, "elapsed": elapsed, "reports_per_second": rate}
+
+
+def batch_report_generation():
+    """
+    Prompts the faculty member for a cohort (a semester or a list of
+    enrolment IDs) and generates a report for every selected student.
+    """
+    selection = input("Enter a semester (1-3) or comma-separated Enrollment IDs (or 'cancel' to abort): ").strip()
+    if not selection or selection.lower() == "cancel":
+        console.print("[yellow]Operation cancelled.[/yellow]")
+        return
+
+    enrolment_ids = None
+    semester = None
+    if selection in ["1", "2", "3"]:
+        semester = int(selection)
+    else:
+        enrolment_ids = [e.strip() for e in selection.split(",") if e.strip()]
+
+    output_dir = input("Output directory [reports]: ").strip() or "reports"
+    generate_batch_reports(enrolment_ids=enrolment_ids, semester=semester, output_dir=output_dir)
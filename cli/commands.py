@@ -0,0 +1,215 @@
+import argparse
+import csv
+import json
+import os
+import signal
+import sys
+
+from database.backend import get_db
+
+OVERVIEW_FIELDS = ["enrolment_id", "fullname", "semester", "overall_avg", "row_count"]
+
+
+def write_records(records, fields, fmt, out=None):
+    """
+    Writes a list of dicts as JSON (an array) or CSV (with a header row)
+    to the given file path, or to stdout if out is None.
+    """
+    stream = open(out, "w", newline="") if out else sys.stdout
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(stream, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            json.dump(records, stream, indent=2, default=str)
+            stream.write("\n")
+    finally:
+        if out:
+            stream.close()
+
+
+def overview_records(db, min_avg=None, max_avg=None, scored_only=False):
+    rows = db.fetch_student_overall_averages(min_avg=min_avg, max_avg=max_avg, scored_only=scored_only)
+    records = []
+    for enrolment_id, fullname, semester, overall_avg, row_count in rows:
+        records.append({
+            "enrolment_id": enrolment_id,
+            "fullname": fullname,
+            "semester": semester,
+            "overall_avg": round(overall_avg, 2) if overall_avg is not None else None,
+            "row_count": row_count,
+        })
+    return records
+
+
+def cmd_overview(args, db):
+    write_records(overview_records(db), OVERVIEW_FIELDS, args.format, args.out)
+    return 0
+
+
+def cmd_interventions(args, db):
+    records = overview_records(db, min_avg=args.min_avg, max_avg=args.max_avg, scored_only=True)
+    write_records(records, OVERVIEW_FIELDS, args.format, args.out)
+    return 0
+
+
+def cmd_trends(args, db):
+    from cli.faculty_cli import compute_class_trends
+
+    trends = compute_class_trends(db)
+    records = []
+    if trends is not None:
+        sem_summary, pivot = trends
+        for semester, avg in zip(sem_summary['semester'], sem_summary['total_score']):
+            records.append({"scope": "semester", "semester": int(semester), "acronym": None,
+                            "avg_total_score": round(float(avg), 2)})
+        for acronym, row in pivot.iterrows():
+            for semester, avg in row.dropna().items():
+                records.append({"scope": "subject", "semester": int(semester), "acronym": acronym,
+                                "avg_total_score": round(float(avg), 2)})
+    write_records(records, ["scope", "semester", "acronym", "avg_total_score"], args.format, args.out)
+    return 0
+
+
+def cmd_snapshot(args, db):
+    from analytics.snapshot import export_snapshot
+
+    manifest = export_snapshot(db, args.out)
+    json.dump({"directory": args.out, "rows": manifest["rows"], "created_at": manifest["created_at"]},
+              sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def cmd_report(args, db):
+    from cli.batch_reports import generate_batch_reports
+
+    result = generate_batch_reports(
+        enrolment_ids=args.enrolment, semester=args.semester, output_dir=args.output_dir,
+        workers=args.workers, db=db, quiet=True
+    )
+    summary = {
+        "generated": result["generated"],
+        "failures": [{"enrolment_id": e, "error": error} for e, error in result["failures"]],
+        "elapsed": round(result["elapsed"], 3),
+        "reports_per_second": round(result["reports_per_second"], 3),
+    }
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump(summary, out, indent=2)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 1 if result["failures"] else 0
+
+
+def cmd_import_scores(args, db):
+    with open(args.csv_file, newline="") as csv_file:
+        result = db.bulk_import_scores(csv_file, faculty_id=args.faculty_id)
+    if result is None:
+        return 1
+    result["rejected"] = [
+        dict(zip(["line_no", "enrolment_id", "semester", "subject", "reason"], row))
+        for row in result["rejected"]
+    ]
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def cmd_serve(args, db):
+    from api.server import APIServer
+
+    try:
+        server = APIServer((args.host, args.port), db, access_log=args.access_log)
+    except (OSError, ValueError) as e:
+        print(f"Cannot start the API server: {e}", file=sys.stderr)
+        return 1
+    print(f"Serving the read API on http://{args.host}:{args.port}/api/ (Ctrl+C to stop)", file=sys.stderr)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt  # shut down the same way on SIGTERM (e.g. from a service manager)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Academic Performance Tracker. Run without arguments for the interactive menus, "
+                    "or use a subcommand for scripted analytics."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_output_options(sub):
+        sub.add_argument("--format", choices=["json", "csv"], default="json")
+        sub.add_argument("--out", help="write to this file instead of stdout")
+
+    overview = subparsers.add_parser("overview", help="overall average score of every student")
+    add_output_options(overview)
+    overview.set_defaults(func=cmd_overview)
+
+    interventions = subparsers.add_parser("interventions", help="students filtered by overall average")
+    interventions.add_argument("--min-avg", type=float)
+    interventions.add_argument("--max-avg", type=float)
+    add_output_options(interventions)
+    interventions.set_defaults(func=cmd_interventions)
+
+    trends = subparsers.add_parser("trends", help="class average per semester and per subject/semester")
+    add_output_options(trends)
+    trends.set_defaults(func=cmd_trends)
+
+    report = subparsers.add_parser("report", help="generate PDF reports; prints a JSON summary")
+    selection = report.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--enrolment", nargs="+", metavar="ENROLMENT_ID")
+    selection.add_argument("--semester", type=int, choices=[1, 2, 3],
+                           help="every student currently in this semester")
+    report.add_argument("--output-dir", default="reports")
+    report.add_argument("--workers", type=int)
+    report.add_argument("--out", help="write the JSON summary to this file instead of stdout")
+    report.set_defaults(func=cmd_report)
+
+    import_scores = subparsers.add_parser("import-scores", help="bulk import a CSV of test scores")
+    import_scores.add_argument("csv_file")
+    import_scores.add_argument("--faculty-id", help="record the import in this faculty member's audit log")
+    import_scores.set_defaults(func=cmd_import_scores)
+
+    snapshot = subparsers.add_parser("snapshot", help="export student_scores as a memory-mapped columnar snapshot")
+    snapshot.add_argument("--out", default=os.environ.get("APT_ANALYTICS_SNAPSHOT", "snapshot"),
+                          help="snapshot directory (default $APT_ANALYTICS_SNAPSHOT or ./snapshot)")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    serve = subparsers.add_parser("serve", help="serve a read-only JSON API of students' scores over HTTP")
+    serve.add_argument("--host", default=os.environ.get("APT_API_HOST", "127.0.0.1"),
+                       help="interface to bind (default $APT_API_HOST or 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=int(os.environ.get("APT_API_PORT", "8080")),
+                       help="port (default $APT_API_PORT or 8080)")
+    serve.add_argument("--access-log", action="store_true", help="log every request to stderr")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def run(argv):
+    """
+    Runs one subcommand in this process against the configured storage
+    backend (see database.backend.get_db) and returns the process exit status.
+    """
+    args = build_parser().parse_args(argv)
+    db = get_db()
+    try:
+        return args.func(args, db)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`). Point stdout at devnull so
+        # the flush at interpreter exit does not raise again, and stop quietly.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
@@ -1,11 +1,9 @@
 from auth.faculty_auth import faculty_login
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
+from auth.sessions import get_login_throttle, get_sessions
 from rich.table import Table
 from rich.console import Console
-from database.db_operations import DBOperations
-from utils.input_validation import get_acronym
+from database.backend import get_db
+from database.subjects import subject_acronym
 from cli.student_cli import (
     view_individual_scores,
     view_semester_performance,
@@ -13,7 +11,9 @@ from cli.student_cli import (
     view_trend_insights,
     generate_student_report
 )
-from utils.Stack_DSA import Stack_DSA
+from cli.batch_reports import batch_report_generation
+from utils.edit_history import EditHistory
+from database.instrumentation import query_stats
 
 console = Console()
 
@@ -32,36 +32,28 @@ def select_subject(db, enrolment_id, semester):
         else:
             fullname = enrolment_id  # fallback if not found
 
-        with db.conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT subject
-                FROM student_scores
-                WHERE enrolment_id = %s AND semester = %s
-                ORDER BY subject
-            """, (enrolment_id, semester))
-            rows = cur.fetchall()
-            if not rows:
-                console.print(
-                    f"[yellow]No subjects found for student {fullname} ({enrolment_id}) in semester {semester}.[/yellow]")
-                return None
-            subjects = [row[0] for row in rows]
-            console.print()
-            console.print(f"Subjects for student [green][bold]{fullname}[/bold][/green] ({enrolment_id}) in semester {semester}:")
-            for idx, subj in enumerate(subjects, start=1):
-                console.print(f"{idx}. {subj}")
-            choice = input("Enter subject number (or type 'cancel' to abort): ").strip()
-            if choice.lower() == "cancel":
-                return None
-            try:
-                choice_num = int(choice)
-                if 1 <= choice_num <= len(subjects):
-                    return subjects[choice_num - 1]
-                else:
-                    console.print("[red]Invalid choice number.[/red]")
-                    return None
-            except ValueError:
-                console.print("[red]Invalid input. Expected a number.[/red]")
+        subjects = db.fetch_subjects_for_semester(enrolment_id, semester)
+        if not subjects:
+            console.print(
+                f"[yellow]No subjects found for student {fullname} ({enrolment_id}) in semester {semester}.[/yellow]")
+            return None
+        console.print()
+        console.print(f"Subjects for student [green][bold]{fullname}[/bold][/green] ({enrolment_id}) in semester {semester}:")
+        for idx, subj in enumerate(subjects, start=1):
+            console.print(f"{idx}. {subj}")
+        choice = input("Enter subject number (or type 'cancel' to abort): ").strip()
+        if choice.lower() == "cancel":
+            return None
+        try:
+            choice_num = int(choice)
+            if 1 <= choice_num <= len(subjects):
+                return subjects[choice_num - 1]
+            else:
+                console.print("[red]Invalid choice number.[/red]")
                 return None
+        except ValueError:
+            console.print("[red]Invalid input. Expected a number.[/red]")
+            return None
     except Exception as e:
         console.print(f"[red]Error selecting subject: {e}[/red]")
         return None
@@ -72,10 +64,10 @@ def comprehensive_student_overview():
     Displays a summary table of all students, including
     their overall average score across all semesters & subjects.
     """
-    db = DBOperations()
+    db = get_db()
 
-    # 1. Fetch all students
-    students = db.fetch_all_students()
+    # 1. Fetch every student with their overall average in one query
+    students = db.fetch_student_overall_averages()
     if not students:
         console.print("[yellow]No students found in the database.[/yellow]")
         return
@@ -87,24 +79,12 @@ def comprehensive_student_overview():
     table.add_column("Current Semester", style="green", justify="center")
     table.add_column("Overall Avg Score", style="blue", justify="center")
 
-    # 3. For each student, compute overall average across all semesters
-    for enrolment_id, fullname, current_sem in students:
-        # Reuse method from student_cli (or DBOperations) to get all scores
-        all_scores = db.fetch_all_semester_scores(enrolment_id)
-        if not all_scores:
+    # 3. Add a row per student (the average is computed by the database)
+    for enrolment_id, fullname, current_sem, overall_avg, row_count in students:
+        if overall_avg is None or row_count == 0:
             overall_avg = "No Data"
         else:
-            total_score_sum = 0
-            total_count = 0
-            for row in all_scores:
-                # row => (semester, subject, T1, T2, T3, T4, total_score)
-                total_score_sum += row[6]  # total_score is at index 6
-                total_count += 1
-
-            if total_count > 0:
-                overall_avg = round(total_score_sum / total_count, 2)
-            else:
-                overall_avg = "No Data"
+            overall_avg = round(overall_avg, 2)
 
         # 4. Add a row for this student
         table.add_row(
@@ -127,7 +107,7 @@ def individual_student_analysis():
     console.print("Enter the Enrollment ID of the student for analysis: ", end="")
     student_id = input().strip()
 
-    db = DBOperations()
+    db = get_db()
     student = db.fetch_student_by_enrolment(student_id)
     if not student:
         console.print("[red]Student not found.[/red]")
@@ -164,38 +144,69 @@ def individual_student_analysis():
             console.print("[red]Invalid choice. Please try again.[/red]")
 
 
-def class_semester_trends():
+def compute_class_trends(db=None, snapshot=None):
     """
-    Displays class-wide trends:
-      1) A line graph of the average total score per semester across all students.
-      2) A heatmap of the average total score per subject (acronym) per semester.
+    Computes the class-wide trend data shown by class_semester_trends:
+      - sem_summary: DataFrame(semester, total_score) with the average total score per semester
+      - pivot: DataFrame of the average total score per subject acronym (rows) and
+        semester (columns); NaN where a subject was not taken in a semester
+    Both are derived from class_subject_summary (one row per semester and
+    subject), so the cost does not grow with the number of score rows.
+    If a columnar snapshot is given, or configured via APT_ANALYTICS_SNAPSHOT,
+    the summary is computed from it instead of the database.
+    Returns (sem_summary, pivot), or None if there is no class data.
     """
-    db = DBOperations()
-
-    # Fetch all student scores from the database.
-    # This method should return a list of tuples:
-    # (enrolment_id, subject, T1, T2, T3, T4, total_score, semester)
-    all_scores = db.fetch_all_student_scores()
-    if not all_scores:
-        console.print("[red]No class data available.[/red]")
-        return
+    import pandas as pd
+    from analytics.aggregates import GroupedMean
+    from analytics.snapshot import get_snapshot
+
+    snapshot = snapshot or get_snapshot()
+
+    # rows => (semester, subject, score_count, score_sum, avg, min, max, stddev)
+    if snapshot is not None:
+        summary = snapshot.class_subject_summary()
+    else:
+        summary = (db or get_db()).fetch_class_subject_summary()
+    if not summary:
+        return None
 
-    # Convert data to a pandas DataFrame.
-    df = pd.DataFrame(
-        all_scores,
-        columns=['enrolment_id', 'subject', 'T1', 'T2', 'T3', 'T4', 'total_score', 'semester']
-    )
+    by_semester = GroupedMean()
+    by_subject = GroupedMean()
+    for semester, subject, score_count, score_sum, *_ in summary:
+        by_semester.add_sum(semester, score_sum, score_count)
+        # Several subjects can share an acronym; their sums and counts are pooled.
+        by_subject.add_sum((subject_acronym(subject), semester), score_sum, score_count)
 
     # -------------------------------
     # 1. Line Graph: Average Total Score per Semester
     # -------------------------------
-    sem_summary = df.groupby('semester')['total_score'].mean().reset_index().sort_values('semester')
+    sem_summary = pd.DataFrame(
+        sorted(by_semester.means().items()), columns=['semester', 'total_score']
+    )
 
     # -------------------------------
     # 2. Heatmap: Average Total Score by Subject (Acronym) and Semester
     # -------------------------------
-    df['acronym'] = df['subject'].apply(get_acronym)
-    pivot = df.pivot_table(index='acronym', columns='semester', values='total_score', aggfunc='mean').fillna(0)
+    pivot = pd.Series(by_subject.means()).unstack().sort_index().sort_index(axis=1)
+    pivot.index.name = 'acronym'
+    pivot.columns.name = 'semester'
+    return sem_summary, pivot
+
+
+def class_semester_trends():
+    """
+    Displays class-wide trends:
+      1) A line graph of the average total score per semester across all students.
+      2) A heatmap of the average total score per subject (acronym) per semester.
+    """
+    import matplotlib.pyplot as plt
+
+    trends = compute_class_trends()
+    if trends is None:
+        console.print("[red]No class data available.[/red]")
+        return
+    sem_summary, pivot = trends
+    pivot = pivot.fillna(0)
 
     # Create subplots: one for the line graph and one for the heatmap
     fig, (ax1, ax2) = plt.subplots(nrows=2, ncols=1, figsize=(8, 10))
@@ -220,36 +231,81 @@ def class_semester_trends():
     plt.show()
 
 
+AUDIT_PAGE_SIZE = 20
+
+
+def parse_date_filter(prompt):
+    """
+    Prompts for an optional YYYY-MM-DD date. Returns a datetime at midnight,
+    or None if the input is empty or invalid (an invalid date is reported
+    and the filter ignored).
+    """
+    from datetime import datetime
+
+    value = input(prompt).strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        console.print(f"[yellow]Invalid date '{value}'; ignoring this filter.[/yellow]")
+        return None
+
+
 def audit_log_data(faculty_id):
     """
-    Fetches audit logs for the given faculty_id, stores them in a stack,
-    and then displays the logs in LIFO order.
+    Shows the faculty member's audit log, most recent first, one page at a time.
+    Optional filters: student, date range and action text. Only the page on
+    screen is fetched, so long histories load as quickly as short ones.
     """
-    db = DBOperations()
-    logs = db.fetch_faculty_logs(faculty_id)
-    if not logs:
-        console.print("[yellow]No audit logs found for your account.[/yellow]")
-        return
+    from datetime import timedelta
 
-    # Create a stack and push all log entries onto it.
-    log_stack = Stack_DSA()
-    for log_entry in logs:
-        log_stack.push(log_entry)
+    db = get_db()
 
-    console.print("[bold blue]Audit Log Data (Most Recent on Top):[/bold blue]")
-    while not log_stack.is_empty():
-        log_entry = log_stack.pop()
-        # log_entry format: (log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp)
-        log_text = (
-            f"[cyan]Log ID:[/cyan] {log_entry[0]} | "
-            f"[cyan]Student:[/cyan] {log_entry[2]} | "
-            f"[cyan]Action:[/cyan] {log_entry[3]} | "
-            f"[cyan]Old Value:[/cyan] {log_entry[4]} | "
-            f"[cyan]New Value:[/cyan] {log_entry[5]} | "
-            f"[cyan]Time:[/cyan] {log_entry[6]}"
+    enrolment_id = input("Filter by Enrollment ID (or press Enter for all students): ").strip() or None
+    date_from = parse_date_filter("From date YYYY-MM-DD (or press Enter for no limit): ")
+    date_to = parse_date_filter("To date YYYY-MM-DD, inclusive (or press Enter for no limit): ")
+    if date_to is not None:
+        date_to += timedelta(days=1)
+    action = input("Action contains (e.g. a subject or test, or press Enter for any): ").strip() or None
+
+    after = None
+    page = 1
+    while True:
+        logs, next_after = db.fetch_faculty_logs_page(
+            faculty_id, page_size=AUDIT_PAGE_SIZE, after=after, enrolment_id=enrolment_id,
+            date_from=date_from, date_to=date_to, action=action
         )
-        console.print(log_text)
+        if not logs:
+            if page == 1 and any([enrolment_id, date_from, date_to, action]):
+                console.print("[yellow]No audit logs match these filters.[/yellow]")
+            elif page == 1:
+                console.print("[yellow]No audit logs found for your account.[/yellow]")
+            return
 
+        table = Table(title=f"Audit Log Data (Most Recent First) - Page {page}")
+        table.add_column("Log ID", style="cyan", justify="right")
+        table.add_column("Student", style="magenta", no_wrap=True)
+        table.add_column("Action", style="white")
+        table.add_column("Old Value", style="red")
+        table.add_column("New Value", style="green")
+        table.add_column("Time", style="blue", no_wrap=True)
+        # log_entry format: (log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp)
+        for log_entry in logs:
+            table.add_row(
+                str(log_entry[0]), str(log_entry[2]), str(log_entry[3]),
+                str(log_entry[4]), str(log_entry[5]), str(log_entry[6])
+            )
+        console.print(table)
+
+        if next_after is None:
+            console.print("[green]End of audit log.[/green]")
+            return
+        choice = input("Press Enter for the next page, or 'q' to return to the menu: ").strip().lower()
+        if choice in ["q", "quit", "cancel"]:
+            return
+        after = next_after
+        page += 1
 
 
 def data_driven_interventions():
@@ -271,39 +327,11 @@ def data_driven_interventions():
         console.print("[yellow]Invalid input for maximum average; ignoring this filter.[/yellow]")
         max_avg = None
 
-    db = DBOperations()
+    db = get_db()
 
-    # Fetch all students (each student record: (enrolment_id, fullname, semester))
-    students = db.fetch_all_students()
-    if not students:
-        console.print("[yellow]No students found in the database.[/yellow]")
-        return
-
-    results_table = []
-    # For each student, compute the overall average score
-    for student in students:
-        enrolment_id, fullname, current_sem = student
-        all_scores = db.fetch_all_semester_scores(enrolment_id)
-        if not all_scores:
-            overall_avg = None
-        else:
-            total = sum(row[6] for row in all_scores)  # total_score is at index 6
-            count = len(all_scores)
-            overall_avg = total / count if count > 0 else None
-        results_table.append((enrolment_id, fullname, current_sem, overall_avg))
-
-    # Filter results based on provided criteria
-    filtered_students = []
-    for rec in results_table:
-        enrolment_id, fullname, current_sem, overall_avg = rec
-        # Skip student if no data available
-        if overall_avg is None:
-            continue
-        if min_avg is not None and overall_avg < min_avg:
-            continue
-        if max_avg is not None and overall_avg > max_avg:
-            continue
-        filtered_students.append(rec)
+    # Overall averages are computed and filtered in SQL, so only matching
+    # students are returned (students without scores never match).
+    filtered_students = db.fetch_student_overall_averages(min_avg=min_avg, max_avg=max_avg, scored_only=True)
 
     if not filtered_students:
         console.print("[yellow]No students match the filtering criteria.[/yellow]")
@@ -318,13 +346,13 @@ def data_driven_interventions():
     table.add_column("Overall Avg Score", justify="center", style="blue")
 
     for rec in filtered_students:
-        enrolment_id, fullname, current_sem, overall_avg = rec
+        enrolment_id, fullname, current_sem, overall_avg, _ = rec
         table.add_row(enrolment_id, fullname, str(current_sem), f"{overall_avg:.2f}")
 
     console.print(table)
 
 
-def real_time_updates(faculty_id):
+def real_time_updates(faculty_id, history=None):
     """
       1. Ask for the student's enrollment ID.
       2. Verify the student exists.
@@ -336,8 +364,9 @@ def real_time_updates(faculty_id):
       8. Ask for the new score (integer between 0 and 25).
       9. Update the record, recalculate total score, and log the change.
       At any step, entering "cancel" will abort the update.
+    The change is recorded in `history` (an EditHistory) so it can be undone.
     """
-    db = DBOperations()
+    db = get_db()
 
     # Step 1: Ask for student's enrollment ID
     student_id = input("Enter the student's Enrollment ID (or 'cancel' to abort): ").strip()
@@ -404,34 +433,245 @@ def real_time_updates(faculty_id):
         console.print("[red]Invalid score input. Operation aborted.[/red]")
         return
 
-    # Step 8: Update the student's test score using DBOperations
-    update_result = db.update_student_test_score(student_id, semester, chosen_subject, test_field, new_value)
+    # Step 8: Update the score and write the audit log in one transaction.
+    update_result = db.apply_score_edits(
+        faculty_id, [(student_id, semester, chosen_subject, test_field, new_value)]
+    )
     if not update_result:
         console.print("[red]Failed to update the score. Operation aborted.[/red]")
         return
 
-    old_value, new_total = update_result
-
-    # Prepare a log message
+    if history is not None:
+        history.record(f"{student_id} {chosen_subject} {test_field}", update_result)
+    _, _, _, _, old_value, _, new_total = update_result[0]
     action_msg = (f"Updated {chosen_subject} {test_field}: {old_value} -> {new_value}, "
                   f"new total score = {new_total}")
-    # Step 9: Insert a log record into faculty_logs table.
-    db.insert_faculty_log(faculty_id, student_id, action_msg, str(old_value), str(new_value))
     console.print("[green]Update successful![/green]")
     console.print(f"[green]{action_msg}[/green]")
 
 
+def batch_score_entry(faculty_id, history=None):
+    """
+    Enter one test (e.g. T3) for every student taking a subject in a semester,
+    then apply all the marks and their audit log entries in a single round trip.
+    Press Enter to skip a student; type 'cancel' at any prompt to abort.
+    The whole batch is recorded in `history` (an EditHistory) as one undoable step.
+    """
+    db = get_db()
+
+    sem_input = input("Enter the semester (1-3) (or 'cancel' to abort): ").strip()
+    if sem_input.lower() == "cancel":
+        console.print("[yellow]Operation cancelled.[/yellow]")
+        return
+    try:
+        semester = int(sem_input)
+        if semester not in [1, 2, 3]:
+            console.print("[red]Invalid semester. Operation aborted.[/red]")
+            return
+    except ValueError:
+        console.print("[red]Invalid input. Operation aborted.[/red]")
+        return
+
+    subjects = db.fetch_semester_subjects(semester)
+    if not subjects:
+        console.print(f"[yellow]No subjects found for semester {semester}.[/yellow]")
+        return
+    for idx, subj in enumerate(subjects, start=1):
+        console.print(f"{idx}. {subj}")
+    choice = input("Enter subject number (or 'cancel' to abort): ").strip()
+    if choice.lower() == "cancel":
+        console.print("[yellow]Operation cancelled.[/yellow]")
+        return
+    try:
+        choice_num = int(choice)
+    except ValueError:
+        choice_num = 0
+    if not 1 <= choice_num <= len(subjects):
+        console.print("[red]Invalid choice number. Operation aborted.[/red]")
+        return
+    subject = subjects[choice_num - 1]
+
+    test_field = input("Enter the test field to enter (T1, T2, T3, T4) (or 'cancel' to abort): ").strip().upper()
+    if test_field == "CANCEL":
+        console.print("[yellow]Operation cancelled.[/yellow]")
+        return
+    if test_field not in ['T1', 'T2', 'T3', 'T4']:
+        console.print("[red]Invalid test field. Operation aborted.[/red]")
+        return
+
+    roster = db.fetch_subject_roster(semester, subject)
+    if not roster:
+        console.print(f"[yellow]No students found for '{subject}' in semester {semester}.[/yellow]")
+        return
+
+    test_index = ['T1', 'T2', 'T3', 'T4'].index(test_field) + 2  # offset into roster rows
+    edits = []
+    for row in roster:
+        enrolment_id, fullname = row[0], row[1]
+        while True:
+            value_input = input(
+                f"{enrolment_id} {fullname} ({test_field} currently {row[test_index]}) [0-25, Enter to skip]: "
+            ).strip()
+            if value_input.lower() == "cancel":
+                console.print("[yellow]Operation cancelled. No scores were changed.[/yellow]")
+                return
+            if not value_input:
+                break
+            try:
+                value = int(value_input)
+                if 0 <= value <= 25:
+                    edits.append((enrolment_id, semester, subject, test_field, value))
+                    break
+            except ValueError:
+                pass
+            console.print("[red]Score must be a whole number between 0 and 25.[/red]")
+
+    if not edits:
+        console.print("[yellow]No scores entered.[/yellow]")
+        return
+
+    results = db.apply_score_edits(faculty_id, edits)
+    if results is None:
+        console.print("[red]Failed to save the scores. No scores were changed.[/red]")
+        return
+    if history is not None:
+        history.record(f"semester {semester} {subject} {test_field} ({len(results)} students)", results)
+    console.print(f"[green]Saved {len(results)} {test_field} score(s) for '{subject}' (semester {semester}).[/green]")
+
+
+def undo_score_edit(faculty_id, history, redo=False):
+    """
+    Undoes the most recent score edit (or batch) of this session, or redoes
+    the most recently undone one. The whole batch is applied in one
+    transaction and logged to the audit trail as 'Undo' / 'Redo' entries.
+    """
+    verb = "redo" if redo else "undo"
+    if not (history.can_redo() if redo else history.can_undo()):
+        console.print(f"[yellow]Nothing to {verb}.[/yellow]")
+        return
+
+    db = get_db()
+    outcome = history.redo(db, faculty_id) if redo else history.undo(db, faculty_id)
+    if outcome is None:
+        console.print(f"[red]Failed to {verb} the last edit. No scores were changed.[/red]")
+        return
+
+    label, applied, skipped = outcome
+    console.print(f"[green]{verb.capitalize()} successful: {label}[/green]")
+    for enrolment_id, _, subject, test_field, old_value, new_value, new_total in applied:
+        console.print(f"  {enrolment_id} {subject} {test_field}: {old_value} -> {new_value}, "
+                      f"new total score = {new_total}")
+    if skipped:
+        console.print(f"[yellow]{skipped} test(s) had no previous score and were left unchanged.[/yellow]")
+
+
+def bulk_score_import(faculty_id):
+    """
+    Imports a semester's marks from a CSV file with the header
+    enrolment_id,semester,subject,T1,T2,T3,T4 in one transaction,
+    then reports the rejected rows and the import throughput.
+    """
+    csv_path = input("Enter the path of the CSV file to import (or 'cancel' to abort): ").strip()
+    if not csv_path or csv_path.lower() == "cancel":
+        console.print("[yellow]Operation cancelled.[/yellow]")
+        return
+
+    db = get_db()
+    try:
+        with open(csv_path, newline="") as csv_file:
+            result = db.bulk_import_scores(csv_file, faculty_id=faculty_id)
+    except OSError as e:
+        console.print(f"[red]Could not open '{csv_path}': {e}[/red]")
+        return
+
+    if result is None:
+        console.print("[red]Import failed; no scores were changed.[/red]")
+        return
+
+    console.print(
+        f"[green]Imported {result['rows']} row(s): {result['updated']} updated, "
+        f"{result['inserted']} inserted, {len(result['rejected'])} rejected "
+        f"({result['rows_per_second']:.0f} rows/s).[/green]"
+    )
+
+    if result['rejected']:
+        table = Table(title="Rejected Rows")
+        table.add_column("Line", justify="right", style="cyan")
+        table.add_column("Enrollment ID", style="magenta")
+        table.add_column("Semester", justify="center")
+        table.add_column("Subject")
+        table.add_column("Reason", style="red")
+        for line_no, enrolment_id, semester, subject, reason in result['rejected']:
+            table.add_row(str(line_no), enrolment_id or "", semester or "", subject or "", reason)
+        console.print(table)
+
+
+def performance_stats():
+    """
+    Shows the query statistics collected by database/instrumentation.py since
+    start-up (or the last reset), slowest methods first, and optionally saves
+    them as JSON.
+    """
+    stats = query_stats.snapshot()
+    if not stats:
+        console.print("[yellow]No queries recorded yet (recording is off when APT_DB_STATS=0).[/yellow]")
+        return
+
+    table = Table(title=f"Query Performance since {query_stats.started_at:%Y-%m-%d %H:%M:%S}")
+    table.add_column("Method", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("Avg ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Rows", justify="right")
+    table.add_column("~Bytes", justify="right")
+    table.add_column("Total s", justify="right", style="magenta")
+    for name, s in sorted(stats.items(), key=lambda item: item[1]["total_seconds"], reverse=True):
+        table.add_row(
+            name, str(s["calls"]), str(s["errors"]), f"{s['avg_ms']:.2f}", f"{s['p95_ms']:g}",
+            f"{s['max_seconds'] * 1000:.2f}", str(s["rows"]), str(s["approx_bytes"]), f"{s['total_seconds']:.3f}"
+        )
+    console.print(table)
+
+    choice = input("Enter a file name to save these stats as JSON, 'reset' to clear them, "
+                   "or press Enter to return: ").strip()
+    if not choice:
+        return
+    if choice.lower() == "reset":
+        query_stats.reset()
+        console.print("[green]Statistics cleared.[/green]")
+        return
+    try:
+        query_stats.dump(choice)
+    except OSError as e:
+        console.print(f"[red]Could not write '{choice}': {e}[/red]")
+        return
+    console.print(f"[green]Saved to {choice}.[/green]")
+
+
 def faculty_menu():
+    """Runs the faculty panel; returns True if the user chose to exit the application."""
     console.print("[bold blue]Faculty Panel[/bold blue]")
     faculty_id = input("Enter Faculty ID: ").strip()
-    password = input("Enter Password: ").strip()
 
-    if not faculty_login(faculty_id, password):
-        console.print("[red]Invalid credentials![/red]")
-        return
-
-    console.print("[green]Login successful![/green]")
-    db = DBOperations()
+    sessions = get_sessions()
+    token = sessions.resume("faculty", faculty_id)
+    if token:
+        console.print("[green]Resumed your session.[/green]")
+    else:
+        wait = get_login_throttle().retry_after("faculty", faculty_id)
+        if wait:
+            console.print(f"[red]Too many failed attempts. Try again in {wait:.0f} seconds.[/red]")
+            return
+        password = input("Enter Password: ").strip()
+        token = faculty_login(faculty_id, password)
+        if not token:
+            console.print("[red]Invalid credentials![/red]")
+            return
+        sessions.save(token)
+        console.print("[green]Login successful![/green]")
+    history = EditHistory()
 
     while True:
         console.print("\n[bold blue]Faculty Dashboard[/bold blue]")
@@ -441,7 +681,14 @@ def faculty_menu():
         console.print("4. Audit & Log Data")
         console.print("5. Data-Driven Interventions")
         console.print("6. Real-Time Data Updates & Editing")
-        console.print("7. Logout")
+        console.print("7. Batch Report Generation")
+        console.print("8. Bulk Import Scores (CSV)")
+        console.print("9. Batch Score Entry (one test, whole class)")
+        console.print("10. Undo Last Score Edit")
+        console.print("11. Redo Score Edit")
+        console.print("12. Performance Stats")
+        console.print("13. Logout")
+        console.print("14. Exit (stay logged in)")
 
         choice = input("Enter your choice: ").strip()
         if choice == "1":
@@ -455,9 +702,24 @@ def faculty_menu():
         elif choice == "5":
             data_driven_interventions()
         elif choice == "6":
-            real_time_updates(faculty_id)
+            real_time_updates(faculty_id, history)
         elif choice == "7":
+            batch_report_generation()
+        elif choice == "8":
+            bulk_score_import(faculty_id)
+        elif choice == "9":
+            batch_score_entry(faculty_id, history)
+        elif choice == "10":
+            undo_score_edit(faculty_id, history)
+        elif choice == "11":
+            undo_score_edit(faculty_id, history, redo=True)
+        elif choice == "12":
+            performance_stats()
+        elif choice == "13":
             console.print("Logging out...")
+            sessions.logout(token)
             break
+        elif choice == "14":
+            return True
         else:
             console.print("[red]Invalid choice. Please try again.[/red]")
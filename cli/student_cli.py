@@ -1,43 +1,19 @@
-import matplotlib.pyplot as plt
-import re
-import os
-import pandas as pd
-import numpy as np
+from io import BytesIO
 from utils.input_validation import validate_enrolment_id
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import KeepTogether
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from database.db_operations import DBOperations
+from auth.sessions import get_login_throttle, get_sessions
+from auth.student_auth import student_login
+from database.backend import get_db
 from rich.console import Console
-from utils.input_validation import get_acronym
+from database.subjects import subject_acronym
+from utils.chart_cache import get_chart_cache
 
+# matplotlib, pandas, numpy and reportlab are imported inside the functions
+# that draw charts or build reports, so logging in and navigating the menus
+# does not pay for loading them.
 
-console = Console()
 
+console = Console()
 
-def get_acronym(subject: str) -> str:
-    """
-    Extract the acronym from the subject name, assuming it's in parentheses.
-    E.g., 'Introduction to Probability Theory (IPT)' -> 'IPT'.
-    If no parentheses are found, fallback to first three uppercase letters.
-    """
-    # Special handling for JAVA subjects
-    upper_sub = subject.upper()
-    if 'JAVA-I' in upper_sub:
-        return 'JAVA-I'
-    elif 'JAVA-II' in upper_sub:
-        return 'JAVA-II'
-
-    # Try to extract from parentheses
-    match = re.search(r'\((.*?)\)', subject)
-    if match:
-        return match.group(1).strip()
-    else:
-        # Fallback: first three uppercase letters of the subject
-        return subject[:3].upper()
 
 def get_color(mark: float) -> str:
     """
@@ -52,17 +28,6 @@ def get_color(mark: float) -> str:
     else:
         return 'green'
 
-def compute_percentile(user_score, all_scores):
-    """
-    Given a list of all_scores (ints/floats) and the user's score,
-    compute the percentile rank of the user.
-    E.g., 90 means the user is at or above 90% of the class.
-    """
-    sorted_scores = sorted(all_scores)
-    rank = sum(score <= user_score for score in sorted_scores)
-    percentile = (rank / len(sorted_scores)) * 100
-    return percentile
-
 def select_subject(db, enrolment_id, semester):
     """
     1) Fetch all distinct subjects for this student & semester.
@@ -76,7 +41,7 @@ def select_subject(db, enrolment_id, semester):
         return None
 
     # Build a list of (subject_name, acronym)
-    sub_list = [(sub, get_acronym(sub)) for sub in subjects]
+    sub_list = [(sub, subject_acronym(sub)) for sub in subjects]
 
     console.print(f"[bold]Subjects for Semester {semester}:[/bold]")
     for i, (sub, acr) in enumerate(sub_list, start=1):
@@ -116,7 +81,9 @@ def select_subject(db, enrolment_id, semester):
     return None
 
 def view_individual_scores(enrolment_id):
-    db = DBOperations()
+    import matplotlib.pyplot as plt
+
+    db = get_db()
 
     # Prompt the student for the semester
     sem_input = input("Enter semester to view scores (1-3): ").strip()
@@ -141,7 +108,7 @@ def view_individual_scores(enrolment_id):
         tests = ['T1', 'T2', 'T3', 'T4']
         marks = [T1, T2, T3, T4]
 
-        acronym = get_acronym(subject)
+        acronym = subject_acronym(subject)
         colors = [get_color(m) for m in marks]
 
         # Create a new figure for each subject
@@ -174,8 +141,16 @@ def view_semester_performance(enrolment_id):
       1) A line graph of total scores across available semesters.
       2) A heatmap of subject vs. semester total scores.
     """
-    db = DBOperations()
-    results = db.fetch_all_semester_scores(enrolment_id)
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    from database.async_db import fetch_concurrently
+
+    fetched = fetch_concurrently({
+        'scores': ('fetch_all_semester_scores', enrolment_id),
+        'summary': ('fetch_student_semester_summary', enrolment_id),
+    })
+    results = fetched['scores']
 
     # If there's no data, inform the user and return
     if not results:
@@ -184,22 +159,26 @@ def view_semester_performance(enrolment_id):
 
     # Convert raw tuples into a DataFrame for easier manipulation
     # Each tuple is (semester, subject, T1, T2, T3, T4, total_score)
-    data = []
+    rows = []
     for row in results:
         semester, subject, T1, T2, T3, T4, total_score = row
         # Apply acronym transformation
-        acronym = get_acronym(subject)
-        data.append({
+        acronym = subject_acronym(subject)
+        rows.append({
             'semester': semester,
             'subject': subject,
             'acronym': acronym,
             'total_score': total_score
         })
 
-    df = pd.DataFrame(data)  # columns: semester, subject, acronym, total_score
+    df = pd.DataFrame(rows)  # columns: semester, subject, acronym, total_score
 
-    # 1. LINE GRAPH: Semester vs. Sum of total_scores
-    semester_summary = df.groupby('semester')['total_score'].sum().reset_index().sort_values('semester')
+    # 1. LINE GRAPH: Semester vs. Sum of total_scores (pre-aggregated per semester)
+    # rows => (semester, score_count, score_sum, avg, min, max)
+    semester_summary = pd.DataFrame(
+        [(row[0], row[2]) for row in fetched['summary']],
+        columns=['semester', 'total_score']
+    )
 
     # 2. HEATMAP: subject vs. Semester
     # Create a pivot table with acronym as rows and semesters as columns
@@ -250,13 +229,17 @@ def view_semester_performance(enrolment_id):
 def view_comparative_analysis(enrolment_id):
     """
     1) Asks the student which semester to analyze.
-    2) Fetches all scores for that semester (all students).
+    2) Fetches all scores for that semester (all students), from the
+       columnar snapshot if APT_ANALYTICS_SNAPSHOT is set.
     3) Compares the student's total score to the class average per subject.
     4) Computes the student's percentile rank for each acronym.
     5) Displays a grouped bar chart with 'Your Score' vs. 'Class Avg'
        and annotates the percentile rank above the user's bar.
     """
-    db = DBOperations()
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from analytics.percentiles import PercentileEngine
+    from analytics.snapshot import get_snapshot
 
     # Prompt for semester
     sem_input = input("Enter semester for comparative analysis (1-3): ").strip()
@@ -270,53 +253,25 @@ def view_comparative_analysis(enrolment_id):
         return
 
     # Fetch all student scores for the chosen semester
-    results = db.fetch_semester_scores_all_students(semester)
-    if not results:
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        results = snapshot.semester_scores(semester)
+    else:
+        results = get_db().fetch_semester_scores_all_students(semester)
+    if len(results) == 0:
         console.print(f"[red]No scores found for semester {semester}.[/red]")
         return
 
-    # Convert results to a DataFrame for easy grouping and analysis
-    # results -> list of (enrolment_id, subject, total_score)
-    df = pd.DataFrame(results, columns=['enrolment_id', 'subject', 'total_score'])
-
-    # Apply acronym transformation to each row
-    from utils.input_validation import get_acronym  # or wherever get_acronym is defined
-    df['acronym'] = df['subject'].apply(get_acronym)
-
-    # Filter rows for the logged-in student
-    user_df = df[df['enrolment_id'] == enrolment_id].copy()
-    if user_df.empty:
+    # Build sorted per-subject score arrays for the class once, then look up
+    # the student's percentile rank and the class average per acronym.
+    # results -> (enrolment_id, subject, total_score) rows or DataFrame
+    engine = PercentileEngine()
+    engine.add_semester(semester, results)
+    merged = engine.student_comparison(semester, enrolment_id)
+    if merged.empty:
         console.print(f"[yellow]You have no scores recorded in semester {semester}.[/yellow]")
         return
 
-    # Compute class average per acronym
-    class_avg = df.groupby('acronym')['total_score'].mean().reset_index(name='avg_score')
-
-    # Merge user scores with class averages on acronym
-    # user_df has columns: enrolment_id, subject, total_score, acronym
-    # class_avg has columns: acronym, avg_score
-    merged = pd.merge(
-        user_df[['acronym', 'total_score']],
-        class_avg,
-        on='acronym',
-        how='left'
-    )
-
-    # Compute percentile rank for each acronym
-    percentile_ranks = []
-    for idx, row in merged.iterrows():
-        acr = row['acronym']
-        user_score = row['total_score']
-        # All scores in this acronym
-        acr_scores = df[df['acronym'] == acr]['total_score'].tolist()
-        percentile = compute_percentile(user_score, acr_scores)
-        percentile_ranks.append(percentile)
-
-    merged['percentile'] = percentile_ranks
-
-    # Sort by acronym for consistent plotting
-    merged = merged.sort_values('acronym')
-
     # Prepare data for grouped bar chart
     acronyms = merged['acronym'].tolist()
     user_scores = merged['total_score'].tolist()
@@ -368,8 +323,11 @@ def view_trend_insights(enrolment_id):
        - Goal line
        - Alerts if below goal
     """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
 
-    db = DBOperations()
+    db = get_db()
 
     # Prompt for semester
     sem_input = input("Enter semester for trend insights (1-3): ").strip()
@@ -451,41 +409,62 @@ def get_bar_color(mark):
         return 'green'
 
 
+def figure_to_png(fig):
+    """
+    Render a matplotlib Figure to an in-memory PNG buffer, ready to be
+    passed straight to reportlab's Image. Nothing is written to disk.
+    """
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    buffer.seek(0)
+    return buffer
+
+
 def generate_subject_figure(subject, T1, T2, T3, T4):
     """
     Generate a side-by-side bar chart (with color-coded bars) and pie chart
-    for the given subject/test scores, then save as a PNG.
-    Returns the filename of the saved figure.
+    for the given subject/test scores.
+    Returns an in-memory PNG buffer of the figure, served from the chart
+    cache when the same subject and marks were rendered before.
     """
+    return get_chart_cache().get_or_render(
+        "subject", [subject, T1, T2, T3, T4],
+        lambda: render_subject_figure(subject, T1, T2, T3, T4)
+    )
+
+
+def render_subject_figure(subject, T1, T2, T3, T4):
+    """Renders the bar + pie chart of generate_subject_figure (no caching)."""
+    from matplotlib.figure import Figure
+
     tests = ['T1', 'T2', 'T3', 'T4']
     marks = [T1, T2, T3, T4]
     colors = [get_bar_color(m) for m in marks]
-    acronym = get_acronym(subject)
+    acronym = subject_acronym(subject)
 
-    plt.figure(figsize=(10, 4))
+    # A standalone Figure renders with Agg and never touches pyplot's
+    # global state, so it is headless and safe to use concurrently.
+    fig = Figure(figsize=(10, 4))
 
     # Bar Chart (left subplot)
-    plt.subplot(1, 2, 1)
-    plt.bar(tests, marks, color=colors)
-    plt.xlabel("Tests")
-    plt.ylabel("Marks")
-    plt.ylim(0, 25)  # each test is out of 25
-    plt.title(f"{acronym} - Test Scores")
-    plt.grid(True)
+    ax1 = fig.add_subplot(1, 2, 1)
+    ax1.bar(tests, marks, color=colors)
+    ax1.set_xlabel("Tests")
+    ax1.set_ylabel("Marks")
+    ax1.set_ylim(0, 25)  # each test is out of 25
+    ax1.set_title(f"{acronym} - Test Scores")
+    ax1.grid(True)
 
     # Pie Chart (right subplot)
-    plt.subplot(1, 2, 2)
-    plt.pie(marks, labels=tests, autopct='%1.1f%%', startangle=90)
-    plt.title(f"{acronym} - Contribution")
+    ax2 = fig.add_subplot(1, 2, 2)
+    ax2.pie(marks, labels=tests, autopct='%1.1f%%', startangle=90)
+    ax2.set_title(f"{acronym} - Contribution")
 
     # Overall figure title
-    plt.suptitle(f"Subject: {subject}", y=1.05)
-    plt.tight_layout()
+    fig.suptitle(f"Subject: {subject}", y=1.05)
+    fig.tight_layout()
 
-    filename = f"subject_{acronym}.png"
-    plt.savefig(filename)
-    plt.close()
-    return filename
+    return figure_to_png(fig)
 
 def generate_student_report(enrolment_id):
     """
@@ -496,13 +475,47 @@ def generate_student_report(enrolment_id):
       3) Semester-wise Performance (line graph & heatmap)
       4) Comparative Analysis (grouped bar chart)
     """
-    db = DBOperations()
-    student = db.fetch_student_by_enrolment(enrolment_id)
-    if not student:
+    from database.report_data import load_report_bundle
+
+    # One query loads the student, their scores and the class scores for
+    # every semester they have taken.
+    bundle = load_report_bundle(get_db(), enrolment_id)
+    if not bundle:
         console.print("[red]Student record not found.[/red]")
         return
 
     pdf_file = f"student_report_{enrolment_id}.pdf"
+    try:
+        build_student_report(bundle.student, bundle.scores, bundle.class_scores, pdf_file)
+        console.print(f"[green]PDF report generated successfully: {pdf_file}[/green]")
+    except Exception as e:
+        console.print(f"[red]Error generating PDF report: {e}[/red]")
+
+
+def build_student_report(student, all_scores, class_scores, pdf_file, percentiles=None):
+    """
+    Renders the PDF report for one student without touching the database,
+    so it can be shared by the interactive and batch report paths.
+      - student: (enrolment_id, fullname, ...) record
+      - all_scores: the student's (semester, subject, T1, T2, T3, T4, total_score) rows
+      - class_scores: {semester: [(enrolment_id, subject, total_score), ...]} for the class
+      - percentiles: optional PercentileEngine already built from class_scores,
+        so batch runs rank each semester once instead of once per report
+    Raises if the PDF cannot be built.
+    """
+    import numpy as np
+    import pandas as pd
+    from matplotlib.figure import Figure
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Image, KeepTogether
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from analytics.percentiles import PercentileEngine
+
+    enrolment_id = student[0]
+    if percentiles is None:
+        percentiles = PercentileEngine.from_class_scores(class_scores)
     doc = SimpleDocTemplate(pdf_file, pagesize=letter)
     styles = getSampleStyleSheet()
     elements = []
@@ -523,8 +536,6 @@ def generate_student_report(enrolment_id):
     elements.append(Paragraph("1. Individual Subject & Test Scores", styles['Heading2']))
     elements.append(Spacer(1, 12))
 
-    all_scores = db.fetch_all_semester_scores(enrolment_id)
-
     # Group data by semester
     from collections import defaultdict
     semester_dict = defaultdict(list)
@@ -542,7 +553,7 @@ def generate_student_report(enrolment_id):
         for row in sem_data:
             # row => (semester, subject, T1, T2, T3, T4, total_score)
             _, subject, T1, T2, T3, T4, total = row
-            acronym = get_acronym(subject)
+            acronym = subject_acronym(subject)
             table_data.append([acronym, T1, T2, T3, T4, total])
 
         t = Table(table_data, hAlign='LEFT')
@@ -562,9 +573,9 @@ def generate_student_report(enrolment_id):
         for row in sem_data:
             _, subject, T1, T2, T3, T4, total = row
             # Generate bar+pie chart figure for this subject
-            fig_file = generate_subject_figure(subject, T1, T2, T3, T4)
+            fig_png = generate_subject_figure(subject, T1, T2, T3, T4)
             # Insert into PDF
-            elements.append(Image(fig_file, width=400, height=200))
+            elements.append(Image(fig_png, width=400, height=200))
             elements.append(Spacer(1, 24))
 
         # Optional: add a page break after each semester if desired
@@ -573,6 +584,8 @@ def generate_student_report(enrolment_id):
     # -------------------------
     # Helper functions to generate overall graphs (line & heatmap)
     # -------------------------
+    chart_cache = get_chart_cache()
+
     def generate_line_graph():
         """Line graph of semester-wise total scores."""
         data = []
@@ -581,100 +594,85 @@ def generate_student_report(enrolment_id):
             data.append({'semester': sem, 'total_score': total_score})
         if not data:
             return None
+        return chart_cache.get_or_render("semester_line", data, lambda: render_line_graph(data))
+
+    def render_line_graph(data):
         df = pd.DataFrame(data)
         sem_summary = df.groupby('semester')['total_score'].sum().reset_index()
         sem_summary = sem_summary.sort_values('semester')
 
-        plt.figure(figsize=(6,4))
-        plt.plot(sem_summary['semester'], sem_summary['total_score'], marker='o', color='blue', linestyle='-')
-        plt.xlabel("Semester")
-        plt.ylabel("Total Score")
-        plt.title("Semester-wise Total Scores")
-        plt.grid(True)
-        out_file = "line_graph.png"
-        plt.tight_layout()
-        plt.savefig(out_file)
-        plt.close()
-        return out_file
+        fig = Figure(figsize=(6,4))
+        ax = fig.add_subplot()
+        ax.plot(sem_summary['semester'], sem_summary['total_score'], marker='o', color='blue', linestyle='-')
+        ax.set_xlabel("Semester")
+        ax.set_ylabel("Total Score")
+        ax.set_title("Semester-wise Total Scores")
+        ax.grid(True)
+        fig.tight_layout()
+        return figure_to_png(fig)
 
     def generate_heatmap():
         """Heatmap: subject (acronym) vs. semester total scores."""
         data = []
         for row in all_scores:
             sem, subject, _, _, _, _, total_score = row
-            acr = get_acronym(subject)
+            acr = subject_acronym(subject)
             data.append({'semester': sem, 'acronym': acr, 'total_score': total_score})
         if not data:
             return None
+        return chart_cache.get_or_render("semester_heatmap", data, lambda: render_heatmap(data))
+
+    def render_heatmap(data):
         df = pd.DataFrame(data)
         pivot = df.pivot_table(index='acronym', columns='semester', values='total_score', aggfunc='sum').fillna(0)
 
-        plt.figure(figsize=(6,4))
-        cax = plt.imshow(pivot.values, cmap='Blues', aspect='auto')
-        plt.title("Heatmap: Subject vs. Semester")
-        plt.xticks(ticks=np.arange(len(pivot.columns)), labels=[f"Sem {s}" for s in pivot.columns])
-        plt.yticks(ticks=np.arange(len(pivot.index)), labels=pivot.index)
-        plt.colorbar(cax, label='Total Score')
-        out_file = "heatmap.png"
-        plt.tight_layout()
-        plt.savefig(out_file)
-        plt.close()
-        return out_file
+        fig = Figure(figsize=(6,4))
+        ax = fig.add_subplot()
+        cax = ax.imshow(pivot.values, cmap='Blues', aspect='auto')
+        ax.set_title("Heatmap: Subject vs. Semester")
+        ax.set_xticks(np.arange(len(pivot.columns)), labels=[f"Sem {s}" for s in pivot.columns])
+        ax.set_yticks(np.arange(len(pivot.index)), labels=pivot.index)
+        fig.colorbar(cax, ax=ax, label='Total Score')
+        fig.tight_layout()
+        return figure_to_png(fig)
 
     def generate_comparative_chart(compare_semester):
         """
         Grouped bar chart comparing the student's score vs. class avg, with percentile rank.
         """
-        results = db.fetch_semester_scores_all_students(compare_semester)
-        if not results:
-            return None
-        df = pd.DataFrame(results, columns=['enrolment_id', 'subject', 'total_score'])
-        df['acronym'] = df['subject'].apply(get_acronym)
-
-        user_df = df[df['enrolment_id'] == enrolment_id].copy()
-        if user_df.empty:
+        merged = percentiles.student_comparison(compare_semester, enrolment_id)
+        if merged.empty:
             return None
 
-        class_avg = df.groupby('acronym')['total_score'].mean().reset_index(name='avg_score')
-        merged = pd.merge(user_df[['acronym','total_score']], class_avg, on='acronym', how='left')
-
-        def compute_percentile(user_score, scores_list):
-            sorted_scores = sorted(scores_list)
-            rank = sum(s <= user_score for s in sorted_scores)
-            return (rank / len(sorted_scores)) * 100
-
-        percentile_ranks = []
-        for acr in merged['acronym']:
-            uscore = merged.loc[merged['acronym']==acr, 'total_score'].values[0]
-            all_scores = df[df['acronym']==acr]['total_score'].tolist()
-            percentile_ranks.append(compute_percentile(uscore, all_scores))
-
-        merged['percentile'] = percentile_ranks
-        merged = merged.sort_values('acronym')
         acronyms = merged['acronym'].tolist()
         user_scores = merged['total_score'].tolist()
         avg_scores = merged['avg_score'].tolist()
         percents = merged['percentile'].tolist()
+        data = [compare_semester, acronyms, user_scores,
+                [round(a, 6) for a in avg_scores], [round(p, 6) for p in percents]]
+        return chart_cache.get_or_render(
+            "comparative", data,
+            lambda: render_comparative_chart(compare_semester, acronyms, user_scores, avg_scores, percents)
+        )
 
+    def render_comparative_chart(compare_semester, acronyms, user_scores, avg_scores, percents):
         x = np.arange(len(acronyms))
         width = 0.4
-        plt.figure(figsize=(6,4))
-        bars_user = plt.bar(x - width/2, user_scores, width, label='Your Score', color='skyblue')
-        bars_avg = plt.bar(x + width/2, avg_scores, width, label='Class Avg', color='orange')
+        fig = Figure(figsize=(6,4))
+        ax = fig.add_subplot()
+        bars_user = ax.bar(x - width/2, user_scores, width, label='Your Score', color='skyblue')
+        bars_avg = ax.bar(x + width/2, avg_scores, width, label='Class Avg', color='orange')
 
         for i, bar in enumerate(bars_user):
-            plt.text(bar.get_x()+bar.get_width()/2, bar.get_height()+0.5,
-                     f"{percents[i]:.1f}%", ha='center', va='bottom', fontsize=8, color='blue')
-
-        plt.xticks(x, acronyms, rotation=45, ha='right')
-        plt.ylabel("Total Score")
-        plt.title(f"Comparative Analysis - Semester {compare_semester}")
-        plt.legend()
-        plt.tight_layout()
-        out_file = "comparative_analysis.png"
-        plt.savefig(out_file)
-        plt.close()
-        return out_file
+            ax.text(bar.get_x()+bar.get_width()/2, bar.get_height()+0.5,
+                    f"{percents[i]:.1f}%", ha='center', va='bottom', fontsize=8, color='blue')
+
+        ax.set_xticks(x, acronyms, rotation=45, ha='right')
+        ax.set_ylabel("Total Score")
+        ax.set_title(f"Comparative Analysis - Semester {compare_semester}")
+        ax.legend()
+        fig.tight_layout()
+        return figure_to_png(fig)
 
     # -------------------------
     # Section 2: Semester-Wise Performance (Line Graph & Heatmap)
@@ -682,16 +680,16 @@ def generate_student_report(enrolment_id):
     elements.append(Paragraph("2. Semester-Wise Performance", styles['Heading2']))
     elements.append(Spacer(1, 12))
 
-    line_file = generate_line_graph()
-    if line_file and os.path.exists(line_file):
+    line_png = generate_line_graph()
+    if line_png:
         elements.append(Paragraph("Line Graph: Semester-wise Total Scores", styles['Heading3']))
-        elements.append(Image(line_file, width=400, height=300))
+        elements.append(Image(line_png, width=400, height=300))
         elements.append(Spacer(1, 12))
 
-    heatmap_file = generate_heatmap()
-    if heatmap_file and os.path.exists(heatmap_file):
+    heatmap_png = generate_heatmap()
+    if heatmap_png:
         elements.append(Paragraph("Heatmap: Subject vs. Semester", styles['Heading3']))
-        elements.append(Image(heatmap_file, width=400, height=300))
+        elements.append(Image(heatmap_png, width=400, height=300))
         elements.append(Spacer(1, 12))
 
     # -------------------------
@@ -700,77 +698,69 @@ def generate_student_report(enrolment_id):
     elements.append(Paragraph("3. Comparative Analysis (All Semesters)", styles['Heading2']))
     elements.append(Spacer(1, 12))
 
-    comparative_files = []
-    for sem in [1, 2, 3]:
-        comp_file = generate_comparative_chart(sem)
-        if comp_file and os.path.exists(comp_file):
+    for sem in sorted(semester_dict):
+        comp_png = generate_comparative_chart(sem)
+        if comp_png:
             # Group heading, spacer, image, and final spacer in one flowable
             comp_flowables = []
             comp_flowables.append(Paragraph(f"Comparative Analysis - Semester {sem}", styles['Heading3']))
             comp_flowables.append(Spacer(1, 6))
-            comp_flowables.append(Image(comp_file, width=400, height=300))
+            comp_flowables.append(Image(comp_png, width=400, height=300))
             comp_flowables.append(Spacer(1, 12))
 
             # Wrap them in KeepTogether
             elements.append(KeepTogether(comp_flowables))
-
-            comparative_files.append(comp_file)
         else:
             # No data found for this semester
             elements.append(Paragraph(f"No comparative analysis data available for Semester {sem}.", styles['Normal']))
             elements.append(Spacer(1, 12))
 
     # Build the PDF
-    try:
-        doc.build(elements)
-        console.print(f"[green]PDF report generated successfully: {pdf_file}[/green]")
-    except Exception as e:
-        console.print(f"[red]Error generating PDF report: {e}[/red]")
+    doc.build(elements)
 
-    # Clean up temp images if desired
-    temp_files = [line_file, heatmap_file] + comparative_files
-    for f in temp_files:
-        if f and os.path.exists(f):
-            os.remove(f)
-
-    # Also remove subject-wise images if you wish
-    # (They were named "subject_{acronym}.png".)
-    for sem in semester_dict:
-        for row in semester_dict[sem]:
-            _, subj, T1, T2, T3, T4, total = row
-            acr = get_acronym(subj)
-            sf = f"subject_{acr}.png"
-            if os.path.exists(sf):
-                os.remove(sf)
 
-def student_menu():
-    console.print("[bold blue]Student Panel[/bold blue]")
-    enrolment_id = input("Enter Enrolment ID: ").strip()
-
-    if not validate_enrolment_id(enrolment_id):
-        console.print("[red]Invalid enrolment ID format.[/red]")
-        return
+def student_password_login(sessions, enrolment_id):
+    """Prompts for the password; returns a new session token, or None after printing why not."""
+    wait = get_login_throttle().retry_after("student", enrolment_id)
+    if wait:
+        console.print(f"[red]Too many failed attempts. Try again in {wait:.0f} seconds.[/red]")
+        return None
 
-    db = DBOperations()
+    db = get_db()
     student = db.fetch_student_by_enrolment(enrolment_id)
 
     if not student:
         console.print("[red]Student not found.[/red]")
-        return
-
-    # Assuming student record is in the format: (enrolment_id, fullname, password, semester)
-    fullname = student[1]
-    first_word = fullname.split()[0]
-    last_four = enrolment_id[-4:]
-    expected_password = first_word + last_four
+        return None
 
     password = input("Enter Password: ").strip()
-
-    if password != expected_password:
+    token = student_login(enrolment_id, password, student)
+    if not token:
         console.print("[red]Invalid credentials![/red]")
-        return
+        return None
 
+    sessions.save(token)
     console.print("[green]Login successful![/green]")
+    return token
+
+
+def student_menu():
+    """Runs the student panel; returns True if the user chose to exit the application."""
+    console.print("[bold blue]Student Panel[/bold blue]")
+    enrolment_id = input("Enter Enrolment ID: ").strip()
+
+    if not validate_enrolment_id(enrolment_id):
+        console.print("[red]Invalid enrolment ID format.[/red]")
+        return
+
+    sessions = get_sessions()
+    token = sessions.resume("student", enrolment_id)
+    if token:
+        console.print("[green]Resumed your session.[/green]")
+    else:
+        token = student_password_login(sessions, enrolment_id)
+        if not token:
+            return
 
     while True:
         console.print("\n[bold blue]Student Dashboard[/bold blue]")
@@ -780,6 +770,7 @@ def student_menu():
         console.print("4. Trend Insights & Alerts")
         console.print("5. Generate Performance Report")
         console.print("6. Logout")
+        console.print("7. Exit (stay logged in)")
 
         choice = input("Enter your choice: ").strip()
         if choice == "1":
@@ -794,6 +785,9 @@ def student_menu():
             generate_student_report(enrolment_id)
         elif choice == "6":
             console.print("Logging out...")
+            sessions.logout(token)
             break
+        elif choice == "7":
+            return True
         else:
             console.print("[red]Invalid choice. Please try again.[/red]")
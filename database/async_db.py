@@ -0,0 +1,62 @@
+import asyncio
+
+from database.backend import get_db
+
+
+class AsyncDBOperations:
+    """
+    Awaitable counterpart of a storage backend (DBOperations by default).
+
+    Every public query method of the backend is available here as a
+    coroutine with the same arguments and return value, e.g.
+
+        adb = AsyncDBOperations()
+        student, scores = await asyncio.gather(
+            adb.fetch_student_by_enrolment(enrolment_id),
+            adb.fetch_all_semester_scores(enrolment_id),
+        )
+
+    Each call runs the backend method on a worker thread, and each
+    thread checks out its own connection from the shared ConnectionPool.
+    Independent queries therefore wait on the network in parallel, and a
+    set of them costs about as long as the slowest one. psycopg2 releases
+    the GIL while waiting for the server.
+    Streaming (iter_*) methods are not exposed; call the backend directly for those.
+    """
+
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    def __getattr__(self, name):
+        method = getattr(type(self.db), name, None)
+        if name.startswith(("_", "iter_")) or name == "cursor" or not callable(method):
+            raise AttributeError(f"{type(self).__name__} has no query method {name!r}")
+        bound = getattr(self.db, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(bound, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+
+async def gather_queries(adb, calls):
+    """
+    Awaits several AsyncDBOperations calls at once.
+      calls: {key: (method_name, *args)}
+    Returns {key: result}.
+    """
+    keys = list(calls)
+    results = await asyncio.gather(
+        *(getattr(adb, calls[key][0])(*calls[key][1:]) for key in keys)
+    )
+    return dict(zip(keys, results))
+
+
+def fetch_concurrently(calls, db=None):
+    """
+    Runs independent backend queries concurrently from synchronous code
+    (the CLI menus) and returns {key: result}; see gather_queries.
+    """
+    return asyncio.run(gather_queries(AsyncDBOperations(db), calls))
@@ -0,0 +1,193 @@
+"""
+Storage backend interface and factory.
+
+The CLI, analytics and report code talk to the database only through the
+methods of StorageBackend, so any backend implementing them can be used:
+
+  - DBOperations (database/db_operations.py): the PostgreSQL backend used
+    in production, with a shared connection pool.
+  - SQLiteOperations (database/sqlite_backend.py): an embedded SQLite
+    database, as a file or in memory, with the same schema and queries.
+    Useful for running the analytics against a local snapshot without a
+    network round trip per query, and for benchmarks without a server.
+
+get_db() returns the backend selected by the environment:
+  APT_DB_BACKEND   "postgres" (default) or "sqlite"
+  APT_SQLITE_PATH  SQLite database file (default academic.sqlite3; ":memory:" for a throwaway one)
+"""
+import inspect
+import os
+import threading
+from abc import ABC, abstractmethod
+
+from database import instrumentation
+
+DEFAULT_SQLITE_PATH = "academic.sqlite3"
+
+
+class StorageBackend(ABC):
+    """
+    Every query method returns plain tuples (or lists of them) and never
+    raises on a database error: it logs the error and returns the empty
+    value documented for it ([], None, False or ([], None)).
+
+    The query methods of every subclass are instrumented automatically
+    (see database/instrumentation.py).
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not instrumentation.ENABLED:
+            return
+        for name in QUERY_METHODS:
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, "__instrumented__", False):
+                continue
+            wrap = (instrumentation.instrument_stream if inspect.isgeneratorfunction(method)
+                    else instrumentation.instrument)
+            setattr(cls, name, wrap(name, method))
+
+    @abstractmethod
+    def fetch_student_by_enrolment(self, enrolment_id):
+        """(enrolment_id, fullname, password, semester) or None."""
+
+    @abstractmethod
+    def fetch_faculty_password(self, faculty_id):
+        """The stored bcrypt hash, or None."""
+
+    @abstractmethod
+    def update_student_score(self, enrolment_id, subject, new_total_score):
+        """Overwrites total_score; True on success."""
+
+    @abstractmethod
+    def fetch_student_scores(self, enrolment_id, semester):
+        """[(subject, T1, T2, T3, T4, total_score)]"""
+
+    @abstractmethod
+    def fetch_all_semester_scores(self, enrolment_id):
+        """[(semester, subject, T1, T2, T3, T4, total_score)] ordered by semester, subject."""
+
+    @abstractmethod
+    def fetch_semester_scores_all_students(self, semester):
+        """[(enrolment_id, subject, total_score)] ordered by subject."""
+
+    @abstractmethod
+    def fetch_test_scores_for_subject(self, enrolment_id, semester, subject):
+        """(T1, T2, T3, T4) or None; subject is matched case-insensitively."""
+
+    @abstractmethod
+    def fetch_subjects_for_semester(self, enrolment_id, semester):
+        """Sorted subject names of one student's semester."""
+
+    @abstractmethod
+    def fetch_all_scores(self):
+        """[(enrolment_id, semester, subject, total_score)] ordered by subject."""
+
+    @abstractmethod
+    def fetch_all_students(self):
+        """[(enrolment_id, fullname, semester)] ordered by enrolment_id."""
+
+    @abstractmethod
+    def fetch_student_overall_averages(self, min_avg=None, max_avg=None, scored_only=False):
+        """[(enrolment_id, fullname, semester, overall_avg, row_count)]"""
+
+    @abstractmethod
+    def fetch_all_student_scores(self):
+        """[(enrolment_id, subject, T1, T2, T3, T4, total_score, semester)] ordered by semester, enrolment_id."""
+
+    @abstractmethod
+    def iter_all_student_scores(self, itersize=None):
+        """Chunks of fetch_all_student_scores rows."""
+
+    @abstractmethod
+    def fetch_student_semester_summary(self, enrolment_id):
+        """[(semester, score_count, score_sum, avg_score, min_score, max_score)]"""
+
+    @abstractmethod
+    def fetch_class_subject_summary(self, semester=None):
+        """[(semester, subject, score_count, score_sum, avg_score, min_score, max_score, stddev_score)]"""
+
+    @abstractmethod
+    def rebuild_score_summaries(self):
+        """Recomputes both summary tables from student_scores; True on success."""
+
+    @abstractmethod
+    def fetch_faculty_logs(self, faculty_id):
+        """[(log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp)], newest first."""
+
+    @abstractmethod
+    def fetch_faculty_logs_page(self, faculty_id, page_size=20, after=None, enrolment_id=None,
+                                date_from=None, date_to=None, action=None):
+        """(rows, next_after): one keyset-paginated page of fetch_faculty_logs."""
+
+    @abstractmethod
+    def update_student_test_score(self, enrolment_id, semester, subject, test_field, new_value):
+        """(old_value, new_total) or None."""
+
+    @abstractmethod
+    def apply_score_edits(self, faculty_id, edits, action_prefix="Updated"):
+        """Applies edits and their audit entries atomically; see DBOperations.apply_score_edits."""
+
+    @abstractmethod
+    def fetch_subject_roster(self, semester, subject):
+        """[(enrolment_id, fullname, T1, T2, T3, T4, total_score)] ordered by enrolment_id."""
+
+    @abstractmethod
+    def fetch_semester_subjects(self, semester):
+        """Sorted distinct subject names taught in a semester."""
+
+    @abstractmethod
+    def fetch_subjects(self):
+        """[(subject_id, name, acronym, max_marks)] ordered by name."""
+
+    @abstractmethod
+    def fetch_data_version(self):
+        """A counter bumped by every committed change to students, student_scores or subjects, or None."""
+
+    @abstractmethod
+    def insert_faculty_log(self, faculty_id, enrolment_id, action, old_value, new_value):
+        """True on success."""
+
+    @abstractmethod
+    def bulk_import_scores(self, csv_file, faculty_id=None):
+        """Validated CSV import in one transaction; see DBOperations.bulk_import_scores."""
+
+    @abstractmethod
+    def fetch_report_data(self, enrolment_ids=None, semester=None):
+        """
+        Report data for the selected students as
+        {"students": [{enrolment_id, fullname, semester, scores}], "class_scores": {semester: rows}};
+        see database.report_data.
+        """
+
+
+# The interface methods, i.e. every query a backend runs on behalf of callers.
+QUERY_METHODS = sorted(StorageBackend.__abstractmethods__)
+
+_sqlite_backends = {}  # (pid, path) -> SQLiteOperations
+_sqlite_lock = threading.Lock()
+
+
+def get_db():
+    """
+    Returns the storage backend chosen by APT_DB_BACKEND.
+    PostgreSQL backends share the process-wide connection pool; SQLite
+    backends are shared per database file, so an in-memory database lives
+    as long as the process. As with get_pool(), a forked child (e.g. a
+    batch report worker) opens its own SQLite connection instead of using
+    its parent's. The parent's entries are kept, not closed, so the child
+    never touches that connection.
+    """
+    backend = os.environ.get("APT_DB_BACKEND", "postgres").strip().lower()
+    if backend in ("postgres", "postgresql"):
+        from database.db_operations import DBOperations
+        return DBOperations()
+    if backend == "sqlite":
+        from database.sqlite_backend import SQLiteOperations
+        path = os.environ.get("APT_SQLITE_PATH", DEFAULT_SQLITE_PATH)
+        key = (os.getpid(), path)
+        with _sqlite_lock:
+            if key not in _sqlite_backends:
+                _sqlite_backends[key] = SQLiteOperations(path)
+            return _sqlite_backends[key]
+    raise ValueError(f"Unknown APT_DB_BACKEND {backend!r}; expected 'postgres' or 'sqlite'")
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg2 import Error, OperationalError, extensions
+
+
+class PoolExhaustedError(OperationalError):
+    """
+    Raised when no connection becomes available before the checkout timeout,
+    or the pool is closed. A psycopg2 OperationalError, so backend methods
+    handle it like a lost connection and return their fallback value.
+    """
+
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of psycopg2 connections.
+
+    - Lazy: nothing is opened until the first checkout, which then warms
+      the pool up to `min_size` connections.
+    - Never holds more than `max_size` connections; extra callers wait
+      up to `timeout` seconds for one to be returned.
+    - Every checkout is health-checked: closed connections are replaced,
+      and connections idle for longer than `health_check_after` seconds
+      are pinged with `SELECT 1` before being handed out.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=30.0, health_check_after=30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._idle = []  # [(conn, returned_at)], most recently returned last
+        self._size = 0   # connections currently open (idle + checked out)
+        self._warmed = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _warm_up(self):
+        """Opens connections until the pool holds `min_size` of them."""
+        self._warmed = True
+        while self._size < self.min_size:
+            conn = self._connect()
+            self._size += 1
+            self._idle.append((conn, time.monotonic()))
+
+    def _is_healthy(self, conn, returned_at):
+        if conn.closed:
+            return False
+        if time.monotonic() - returned_at < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def getconn(self, timeout=None):
+        """
+        Checks out a healthy connection, opening a new one if the pool has room.
+        Raises PoolExhaustedError if none is available within `timeout` seconds.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolExhaustedError("Connection pool is closed")
+                if not self._warmed:
+                    self._warm_up()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No database connection available after {timeout} seconds "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                else:
+                    self._size += 1
+                    conn, returned_at = None, None
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            if self._is_healthy(conn, returned_at):
+                return conn
+            # Stale connection (e.g. server restart): drop it and try again.
+            self._discard(conn)
+
+    def putconn(self, conn, discard=False):
+        """
+        Returns a connection to the pool. Any transaction left open is rolled back;
+        broken or explicitly discarded connections are closed instead of reused.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Error:
+                discard = True
+        if discard or conn.closed or self._closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks out a connection and always returns it."""
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            # putconn rolls back whatever the caller left uncommitted.
+            self.putconn(conn)
+
+    def closeall(self):
+        """Closes every idle connection; checked-out ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Returns a snapshot of the pool's size for diagnostics."""
+        with self._cond:
+            return {
+                "open": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+
+POOL_MIN_SIZE = int(os.environ.get("APT_DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.environ.get("APT_DB_POOL_MAX", "10"))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(connect, min_size=None, max_size=None, **kwargs):
+    """
+    Replaces the shared pool with one using the given factory and sizes.
+    Idle connections of the previous pool are closed.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        old = _pool
+        _pool = ConnectionPool(
+            connect,
+            min_size=POOL_MIN_SIZE if min_size is None else min_size,
+            max_size=POOL_MAX_SIZE if max_size is None else max_size,
+            **kwargs
+        )
+        _pool_pid = os.getpid()
+    if old is not None:
+        old.closeall()
+    return _pool
+
+
+def get_pool(connect):
+    """
+    Returns the process-wide pool, creating it on first use.
+    A forked child never reuses its parent's sockets; it gets a fresh pool.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(connect, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE)
+            _pool_pid = os.getpid()
+        return _pool
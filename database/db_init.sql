@@ -1,3 +1,18 @@
+-- Schema version 1, applied by `python -m database.schema upgrade`. Later
+-- migrations change student_scores, so this script must not be run by hand
+-- against a database that has been upgraded: its trigger functions would
+-- replace the current ones. The guard below refuses to do that.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'student_scores' AND column_name = 'subject_id'
+    ) THEN
+        RAISE EXCEPTION 'database is past schema version 1; run python -m database.schema upgrade instead of db_init.sql';
+    END IF;
+END $$;
+
 -- Create Students Table
 CREATE TABLE IF NOT EXISTS students (
     enrolment_id VARCHAR(14) PRIMARY KEY,
@@ -35,3 +50,192 @@ CREATE TABLE IF NOT EXISTS faculty_logs (
     new_value TEXT,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+------------------------------
+-- Score Summaries
+------------------------------
+-- Pre-aggregated total_score statistics so dashboards read one row per
+-- student/semester or per subject/semester instead of every score row.
+-- Both tables are maintained by the statement-level triggers below; call
+-- rebuild_score_summaries() to (re)populate them from student_scores.
+CREATE TABLE IF NOT EXISTS student_semester_summary (
+    enrolment_id VARCHAR(14) REFERENCES students(enrolment_id),
+    semester INT,
+    row_count INT NOT NULL DEFAULT 0,       -- score rows, including NULL totals
+    score_count INT NOT NULL DEFAULT 0,     -- rows with a total_score
+    score_sum BIGINT NOT NULL DEFAULT 0,
+    score_sumsq BIGINT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    PRIMARY KEY (enrolment_id, semester)
+);
+
+CREATE TABLE IF NOT EXISTS class_subject_summary (
+    semester INT,
+    subject VARCHAR(100),
+    row_count INT NOT NULL DEFAULT 0,
+    score_count INT NOT NULL DEFAULT 0,
+    score_sum BIGINT NOT NULL DEFAULT 0,
+    score_sumsq BIGINT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    PRIMARY KEY (semester, subject)
+);
+
+CREATE OR REPLACE FUNCTION rebuild_score_summaries() RETURNS void AS $$
+BEGIN
+    DELETE FROM student_semester_summary;
+    DELETE FROM class_subject_summary;
+
+    INSERT INTO student_semester_summary
+        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT enrolment_id, semester, COUNT(*), COUNT(total_score), COALESCE(SUM(total_score), 0),
+           COALESCE(SUM(total_score::bigint * total_score), 0), MIN(total_score), MAX(total_score)
+    FROM student_scores
+    GROUP BY enrolment_id, semester;
+
+    INSERT INTO class_subject_summary
+        (semester, subject, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT semester, subject, COUNT(*), COUNT(total_score), COALESCE(SUM(total_score), 0),
+           COALESCE(SUM(total_score::bigint * total_score), 0), MIN(total_score), MAX(total_score)
+    FROM student_scores
+    GROUP BY semester, subject;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Applies the rows a statement inserted (+1) and removed (-1) to both
+-- summaries. Sums and counts are adjusted incrementally; min/max are only
+-- recomputed from student_scores for groups that lost a boundary value.
+CREATE OR REPLACE FUNCTION maintain_score_summaries() RETURNS trigger AS $$
+DECLARE
+    ids TEXT[] := '{}';
+    sems INT[] := '{}';
+    subjects TEXT[] := '{}';
+    totals INT[] := '{}';
+    signs INT[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT ids || array_agg(enrolment_id), sems || array_agg(semester), subjects || array_agg(subject),
+               totals || array_agg(total_score), signs || array_agg(1)
+        INTO ids, sems, subjects, totals, signs
+        FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT ids || array_agg(enrolment_id), sems || array_agg(semester), subjects || array_agg(subject),
+               totals || array_agg(total_score), signs || array_agg(-1)
+        INTO ids, sems, subjects, totals, signs
+        FROM old_rows;
+    END IF;
+    IF ids IS NULL OR cardinality(ids) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    -- Per student and semester
+    INSERT INTO student_semester_summary AS s
+        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT c.enrolment_id, c.semester,
+           SUM(c.sign),
+           COALESCE(SUM(c.sign) FILTER (WHERE c.total_score IS NOT NULL), 0),
+           COALESCE(SUM(c.sign * c.total_score), 0),
+           COALESCE(SUM(c.sign * c.total_score::bigint * c.total_score), 0),
+           MIN(c.total_score) FILTER (WHERE c.sign = 1),
+           MAX(c.total_score) FILTER (WHERE c.sign = 1)
+    FROM unnest(ids, sems, subjects, totals, signs) AS c(enrolment_id, semester, subject, total_score, sign)
+    GROUP BY c.enrolment_id, c.semester
+    ON CONFLICT (enrolment_id, semester) DO UPDATE SET
+        row_count = s.row_count + EXCLUDED.row_count,
+        score_count = s.score_count + EXCLUDED.score_count,
+        score_sum = s.score_sum + EXCLUDED.score_sum,
+        score_sumsq = s.score_sumsq + EXCLUDED.score_sumsq,
+        score_min = LEAST(s.score_min, EXCLUDED.score_min),
+        score_max = GREATEST(s.score_max, EXCLUDED.score_max);
+
+    UPDATE student_semester_summary s
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.enrolment_id = s.enrolment_id AND sc.semester = s.semester
+    )
+    FROM (
+        SELECT DISTINCT c.enrolment_id, c.semester, c.total_score
+        FROM unnest(ids, sems, totals, signs) AS c(enrolment_id, semester, total_score, sign)
+        WHERE c.sign = -1 AND c.total_score IS NOT NULL
+    ) removed
+    WHERE s.enrolment_id = removed.enrolment_id AND s.semester = removed.semester
+      AND (removed.total_score <= s.score_min OR removed.total_score >= s.score_max);
+
+    DELETE FROM student_semester_summary WHERE row_count <= 0;
+
+    -- Per semester and subject (class-wide)
+    INSERT INTO class_subject_summary AS s
+        (semester, subject, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT c.semester, c.subject,
+           SUM(c.sign),
+           COALESCE(SUM(c.sign) FILTER (WHERE c.total_score IS NOT NULL), 0),
+           COALESCE(SUM(c.sign * c.total_score), 0),
+           COALESCE(SUM(c.sign * c.total_score::bigint * c.total_score), 0),
+           MIN(c.total_score) FILTER (WHERE c.sign = 1),
+           MAX(c.total_score) FILTER (WHERE c.sign = 1)
+    FROM unnest(sems, subjects, totals, signs) AS c(semester, subject, total_score, sign)
+    GROUP BY c.semester, c.subject
+    ON CONFLICT (semester, subject) DO UPDATE SET
+        row_count = s.row_count + EXCLUDED.row_count,
+        score_count = s.score_count + EXCLUDED.score_count,
+        score_sum = s.score_sum + EXCLUDED.score_sum,
+        score_sumsq = s.score_sumsq + EXCLUDED.score_sumsq,
+        score_min = LEAST(s.score_min, EXCLUDED.score_min),
+        score_max = GREATEST(s.score_max, EXCLUDED.score_max);
+
+    UPDATE class_subject_summary s
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.semester = s.semester AND sc.subject = s.subject
+    )
+    FROM (
+        SELECT DISTINCT c.semester, c.subject, c.total_score
+        FROM unnest(sems, subjects, totals, signs) AS c(semester, subject, total_score, sign)
+        WHERE c.sign = -1 AND c.total_score IS NOT NULL
+    ) removed
+    WHERE s.semester = removed.semester AND s.subject = removed.subject
+      AND (removed.total_score <= s.score_min OR removed.total_score >= s.score_max);
+
+    DELETE FROM class_subject_summary WHERE row_count <= 0;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clear_score_summaries() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM student_semester_summary;
+    DELETE FROM class_subject_summary;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS score_summaries_insert ON student_scores;
+CREATE TRIGGER score_summaries_insert
+    AFTER INSERT ON student_scores
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_score_summaries();
+
+DROP TRIGGER IF EXISTS score_summaries_update ON student_scores;
+CREATE TRIGGER score_summaries_update
+    AFTER UPDATE ON student_scores
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_score_summaries();
+
+DROP TRIGGER IF EXISTS score_summaries_delete ON student_scores;
+CREATE TRIGGER score_summaries_delete
+    AFTER DELETE ON student_scores
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_score_summaries();
+
+DROP TRIGGER IF EXISTS score_summaries_truncate ON student_scores;
+CREATE TRIGGER score_summaries_truncate
+    AFTER TRUNCATE ON student_scores
+    FOR EACH STATEMENT EXECUTE FUNCTION clear_score_summaries();
+
+-- Backfill for databases that already hold scores.
+SELECT rebuild_score_summaries();
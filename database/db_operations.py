@@ -1,50 +1,265 @@
+import os
+import time
+import weakref
+from contextlib import contextmanager
+
 import psycopg2
-from psycopg2 import Error
+from psycopg2 import Error, errors
+from database.backend import StorageBackend
+from database.connection_pool import get_pool
+from database.instrumentation import note_error
 from utils.error_handling import log_error
 
-def get_connection():
+TEST_FIELDS = ('T1', 'T2', 'T3', 'T4')
+
+# Rows fetched per round trip by the iter_* (server-side cursor) methods.
+STREAM_ITERSIZE = int(os.environ.get("APT_DB_ITERSIZE", "5000"))
+
+# Set APT_DB_PREPARE=0 to send the hot lookups as plain statements, e.g.
+# behind a transaction-mode connection pooler that does not keep session state.
+USE_PREPARED_STATEMENTS = os.environ.get("APT_DB_PREPARE", "1") != "0"
+
+# NOTIFY channel signalling each committed change to the data (see fetch_data_version).
+DATA_VERSION_CHANNEL = "apt_data_version"
+
+# Connection settings come from the environment. If APT_DB_PASSWORD is not
+# set, libpq falls back to PGPASSWORD or ~/.pgpass.
+DB_CONFIG = {
+    key: value
+    for key, value in {
+        "dbname": os.environ.get("APT_DB_NAME", "academic_db"),
+        "user": os.environ.get("APT_DB_USER", "postgres"),
+        "password": os.environ.get("APT_DB_PASSWORD"),
+        "host": os.environ.get("APT_DB_HOST", "localhost"),
+        "port": os.environ.get("APT_DB_PORT", "5432"),
+    }.items()
+    if value is not None
+}
+
+def get_connection(**overrides):
+    """
+    Opens a new psycopg2 connection using DB_CONFIG; keyword arguments
+    override individual settings (e.g. dbname="academic_bench").
+    """
     try:
-        conn = psycopg2.connect(
-            dbname="academic_db",
-            user="postgres",
-            password="1806",
-            host="localhost",
-            port="5432"
-        )
+        conn = psycopg2.connect(**{**DB_CONFIG, **overrides})
         return conn
     except Error as e:
         log_error("Database connection failed", e)
         raise e
 
-class DBOperations:
-    def __init__(self):
-        self.conn = get_connection()
+
+# One statement returns everything the selected students' reports need as a
+# single JSON document: each student with their own score rows, plus the
+# class-wide rows for every semester any of them has scores in (used for
+# class averages and percentile ranks).
+REPORT_DATA_QUERY = """
+    WITH selected AS (
+        SELECT s.enrolment_id, s.fullname, s.semester
+        FROM students s
+        WHERE (%(enrolment_ids)s::varchar[] IS NULL OR s.enrolment_id = ANY(%(enrolment_ids)s::varchar[]))
+          AND (%(semester)s::int IS NULL OR s.semester = %(semester)s::int)
+    ),
+    own_scores AS (
+        SELECT sc.enrolment_id,
+               json_agg(json_build_array(sc.semester, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score)
+                        ORDER BY sc.semester, sub.name) AS scores
+        FROM student_scores sc
+        JOIN selected USING (enrolment_id)
+        JOIN subjects sub USING (subject_id)
+        GROUP BY sc.enrolment_id
+    ),
+    semesters AS (
+        SELECT DISTINCT sc.semester
+        FROM student_scores sc
+        JOIN selected USING (enrolment_id)
+    ),
+    class_scores AS (
+        SELECT sc.semester,
+               json_agg(json_build_array(sc.enrolment_id, sub.name, sc.total_score)
+                        ORDER BY sub.name, sc.enrolment_id) AS scores
+        FROM student_scores sc
+        JOIN semesters USING (semester)
+        JOIN subjects sub USING (subject_id)
+        GROUP BY sc.semester
+    )
+    SELECT json_build_object(
+        'students', COALESCE((
+            SELECT json_agg(json_build_object(
+                       'enrolment_id', s.enrolment_id,
+                       'fullname', s.fullname,
+                       'semester', s.semester,
+                       'scores', COALESCE(o.scores, '[]'::json))
+                   ORDER BY s.enrolment_id)
+            FROM selected s
+            LEFT JOIN own_scores o USING (enrolment_id)
+        ), '[]'::json),
+        'class_scores', COALESCE((SELECT json_object_agg(semester, scores) FROM class_scores), '{}'::json)
+    )
+"""
+
+# The lookups the interactive menus run over and over. Each is PREPAREd once
+# per pooled connection (see PreparedStatements), so PostgreSQL parses and
+# plans it once instead of on every call.
+PREPARED_QUERIES = {
+    "student_by_enrolment": "SELECT * FROM students WHERE enrolment_id = %s",
+    "student_scores": """
+        SELECT sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+        FROM student_scores sc
+        JOIN subjects sub USING (subject_id)
+        WHERE sc.enrolment_id = %s AND sc.semester = %s
+    """,
+    "test_scores_for_subject": """
+        SELECT sc.T1, sc.T2, sc.T3, sc.T4
+        FROM student_scores sc
+        JOIN subjects sub USING (subject_id)
+        WHERE sc.enrolment_id = %s
+          AND sc.semester = %s
+          AND lower(sub.name) = lower(%s)
+        LIMIT 1
+    """,
+    "subjects_for_semester": """
+        SELECT DISTINCT sub.name
+        FROM student_scores sc
+        JOIN subjects sub USING (subject_id)
+        WHERE sc.enrolment_id = %s
+          AND sc.semester = %s
+        ORDER BY sub.name
+    """,
+}
+
+
+class PreparedStatements:
+    """
+    Registry of the statements PREPAREd on each connection.
+
+    Connections are tracked weakly, so a connection the pool replaces
+    (after a server restart or a broken socket) is forgotten, and its
+    replacement prepares the statements again on first use. If the server
+    session loses them some other way (DISCARD ALL, a pooler handing out
+    another backend), EXECUTE fails and the statement is re-prepared.
+    """
+
+    def __init__(self, queries):
+        self.queries = queries
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> {names}
+
+    def _prepare(self, cur, name):
+        query = self.queries[name]
+        # PREPARE takes $1, $2, ... where psycopg2 queries use %s.
+        parts = query.split("%s")
+        numbered = "".join(part + (f"${i}" if i < len(parts) else "") for i, part in enumerate(parts, 1))
+        cur.execute(f"PREPARE {name} AS {numbered}")
+        self._prepared.setdefault(cur.connection, set()).add(name)
+
+    def execute(self, cur, name, params):
+        """Runs the named statement on cur, preparing it first if its connection has not."""
+        if name not in self._prepared.get(cur.connection, ()):
+            self._prepare(cur, name)
+        statement = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+        try:
+            cur.execute(statement, params)
+        except errors.InvalidSqlStatementName:
+            # Prepared statements outlive a rollback, but not the session.
+            cur.connection.rollback()
+            self._prepare(cur, name)
+            cur.execute(statement, params)
+
+
+prepared_statements = PreparedStatements(PREPARED_QUERIES)
+
+
+class DBOperations(StorageBackend):
+    def __init__(self, pool=None, prepare=None):
+        # All instances share one process-wide pool; connections are only
+        # checked out for the duration of a single query or transaction.
+        self.pool = pool if pool is not None else get_pool(get_connection)
+        self.prepare = USE_PREPARED_STATEMENTS if prepare is None else prepare
+
+    def _execute_hot(self, cur, name, params):
+        """Runs one of PREPARED_QUERIES, as a prepared statement unless disabled."""
+        if self.prepare:
+            prepared_statements.execute(cur, name, params)
+        else:
+            cur.execute(PREPARED_QUERIES[name], params)
+
+    @contextmanager
+    def cursor(self):
+        """
+        Checks out a pooled connection and yields a cursor on it.
+        Commits when the block succeeds, rolls back if it raises,
+        and returns the connection to the pool either way.
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    yield cur
+                conn.commit()
+        except Exception:
+            note_error()
+            raise
+
+    def _stream(self, name, query, params=None, itersize=None):
+        """
+        Runs query on a named (server-side) cursor and yields lists of at
+        most itersize rows, so only one chunk is held in memory at a time.
+        The pooled connection stays checked out until the iterator is
+        exhausted or closed.
+        """
+        itersize = itersize or STREAM_ITERSIZE
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(name=name) as cur:
+                    cur.itersize = itersize
+                    cur.execute(query, params)
+                    while True:
+                        rows = cur.fetchmany(itersize)
+                        if not rows:
+                            break
+                        yield rows
+                conn.commit()
+        except Exception:
+            note_error()
+            raise
 
     def fetch_student_by_enrolment(self, enrolment_id):
         try:
-            with self.conn.cursor() as cur:
-                cur.execute("SELECT * FROM students WHERE enrolment_id = %s", (enrolment_id,))
+            with self.cursor() as cur:
+                self._execute_hot(cur, "student_by_enrolment", (enrolment_id,))
                 student = cur.fetchone()
                 return student
         except Error as e:
             log_error("Error fetching student", e)
             return None
 
+    def fetch_faculty_password(self, faculty_id):
+        """
+        Returns the stored bcrypt password hash for the given faculty_id,
+        or None if the faculty member does not exist.
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT password FROM faculty WHERE faculty_id = %s", (faculty_id,))
+                row = cur.fetchone()
+                return row[0] if row else None
+        except Error as e:
+            log_error("Error fetching faculty credentials", e)
+            return None
+
     # Example update function for student score (expand as needed)
     def update_student_score(self, enrolment_id, subject, new_total_score):
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 query = """
                 UPDATE student_scores
                 SET total_score = %s
-                WHERE enrolment_id = %s AND subject = %s
+                WHERE enrolment_id = %s
+                  AND subject_id = (SELECT subject_id FROM subjects WHERE name = %s)
                 """
                 cur.execute(query, (new_total_score, enrolment_id, subject))
-                self.conn.commit()
                 return True
         except Error as e:
             log_error("Error updating student score", e)
-            self.conn.rollback()
             return False
 
 
@@ -54,15 +269,11 @@ class DBOperations:
         Returns a list of tuples: (subject, T1, T2, T3, T4, total_score)
         """
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    "SELECT subject, T1, T2, T3, T4, total_score FROM student_scores WHERE enrolment_id = %s AND semester = %s",
-                    (enrolment_id, semester)
-                )
+            with self.cursor() as cur:
+                self._execute_hot(cur, "student_scores", (enrolment_id, semester))
                 results = cur.fetchall()
                 return results
         except Exception as e:
-            from utils.error_handling import log_error
             log_error("Error fetching student scores", e)
             return []
 
@@ -72,17 +283,17 @@ class DBOperations:
         Returns a list of tuples: (semester, subject, T1, T2, T3, T4, total_score).
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 query = """
-                    SELECT semester, subject, T1, T2, T3, T4, total_score
-                    FROM student_scores
-                    WHERE enrolment_id = %s
-                    ORDER BY semester, subject
+                    SELECT sc.semester, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.enrolment_id = %s
+                    ORDER BY sc.semester, sub.name
                 """
                 cur.execute(query, (enrolment_id,))
                 return cur.fetchall()
         except Exception as e:
-            from utils.error_handling import log_error
             log_error("Error fetching all semester scores", e)
             return []
 
@@ -91,17 +302,17 @@ class DBOperations:
         Fetch (enrolment_id, subject, total_score) for all students in the given semester.
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 query = """
-                    SELECT enrolment_id, subject, total_score
-                    FROM student_scores
-                    WHERE semester = %s
-                    ORDER BY subject
+                    SELECT sc.enrolment_id, sub.name, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.semester = %s
+                    ORDER BY sub.name
                 """
                 cur.execute(query, (semester,))
                 return cur.fetchall()
         except Exception as e:
-            from utils.error_handling import log_error
             log_error("Error fetching semester scores for all students", e)
             return []
 
@@ -112,20 +323,11 @@ class DBOperations:
         Returns a tuple (T1, T2, T3, T4) or None if no record is found.
         """
         try:
-            with self.conn.cursor() as cur:
-                query = """
-                    SELECT T1, T2, T3, T4
-                    FROM student_scores
-                    WHERE enrolment_id = %s
-                      AND semester = %s
-                      AND subject ILIKE %s
-                    LIMIT 1
-                """
-                cur.execute(query, (enrolment_id, semester, subject))
+            with self.cursor() as cur:
+                self._execute_hot(cur, "test_scores_for_subject", (enrolment_id, semester, subject))
                 row = cur.fetchone()
                 return row  # e.g. (13.5, 15, 12.5, 11.5)
         except Exception as e:
-            from utils.error_handling import log_error
             log_error("Error fetching test scores for subject", e)
             return None
 
@@ -134,20 +336,12 @@ class DBOperations:
         Returns a list of distinct subject names for the given student and semester.
         """
         try:
-            with self.conn.cursor() as cur:
-                query = """
-                    SELECT DISTINCT subject
-                    FROM student_scores
-                    WHERE enrolment_id = %s
-                      AND semester = %s
-                    ORDER BY subject
-                """
-                cur.execute(query, (enrolment_id, semester))
+            with self.cursor() as cur:
+                self._execute_hot(cur, "subjects_for_semester", (enrolment_id, semester))
                 rows = cur.fetchall()  # e.g. [('JAVA-I',), ('Physics (PHY)',), ...]
                 subjects = [row[0] for row in rows]  # flatten tuples
                 return subjects
         except Exception as e:
-            from utils.error_handling import log_error
             log_error("Error fetching subjects for semester", e)
             return []
 
@@ -157,16 +351,16 @@ class DBOperations:
         for all students and all semesters in the student_scores table.
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 query = """
-                    SELECT enrolment_id, semester, subject, total_score
-                    FROM student_scores
-                    ORDER BY subject
+                    SELECT sc.enrolment_id, sc.semester, sub.name, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    ORDER BY sub.name
                 """
                 cur.execute(query)
                 return cur.fetchall()
         except Exception as e:
-            from utils.error_handling import log_error
             log_error("Error fetching all scores", e)
             return []
 
@@ -176,7 +370,7 @@ class DBOperations:
         (enrolment_id, fullname, semester)
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute("""
                     SELECT enrolment_id, fullname, semester
                     FROM students
@@ -184,7 +378,47 @@ class DBOperations:
                 """)
                 return cur.fetchall()
         except Exception as e:
-            # Log error if necessary
+            log_error("Error fetching students", e)
+            return []
+
+    def fetch_student_overall_averages(self, min_avg=None, max_avg=None, scored_only=False):
+        """
+        Returns one row per student with their overall average total score
+        across all semesters and subjects, computed in a single GROUP BY
+        over student_semester_summary (one row per student and semester):
+          (enrolment_id, fullname, semester, overall_avg, row_count)
+        Students without scores have overall_avg None and row_count 0.
+        If min_avg / max_avg are given they are applied in SQL (HAVING), so
+        students without scores are excluded as well; scored_only=True
+        excludes them without any average filter.
+        """
+        having = []
+        params = []
+        overall_avg = "SUM(ss.score_sum)::float / NULLIF(SUM(ss.score_count), 0)"
+        if scored_only:
+            having.append("SUM(ss.score_count) > 0")
+        if min_avg is not None:
+            having.append(f"{overall_avg} >= %s")
+            params.append(min_avg)
+        if max_avg is not None:
+            having.append(f"{overall_avg} <= %s")
+            params.append(max_avg)
+        having_clause = f"HAVING {' AND '.join(having)}" if having else ""
+        try:
+            with self.cursor() as cur:
+                cur.execute(f"""
+                    SELECT s.enrolment_id, s.fullname, s.semester,
+                           (SUM(ss.score_sum)::float / NULLIF(SUM(ss.score_count), 0)) AS overall_avg,
+                           COALESCE(SUM(ss.score_count), 0) AS row_count
+                    FROM students s
+                    LEFT JOIN student_semester_summary ss ON ss.enrolment_id = s.enrolment_id
+                    GROUP BY s.enrolment_id, s.fullname, s.semester
+                    {having_clause}
+                    ORDER BY s.enrolment_id
+                """, params)
+                return cur.fetchall()
+        except Error as e:
+            log_error("Error fetching overall averages", e)
             return []
 
     def fetch_all_student_scores(self):
@@ -193,17 +427,94 @@ class DBOperations:
         (enrolment_id, subject, T1, T2, T3, T4, total_score, semester)
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute("""
-                    SELECT enrolment_id, subject, T1, T2, T3, T4, total_score, semester
-                    FROM student_scores
-                    ORDER BY semester, enrolment_id
+                    SELECT sc.enrolment_id, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score, sc.semester
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    ORDER BY sc.semester, sc.enrolment_id
                 """)
                 return cur.fetchall()
         except Exception as e:
-            # Optionally log error
+            log_error("Error fetching all student scores", e)
             return []
 
+    def iter_all_student_scores(self, itersize=None):
+        """
+        Streaming variant of fetch_all_student_scores: yields chunks (lists) of
+        (enrolment_id, subject, T1, T2, T3, T4, total_score, semester) rows
+        read through a server-side cursor.
+        """
+        try:
+            yield from self._stream("iter_all_student_scores", """
+                SELECT sc.enrolment_id, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score, sc.semester
+                FROM student_scores sc
+                JOIN subjects sub USING (subject_id)
+                ORDER BY sc.semester, sc.enrolment_id
+            """, itersize=itersize)
+        except Error as e:
+            log_error("Error streaming student scores", e)
+
+    def fetch_student_semester_summary(self, enrolment_id):
+        """
+        Returns the trigger-maintained per-semester aggregates for a student:
+          (semester, score_count, score_sum, avg_score, min_score, max_score)
+        ordered by semester.
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT semester, score_count, score_sum,
+                           score_sum::float / NULLIF(score_count, 0) AS avg_score,
+                           score_min, score_max
+                    FROM student_semester_summary
+                    WHERE enrolment_id = %s
+                    ORDER BY semester
+                """, (enrolment_id,))
+                return cur.fetchall()
+        except Error as e:
+            log_error("Error fetching student semester summary", e)
+            return []
+
+    def fetch_class_subject_summary(self, semester=None):
+        """
+        Returns the trigger-maintained class-wide aggregates per semester and subject:
+          (semester, subject, score_count, score_sum, avg_score, min_score, max_score, stddev_score)
+        for one semester, or for all semesters if semester is None.
+        stddev_score is the population standard deviation derived from the sum of squares.
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT cs.semester, sub.name, cs.score_count, cs.score_sum,
+                           cs.score_sum::float / NULLIF(cs.score_count, 0) AS avg_score,
+                           cs.score_min, cs.score_max,
+                           sqrt(GREATEST(cs.score_sumsq::float / NULLIF(cs.score_count, 0)
+                                         - (cs.score_sum::float / NULLIF(cs.score_count, 0)) ^ 2, 0)) AS stddev_score
+                    FROM class_subject_summary cs
+                    JOIN subjects sub USING (subject_id)
+                    WHERE %s IS NULL OR cs.semester = %s
+                    ORDER BY cs.semester, sub.name
+                """, (semester, semester))
+                return cur.fetchall()
+        except Error as e:
+            log_error("Error fetching class subject summary", e)
+            return []
+
+    def rebuild_score_summaries(self):
+        """
+        Recomputes student_semester_summary and class_subject_summary from
+        student_scores (e.g. after loading data with triggers disabled).
+        Returns True on success.
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT rebuild_score_summaries()")
+                return True
+        except Error as e:
+            log_error("Error rebuilding score summaries", e)
+            return False
+
     def fetch_faculty_logs(self, faculty_id):
         """
         Returns a list of audit log entries for the given faculty_id.
@@ -212,7 +523,7 @@ class DBOperations:
         Ordered by timestamp descending.
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 query = """
                     SELECT log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp
                     FROM faculty_logs
@@ -222,51 +533,298 @@ class DBOperations:
                 cur.execute(query, (faculty_id,))
                 return cur.fetchall()
         except Exception as e:
-            # Optionally log the error
+            log_error("Error fetching faculty logs", e)
             return []
 
+    def fetch_faculty_logs_page(self, faculty_id, page_size=20, after=None, enrolment_id=None,
+                                date_from=None, date_to=None, action=None):
+        """
+        Returns one page of a faculty member's audit log, newest first, as
+        (rows, next_after):
+          - rows: up to page_size tuples of
+            (log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp)
+          - next_after: the (timestamp, log_id) to pass as `after` for the next
+            page, or None if this is the last page.
+        Pages are keyset-paginated on (timestamp, log_id), so every page costs
+        the same however deep into the history it is. Optional filters:
+        enrolment_id, date_from (inclusive), date_to (exclusive) and action
+        (case-insensitive substring).
+        """
+        conditions = ["faculty_id = %s"]
+        params = [faculty_id]
+        if enrolment_id:
+            conditions.append("enrolment_id = %s")
+            params.append(enrolment_id)
+        if date_from is not None:
+            conditions.append("timestamp >= %s")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("timestamp < %s")
+            params.append(date_to)
+        if action:
+            conditions.append("action ILIKE %s")
+            params.append(f"%{action}%")
+        if after is not None:
+            conditions.append("(timestamp, log_id) < (%s, %s)")
+            params.extend(after)
+        params.append(page_size + 1)  # one extra row tells us whether another page exists
+        try:
+            with self.cursor() as cur:
+                cur.execute(f"""
+                    SELECT log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp
+                    FROM faculty_logs
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY timestamp DESC, log_id DESC
+                    LIMIT %s
+                """, params)
+                rows = cur.fetchall()
+        except Error as e:
+            log_error("Error fetching faculty log page", e)
+            return [], None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            return rows, (rows[-1][6], rows[-1][0])
+        return rows, None
+
     def update_student_test_score(self, enrolment_id, semester, subject, test_field, new_value):
         """
         Updates the test score for a given student, semester, and subject.
-        Recalculates the total score (sum of T1, T2, T3, T4) after update.
+        Recalculates the total score (sum of T1, T2, T3, T4) in the same statement.
         Returns a tuple (old_value, new_total) if successful, or None if failed.
         """
+        if test_field not in TEST_FIELDS:
+            return None
+        new_tests = " + ".join("%(value)s" if f == test_field else f"sc.{f}" for f in TEST_FIELDS)
         try:
-            with self.conn.cursor() as cur:
-                # Fetch current test scores
-                cur.execute("""
-                    SELECT T1, T2, T3, T4 
-                    FROM student_scores 
-                    WHERE enrolment_id = %s AND semester = %s AND subject = %s
-                """, (enrolment_id, semester, subject))
+            with self.cursor() as cur:
+                # The row is locked first, so the old value RETURNING reports
+                # is the one being overwritten; the new total is computed from
+                # sc, which Postgres re-reads if a concurrent writer got there first.
+                cur.execute(f"""
+                    WITH old AS (
+                        SELECT enrolment_id, semester, subject_id, {test_field} AS old_value
+                        FROM student_scores
+                        WHERE enrolment_id = %(enrolment_id)s
+                          AND semester = %(semester)s
+                          AND subject_id = (SELECT subject_id FROM subjects WHERE name = %(subject)s)
+                        FOR UPDATE
+                    )
+                    UPDATE student_scores sc
+                    SET {test_field} = %(value)s,
+                        total_score = {new_tests}
+                    FROM old
+                    WHERE sc.enrolment_id = old.enrolment_id
+                      AND sc.semester = old.semester
+                      AND sc.subject_id = old.subject_id
+                    RETURNING old.old_value, sc.total_score
+                """, {"value": new_value, "enrolment_id": enrolment_id,
+                      "semester": semester, "subject": subject})
                 row = cur.fetchone()
-                if not row:
-                    return None
-                scores = list(row)  # [T1, T2, T3, T4]
-                test_index = {'T1': 0, 'T2': 1, 'T3': 2, 'T4': 3}
-                if test_field not in test_index:
-                    return None
-                old_value = scores[test_index[test_field]]
-
-                # Update the specified test score
+                return (row[0], row[1]) if row else None
+        except Exception as e:
+            log_error("Error updating test score", e)
+            return None
+
+    def apply_score_edits(self, faculty_id, edits, action_prefix="Updated"):
+        """
+        Applies many test-score edits and their audit log entries atomically,
+        in a single statement (one round trip).
+          edits: iterable of (enrolment_id, semester, subject, test_field, value)
+                 with test_field one of T1-T4 and value between 0 and 25.
+                 If the same test is edited more than once, the last edit wins.
+        total_score is recomputed in SQL, and one faculty_logs row per changed
+        test is written in the same transaction.
+        Returns a list of (enrolment_id, semester, subject, test_field,
+        old_value, new_value, new_total) for the edits that matched a score
+        row, or None if the edits are invalid or the update failed.
+        """
+        rows = {}  # (enrolment_id, semester, subject) -> {test_field: value}
+        for enrolment_id, semester, subject, test_field, value in edits:
+            if test_field not in TEST_FIELDS or value is None or not 0 <= value <= 25:
+                log_error("Invalid score edit", f"{enrolment_id} {subject} {test_field}={value}")
+                return None
+            rows.setdefault((enrolment_id, semester, subject), {})[test_field] = value
+        if not rows:
+            return []
+
+        keys = list(rows)
+        params = {
+            "faculty_id": faculty_id,
+            "action_prefix": action_prefix,
+            "enrolment_ids": [k[0] for k in keys],
+            "semesters": [k[1] for k in keys],
+            "subjects": [k[2] for k in keys],
+        }
+        for field in TEST_FIELDS:
+            params[f"new_{field}"] = [rows[k].get(field) for k in keys]
+
+        changed_tests = """
+            CROSS JOIN LATERAL (VALUES
+                ('T1', u.old_t1, u.new_t1, u.set_t1),
+                ('T2', u.old_t2, u.new_t2, u.set_t2),
+                ('T3', u.old_t3, u.new_t3, u.set_t3),
+                ('T4', u.old_t4, u.new_t4, u.set_t4)
+            ) f(test_field, old_value, new_value, was_set)
+            WHERE f.was_set
+        """
+        try:
+            with self.cursor() as cur:
                 cur.execute(f"""
-                    UPDATE student_scores
-                    SET {test_field} = %s
-                    WHERE enrolment_id = %s AND semester = %s AND subject = %s
-                """, (new_value, enrolment_id, semester, subject))
-
-                # Update the total score
-                scores[test_index[test_field]] = new_value
-                new_total = sum(scores)
+                    WITH edits AS (
+                        SELECT e.*, sub.subject_id
+                        FROM unnest(%(enrolment_ids)s::varchar[], %(semesters)s::int[], %(subjects)s::varchar[],
+                                    %(new_T1)s::int[], %(new_T2)s::int[], %(new_T3)s::int[], %(new_T4)s::int[])
+                             AS e(enrolment_id, semester, subject, t1, t2, t3, t4)
+                        JOIN subjects sub ON sub.name = e.subject
+                    ),
+                    -- Locks the rows and reads their current values for the
+                    -- audit log. New values are computed from sc, which
+                    -- Postgres re-reads if a concurrent writer updated the
+                    -- row first, so no other change is overwritten.
+                    old AS (
+                        SELECT sc.enrolment_id, sc.semester, sc.subject_id, sc.T1, sc.T2, sc.T3, sc.T4
+                        FROM student_scores sc
+                        JOIN edits e
+                          ON sc.enrolment_id = e.enrolment_id
+                         AND sc.semester = e.semester
+                         AND sc.subject_id = e.subject_id
+                        FOR UPDATE OF sc
+                    ),
+                    updated AS (
+                        UPDATE student_scores sc
+                        SET T1 = COALESCE(e.t1, sc.T1),
+                            T2 = COALESCE(e.t2, sc.T2),
+                            T3 = COALESCE(e.t3, sc.T3),
+                            T4 = COALESCE(e.t4, sc.T4),
+                            total_score = COALESCE(e.t1, sc.T1) + COALESCE(e.t2, sc.T2)
+                                        + COALESCE(e.t3, sc.T3) + COALESCE(e.t4, sc.T4)
+                        FROM edits e
+                        JOIN old
+                          ON old.enrolment_id = e.enrolment_id
+                         AND old.semester = e.semester
+                         AND old.subject_id = e.subject_id
+                        WHERE sc.enrolment_id = e.enrolment_id
+                          AND sc.semester = e.semester
+                          AND sc.subject_id = e.subject_id
+                        RETURNING sc.enrolment_id, sc.semester, e.subject, sc.total_score AS new_total,
+                                  old.T1 AS old_t1, old.T2 AS old_t2, old.T3 AS old_t3, old.T4 AS old_t4,
+                                  sc.T1 AS new_t1, sc.T2 AS new_t2, sc.T3 AS new_t3, sc.T4 AS new_t4,
+                                  e.t1 IS NOT NULL AS set_t1, e.t2 IS NOT NULL AS set_t2,
+                                  e.t3 IS NOT NULL AS set_t3, e.t4 IS NOT NULL AS set_t4
+                    ),
+                    logged AS (
+                        INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value)
+                        SELECT %(faculty_id)s, u.enrolment_id,
+                               %(action_prefix)s || ' ' || u.subject || ' ' || f.test_field || ': '
+                                   || COALESCE(f.old_value::text, 'None') || ' -> ' || f.new_value
+                                   || ', new total score = ' || u.new_total,
+                               COALESCE(f.old_value::text, 'None'), f.new_value::text
+                        FROM updated u
+                        {changed_tests}
+                    )
+                    SELECT u.enrolment_id, u.semester, u.subject, f.test_field,
+                           f.old_value, f.new_value, u.new_total
+                    FROM updated u
+                    {changed_tests}
+                    ORDER BY u.enrolment_id, u.semester, u.subject, f.test_field
+                """, params)
+                return cur.fetchall()
+        except Error as e:
+            log_error("Error applying score edits", e)
+            return None
+
+    def fetch_subject_roster(self, semester, subject):
+        """
+        Returns every student's current test scores for one subject in a semester:
+        a list of (enrolment_id, fullname, T1, T2, T3, T4, total_score) ordered by enrolment_id.
+        """
+        try:
+            with self.cursor() as cur:
                 cur.execute("""
-                    UPDATE student_scores
-                    SET total_score = %s
-                    WHERE enrolment_id = %s AND semester = %s AND subject = %s
-                """, (new_total, enrolment_id, semester, subject))
-                self.conn.commit()
-                return (old_value, new_total)
-        except Exception as e:
-            self.conn.rollback()
+                    SELECT sc.enrolment_id, s.fullname, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+                    FROM student_scores sc
+                    JOIN students s ON s.enrolment_id = sc.enrolment_id
+                    WHERE sc.semester = %s
+                      AND sc.subject_id = (SELECT subject_id FROM subjects WHERE name = %s)
+                    ORDER BY sc.enrolment_id
+                """, (semester, subject))
+                return cur.fetchall()
+        except Error as e:
+            log_error("Error fetching subject roster", e)
+            return []
+
+    def fetch_semester_subjects(self, semester):
+        """
+        Returns the distinct subject names taught in a semester, across all
+        students, read from class_subject_summary (one row per subject).
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sub.name
+                    FROM class_subject_summary cs
+                    JOIN subjects sub USING (subject_id)
+                    WHERE cs.semester = %s
+                    ORDER BY sub.name
+                """, (semester,))
+                return [row[0] for row in cur.fetchall()]
+        except Error as e:
+            log_error("Error fetching semester subjects", e)
+            return []
+
+    def fetch_subjects(self):
+        """
+        Returns every subject as (subject_id, name, acronym, max_marks), ordered by name.
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT subject_id, name, acronym, max_marks
+                    FROM subjects
+                    ORDER BY name
+                """)
+                return cur.fetchall()
+        except Error as e:
+            log_error("Error fetching subjects", e)
+            return []
+
+    def fetch_data_version(self):
+        """
+        Returns the data version: the last value of a sequence advanced by
+        every change to students, student_scores or subjects (see
+        migrations/0005_data_version.sql), or None on error. The value can
+        move before the change commits; a NOTIFY on DATA_VERSION_CHANNEL
+        follows each commit, so caches should listen there and take a new
+        value after each notification (as api/server.DataVersion does).
+        """
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT last_value FROM data_version_seq")
+                row = cur.fetchone()
+                return row[0] if row else None
+        except Error as e:
+            log_error("Error fetching data version", e)
+            return None
+
+    def fetch_report_data(self, enrolment_ids=None, semester=None):
+        """
+        Loads everything the selected students' reports need in one round
+        trip (REPORT_DATA_QUERY) and returns it as a dict:
+          {"students": [{"enrolment_id", "fullname", "semester", "scores"}, ...],
+           "class_scores": {"<semester>": [[enrolment_id, subject, total_score], ...]}}
+        Select students by enrolment IDs, by current semester, or (with
+        neither) all of them. Returns None on error.
+        """
+        params = {
+            "enrolment_ids": list(enrolment_ids) if enrolment_ids is not None else None,
+            "semester": semester,
+        }
+        try:
+            with self.cursor() as cur:
+                cur.execute(REPORT_DATA_QUERY, params)
+                return cur.fetchone()[0]
+        except Error as e:
+            log_error("Error loading report data", e)
             return None
 
     def insert_faculty_log(self, faculty_id, enrolment_id, action, old_value, new_value):
@@ -275,29 +833,158 @@ class DBOperations:
         Returns True if successful, or False if failed.
         """
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute("""
                     INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value)
                     VALUES (%s, %s, %s, %s, %s)
                 """, (faculty_id, enrolment_id, action, old_value, new_value))
-                self.conn.commit()
                 return True
         except Exception as e:
-            self.conn.rollback()
+            log_error("Error inserting faculty log", e)
             return False
 
-    def fetch_all_student_scores(self):
+    def bulk_import_scores(self, csv_file, faculty_id=None):
         """
-        Returns all student scores with columns:
-        (enrolment_id, subject, T1, T2, T3, T4, total_score, semester)
+        Loads a CSV of test scores into student_scores in a single transaction.
+        The file must have the header: enrolment_id,semester,subject,T1,T2,T3,T4
+
+        Rows are streamed into a temporary staging table with COPY, validated
+        in SQL (known student, semester 1-3, every test a whole number from
+        0 to 25; fractional marks are rejected rather than rounded),
+        de-duplicated (the last line for a student/semester/subject wins) and
+        merged: existing rows are updated, new ones inserted, and total_score
+        is recomputed from T1..T4. If faculty_id is given, one audit entry for
+        the import is written in the same transaction.
+
+        Returns a dict with the counts, the rejected rows as
+        (line_no, enrolment_id, semester, subject, reason) and rows_per_second,
+        or None if the import failed (nothing is written in that case).
         """
+        number = r"'^\s*-?[0-9]+(\.[0-9]+)?\s*$'"
+        start = time.perf_counter()
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute("""
-                    SELECT enrolment_id, subject, T1, T2, T3, T4, total_score, semester
-                    FROM student_scores
-                    ORDER BY semester, enrolment_id
+                    CREATE TEMP TABLE score_import_staging (
+                        line_no BIGSERIAL,
+                        enrolment_id TEXT,
+                        semester TEXT,
+                        subject TEXT,
+                        T1 TEXT, T2 TEXT, T3 TEXT, T4 TEXT
+                    ) ON COMMIT DROP
                 """)
-                return cur.fetchall()
-        except Exception as e:
-            return []
+                cur.copy_expert("""
+                    COPY score_import_staging (enrolment_id, semester, subject, T1, T2, T3, T4)
+                    FROM STDIN WITH (FORMAT csv, HEADER true)
+                """, csv_file)
+                cur.execute("SELECT COUNT(*) FROM score_import_staging")
+                total_rows = cur.fetchone()[0]
+
+                # Set-based validation: every row gets a reject reason or NULL.
+                # Duplicates are only counted among otherwise valid rows.
+                cur.execute(rf"""
+                    CREATE TEMP TABLE score_import_checked ON COMMIT DROP AS
+                    SELECT line_no, enrolment_id, semester, subject, T1, T2, T3, T4,
+                           COALESCE(reject_reason, CASE
+                               WHEN ROW_NUMBER() OVER (
+                                        PARTITION BY enrolment_id, semester, subject, reject_reason IS NULL
+                                        ORDER BY line_no DESC) > 1
+                                   THEN 'duplicate row, superseded by a later line'
+                           END) AS reject_reason
+                    FROM (
+                        SELECT st.line_no + 1 AS line_no,  -- +1 for the header line
+                               btrim(st.enrolment_id) AS enrolment_id,
+                               btrim(st.semester) AS semester,
+                               btrim(st.subject) AS subject,
+                               st.T1, st.T2, st.T3, st.T4,
+                               CASE
+                                   WHEN COALESCE(btrim(st.enrolment_id), '') = ''
+                                     OR COALESCE(btrim(st.subject), '') = ''
+                                       THEN 'missing enrolment_id or subject'
+                                   WHEN COALESCE(st.semester !~ '^\s*[1-3]\s*$', TRUE)
+                                       THEN 'semester must be 1, 2 or 3'
+                                   WHEN COALESCE(st.T1 !~ {number} OR st.T2 !~ {number}
+                                              OR st.T3 !~ {number} OR st.T4 !~ {number}, TRUE)
+                                       THEN 'T1-T4 must all be numbers'
+                                   WHEN st.T1::numeric NOT BETWEEN 0 AND 25 OR st.T2::numeric NOT BETWEEN 0 AND 25
+                                     OR st.T3::numeric NOT BETWEEN 0 AND 25 OR st.T4::numeric NOT BETWEEN 0 AND 25
+                                       THEN 'test scores must be between 0 and 25'
+                                   WHEN st.T1::numeric % 1 <> 0 OR st.T2::numeric % 1 <> 0
+                                     OR st.T3::numeric % 1 <> 0 OR st.T4::numeric % 1 <> 0
+                                       THEN 'test scores must be whole numbers'
+                                   WHEN s.enrolment_id IS NULL
+                                       THEN 'unknown enrolment_id'
+                               END AS reject_reason
+                        FROM score_import_staging st
+                        LEFT JOIN students s ON s.enrolment_id = btrim(st.enrolment_id)
+                    ) checked
+                """)
+                cur.execute("""
+                    SELECT line_no, enrolment_id, semester, subject, reject_reason
+                    FROM score_import_checked
+                    WHERE reject_reason IS NOT NULL
+                    ORDER BY line_no
+                """)
+                rejected = cur.fetchall()
+
+                cur.execute("""
+                    CREATE TEMP TABLE score_import_valid ON COMMIT DROP AS
+                    SELECT enrolment_id, semester::int AS semester, subject,
+                           T1::numeric::int AS T1, T2::numeric::int AS T2,
+                           T3::numeric::int AS T3, T4::numeric::int AS T4
+                    FROM score_import_checked
+                    WHERE reject_reason IS NULL
+                """)
+                # Subjects seen for the first time are added to the subjects table.
+                cur.execute("""
+                    INSERT INTO subjects (name, acronym)
+                    SELECT DISTINCT v.subject, subject_acronym(v.subject)
+                    FROM score_import_valid v
+                    WHERE NOT EXISTS (SELECT 1 FROM subjects sub WHERE sub.name = v.subject)
+                    ON CONFLICT (name) DO NOTHING
+                """)
+                cur.execute("""
+                    UPDATE student_scores sc
+                    SET T1 = v.T1, T2 = v.T2, T3 = v.T3, T4 = v.T4,
+                        total_score = v.T1 + v.T2 + v.T3 + v.T4
+                    FROM score_import_valid v
+                    JOIN subjects sub ON sub.name = v.subject
+                    WHERE sc.enrolment_id = v.enrolment_id
+                      AND sc.semester = v.semester
+                      AND sc.subject_id = sub.subject_id
+                """)
+                updated = cur.rowcount
+                cur.execute("""
+                    INSERT INTO student_scores (enrolment_id, semester, subject_id, T1, T2, T3, T4, total_score)
+                    SELECT v.enrolment_id, v.semester, sub.subject_id, v.T1, v.T2, v.T3, v.T4,
+                           v.T1 + v.T2 + v.T3 + v.T4
+                    FROM score_import_valid v
+                    JOIN subjects sub ON sub.name = v.subject
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM student_scores sc
+                        WHERE sc.enrolment_id = v.enrolment_id
+                          AND sc.semester = v.semester
+                          AND sc.subject_id = sub.subject_id
+                    )
+                """)
+                inserted = cur.rowcount
+
+                if faculty_id is not None:
+                    cur.execute("""
+                        INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value)
+                        VALUES (%s, NULL, %s, NULL, NULL)
+                    """, (faculty_id, f"Bulk score import: {updated} updated, {inserted} inserted, "
+                                      f"{len(rejected)} rejected of {total_rows} rows"))
+        except Error as e:
+            log_error("Error importing scores", e)
+            return None
+
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": total_rows,
+            "updated": updated,
+            "inserted": inserted,
+            "rejected": rejected,
+            "elapsed": elapsed,
+            "rows_per_second": total_rows / elapsed if elapsed > 0 else 0.0,
+        }
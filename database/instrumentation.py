@@ -0,0 +1,233 @@
+"""
+Per-method query statistics for the storage backends.
+
+Every query method of a StorageBackend subclass is wrapped (see
+StorageBackend.__init_subclass__) to record, per method name:
+  - calls and errors (a call counts as an error if its query raised,
+    even when the method caught it, logged it and returned an empty value)
+  - a latency histogram, with total and maximum time
+  - rows returned, and an estimate of the bytes they occupy (sampled from
+    the first rows, so the cost does not grow with the result size)
+
+Recording costs two clock reads and one lock per call, so it stays on by
+default. Settings (environment variables):
+  APT_DB_STATS       "0" to disable instrumentation entirely
+  APT_DB_STATS_FILE  write a JSON dump of the statistics here on exit
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, datetime
+
+ENABLED = os.environ.get("APT_DB_STATS", "1") != "0"
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last
+# bucket counts everything slower.
+BUCKET_BOUNDS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Rows sampled per result for the byte estimate.
+BYTES_SAMPLE_ROWS = 8
+
+
+class QueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+        self.started_at = datetime.now()
+
+    def record(self, method, elapsed, rows, approx_bytes, failed):
+        bucket = bisect_left(BUCKET_BOUNDS_MS, elapsed * 1000)
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    "calls": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                    "rows": 0, "approx_bytes": 0, "buckets": [0] * (len(BUCKET_BOUNDS_MS) + 1),
+                }
+            stats["calls"] += 1
+            stats["errors"] += failed
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            stats["rows"] += rows
+            stats["approx_bytes"] += approx_bytes
+            stats["buckets"][bucket] += 1
+
+    def snapshot(self):
+        """
+        Returns {method: stats} with, besides the raw counters, the average
+        and the p50/p95/p99 latency in milliseconds (upper bound of the
+        histogram bucket the percentile falls in) and the histogram as
+        {"<=<bound>ms": count}.
+        """
+        with self._lock:
+            methods = {name: dict(stats, buckets=list(stats["buckets"]))
+                       for name, stats in self._methods.items()}
+        for stats in methods.values():
+            buckets = stats.pop("buckets")
+            stats["avg_ms"] = stats["total_seconds"] * 1000 / stats["calls"]
+            for p in (50, 95, 99):
+                stats[f"p{p}_ms"] = _percentile_bound(buckets, p, stats["max_seconds"] * 1000)
+            stats["histogram"] = {
+                (f"<={bound}ms" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}ms"): count
+                for i, (bound, count) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), buckets)) if count
+            }
+        return methods
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self.started_at = datetime.now()
+
+    def dump(self, path=None):
+        """Returns the statistics as a JSON-serializable dict, also writing it to path if given."""
+        data = {
+            "pid": os.getpid(),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "dumped_at": datetime.now().isoformat(timespec="seconds"),
+            "bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+            "methods": self.snapshot(),
+        }
+        if path:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+        return data
+
+
+def _percentile_bound(buckets, p, max_ms):
+    total = sum(buckets)
+    target = total * p / 100
+    seen = 0
+    for bound, count in zip(BUCKET_BOUNDS_MS, buckets):
+        seen += count
+        if seen >= target:
+            return min(bound, max_ms)
+    return max_ms
+
+
+query_stats = QueryStats()
+
+# Per thread, the stack of calls in progress; note_error() marks the innermost.
+_local = threading.local()
+
+
+def note_error():
+    """Called by the backends' cursor helpers when a query raises."""
+    calls = getattr(_local, "calls", None)
+    if calls:
+        calls[-1]["failed"] = True
+
+
+def _begin():
+    calls = getattr(_local, "calls", None)
+    if calls is None:
+        calls = _local.calls = []
+    call = {"failed": False}
+    calls.append(call)
+    return call
+
+
+def _end(call):
+    _local.calls.pop()
+
+
+def _value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (datetime, date, int, float)):
+        return 8
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(v) for v in value)
+    return len(str(value))
+
+
+def measure_result(result):
+    """(rows, approx_bytes) for a query method's return value."""
+    if result is None or isinstance(result, bool):
+        return 0, 0
+    if isinstance(result, dict):
+        if "students" in result:  # fetch_report_data
+            result = result["students"]
+        else:                     # bulk_import_scores
+            return result.get("rows", 0), 0
+    elif isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], list):
+        result = result[0]        # (rows, next_after) pages
+    elif not isinstance(result, list):
+        result = [result]         # a single row or value
+    if not result:
+        return 0, 0
+    sample = result[:BYTES_SAMPLE_ROWS]
+    sample_bytes = sum(_value_size(row) if not isinstance(row, dict) else _value_size(list(row.values()))
+                       for row in sample)
+    return len(result), sample_bytes * len(result) // len(sample)
+
+
+def instrument(name, method):
+    """Wraps a query method so every call is recorded under name."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        call = _begin()
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException:
+            query_stats.record(name, time.perf_counter() - start, 0, 0, True)
+            raise
+        finally:
+            _end(call)
+        elapsed = time.perf_counter() - start
+        rows, approx_bytes = measure_result(result)
+        query_stats.record(name, elapsed, rows, approx_bytes, call["failed"])
+        return result
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_stream(name, method):
+    """
+    Wraps an iter_* method. Only the time spent producing chunks is
+    counted, not the time the caller spends between them.
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        chunks = method(*args, **kwargs)
+        elapsed = 0.0
+        rows = approx_bytes = 0
+        failed = False
+        try:
+            while True:
+                call = _begin()
+                start = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    elapsed += time.perf_counter() - start
+                    _end(call)
+                    failed = failed or call["failed"]
+                chunk_rows, chunk_bytes = measure_result(chunk)
+                rows += chunk_rows
+                approx_bytes += chunk_bytes
+                yield chunk
+        finally:
+            chunks.close()
+            query_stats.record(name, elapsed, rows, approx_bytes, failed)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+if os.environ.get("APT_DB_STATS_FILE"):
+    atexit.register(lambda: query_stats.dump(os.environ["APT_DB_STATS_FILE"]))
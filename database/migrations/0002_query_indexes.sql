@@ -0,0 +1,22 @@
+-- Indexes for the hot DBOperations queries.
+
+-- Per-student lookups: fetch_student_scores, fetch_all_semester_scores,
+-- fetch_subjects_for_semester and the score updates filter on
+-- (enrolment_id, semester); fetch_test_scores_for_subject also matches the
+-- case-normalized subject.
+CREATE INDEX IF NOT EXISTS student_scores_student_semester_subject_idx
+    ON student_scores (enrolment_id, semester, lower(subject));
+
+-- Class-wide reads for one semester or one subject:
+-- fetch_semester_scores_all_students, fetch_subject_roster and the
+-- min/max recomputation in maintain_score_summaries().
+CREATE INDEX IF NOT EXISTS student_scores_semester_subject_idx
+    ON student_scores (semester, subject);
+
+-- fetch_faculty_logs: newest entries first for one faculty member.
+CREATE INDEX IF NOT EXISTS faculty_logs_faculty_timestamp_idx
+    ON faculty_logs (faculty_id, timestamp DESC, log_id DESC);
+
+-- Students listed by current semester (batch reports, rosters).
+CREATE INDEX IF NOT EXISTS students_semester_idx
+    ON students (semester);
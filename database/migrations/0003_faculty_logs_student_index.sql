@@ -0,0 +1,4 @@
+-- fetch_faculty_logs_page filtered by student: one faculty member's edits
+-- to one student, newest first.
+CREATE INDEX IF NOT EXISTS faculty_logs_faculty_student_timestamp_idx
+    ON faculty_logs (faculty_id, enrolment_id, timestamp DESC, log_id DESC);
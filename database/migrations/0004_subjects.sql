@@ -0,0 +1,225 @@
+-- Subjects become a dimension table. student_scores and class_subject_summary
+-- refer to a subject by a SMALLINT subject_id instead of repeating its name
+-- on every row, and each subject's acronym is stored once instead of being
+-- derived from the name for every row of every request.
+
+-- Same rules as utils.input_validation.get_acronym; keep the two in step.
+CREATE OR REPLACE FUNCTION subject_acronym(subject_name TEXT) RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN strpos(upper(subject_name), 'JAVA-I') > 0 THEN 'JAVA-I'
+        WHEN subject_name ~ '\(.*?\)' THEN btrim(substring(subject_name FROM '\((.*?)\)'), E' \t\r\n')
+        ELSE upper(left(subject_name, 3))
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE TABLE IF NOT EXISTS subjects (
+    subject_id SMALLSERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    acronym VARCHAR(100) NOT NULL,
+    max_marks INT NOT NULL DEFAULT 100 CHECK (max_marks > 0)
+);
+
+-- Case-insensitive subject lookups (fetch_test_scores_for_subject).
+CREATE INDEX IF NOT EXISTS subjects_lower_name_idx ON subjects (lower(name));
+
+-- Returns the id of the named subject, adding it (with its derived acronym)
+-- if it is new. Used by inserts that only know the subject's name, e.g.
+--   INSERT INTO student_scores (enrolment_id, semester, subject_id, ...)
+--   VALUES ('23002171410016', 1, get_subject_id('Physics (PHY)'), ...);
+CREATE OR REPLACE FUNCTION get_subject_id(subject_name TEXT) RETURNS SMALLINT AS $$
+DECLARE
+    id SMALLINT;
+BEGIN
+    SELECT subject_id INTO id FROM subjects WHERE name = subject_name;
+    IF id IS NULL THEN
+        INSERT INTO subjects (name, acronym)
+        VALUES (subject_name, subject_acronym(subject_name))
+        ON CONFLICT (name) DO NOTHING
+        RETURNING subject_id INTO id;
+        IF id IS NULL THEN  -- added concurrently
+            SELECT subject_id INTO id FROM subjects WHERE name = subject_name;
+        END IF;
+    END IF;
+    RETURN id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- student_scores.subject -> subject_id. The summary triggers are dropped
+-- while the table is rewritten and the summaries rebuilt at the end.
+DROP TRIGGER IF EXISTS score_summaries_insert ON student_scores;
+DROP TRIGGER IF EXISTS score_summaries_update ON student_scores;
+DROP TRIGGER IF EXISTS score_summaries_delete ON student_scores;
+
+INSERT INTO subjects (name, acronym)
+SELECT DISTINCT subject, subject_acronym(subject)
+FROM student_scores
+ORDER BY subject
+ON CONFLICT (name) DO NOTHING;
+
+ALTER TABLE student_scores ADD COLUMN subject_id SMALLINT REFERENCES subjects(subject_id);
+UPDATE student_scores sc
+SET subject_id = sub.subject_id
+FROM subjects sub
+WHERE sub.name = sc.subject;
+ALTER TABLE student_scores ALTER COLUMN subject_id SET NOT NULL;
+
+DROP INDEX IF EXISTS student_scores_student_semester_subject_idx;
+DROP INDEX IF EXISTS student_scores_semester_subject_idx;
+ALTER TABLE student_scores DROP COLUMN subject;
+
+CREATE INDEX IF NOT EXISTS student_scores_student_semester_subject_idx
+    ON student_scores (enrolment_id, semester, subject_id);
+CREATE INDEX IF NOT EXISTS student_scores_semester_subject_idx
+    ON student_scores (semester, subject_id);
+
+DROP TABLE class_subject_summary;
+CREATE TABLE class_subject_summary (
+    semester INT,
+    subject_id SMALLINT REFERENCES subjects(subject_id),
+    row_count INT NOT NULL DEFAULT 0,
+    score_count INT NOT NULL DEFAULT 0,
+    score_sum BIGINT NOT NULL DEFAULT 0,
+    score_sumsq BIGINT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    PRIMARY KEY (semester, subject_id)
+);
+
+-- The summary functions from db_init.sql, keyed by subject_id.
+CREATE OR REPLACE FUNCTION rebuild_score_summaries() RETURNS void AS $$
+BEGIN
+    DELETE FROM student_semester_summary;
+    DELETE FROM class_subject_summary;
+
+    INSERT INTO student_semester_summary
+        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT enrolment_id, semester, COUNT(*), COUNT(total_score), COALESCE(SUM(total_score), 0),
+           COALESCE(SUM(total_score::bigint * total_score), 0), MIN(total_score), MAX(total_score)
+    FROM student_scores
+    GROUP BY enrolment_id, semester;
+
+    INSERT INTO class_subject_summary
+        (semester, subject_id, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT semester, subject_id, COUNT(*), COUNT(total_score), COALESCE(SUM(total_score), 0),
+           COALESCE(SUM(total_score::bigint * total_score), 0), MIN(total_score), MAX(total_score)
+    FROM student_scores
+    GROUP BY semester, subject_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_score_summaries() RETURNS trigger AS $$
+DECLARE
+    ids TEXT[] := '{}';
+    sems INT[] := '{}';
+    subject_ids SMALLINT[] := '{}';
+    totals INT[] := '{}';
+    signs INT[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT ids || array_agg(enrolment_id), sems || array_agg(semester),
+               subject_ids || array_agg(subject_id), totals || array_agg(total_score), signs || array_agg(1)
+        INTO ids, sems, subject_ids, totals, signs
+        FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT ids || array_agg(enrolment_id), sems || array_agg(semester),
+               subject_ids || array_agg(subject_id), totals || array_agg(total_score), signs || array_agg(-1)
+        INTO ids, sems, subject_ids, totals, signs
+        FROM old_rows;
+    END IF;
+    IF ids IS NULL OR cardinality(ids) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    -- Per student and semester
+    INSERT INTO student_semester_summary AS s
+        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT c.enrolment_id, c.semester,
+           SUM(c.sign),
+           COALESCE(SUM(c.sign) FILTER (WHERE c.total_score IS NOT NULL), 0),
+           COALESCE(SUM(c.sign * c.total_score), 0),
+           COALESCE(SUM(c.sign * c.total_score::bigint * c.total_score), 0),
+           MIN(c.total_score) FILTER (WHERE c.sign = 1),
+           MAX(c.total_score) FILTER (WHERE c.sign = 1)
+    FROM unnest(ids, sems, totals, signs) AS c(enrolment_id, semester, total_score, sign)
+    GROUP BY c.enrolment_id, c.semester
+    ON CONFLICT (enrolment_id, semester) DO UPDATE SET
+        row_count = s.row_count + EXCLUDED.row_count,
+        score_count = s.score_count + EXCLUDED.score_count,
+        score_sum = s.score_sum + EXCLUDED.score_sum,
+        score_sumsq = s.score_sumsq + EXCLUDED.score_sumsq,
+        score_min = LEAST(s.score_min, EXCLUDED.score_min),
+        score_max = GREATEST(s.score_max, EXCLUDED.score_max);
+
+    UPDATE student_semester_summary s
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.enrolment_id = s.enrolment_id AND sc.semester = s.semester
+    )
+    FROM (
+        SELECT DISTINCT c.enrolment_id, c.semester, c.total_score
+        FROM unnest(ids, sems, totals, signs) AS c(enrolment_id, semester, total_score, sign)
+        WHERE c.sign = -1 AND c.total_score IS NOT NULL
+    ) removed
+    WHERE s.enrolment_id = removed.enrolment_id AND s.semester = removed.semester
+      AND (removed.total_score <= s.score_min OR removed.total_score >= s.score_max);
+
+    DELETE FROM student_semester_summary WHERE row_count <= 0;
+
+    -- Per semester and subject (class-wide)
+    INSERT INTO class_subject_summary AS s
+        (semester, subject_id, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT c.semester, c.subject_id,
+           SUM(c.sign),
+           COALESCE(SUM(c.sign) FILTER (WHERE c.total_score IS NOT NULL), 0),
+           COALESCE(SUM(c.sign * c.total_score), 0),
+           COALESCE(SUM(c.sign * c.total_score::bigint * c.total_score), 0),
+           MIN(c.total_score) FILTER (WHERE c.sign = 1),
+           MAX(c.total_score) FILTER (WHERE c.sign = 1)
+    FROM unnest(sems, subject_ids, totals, signs) AS c(semester, subject_id, total_score, sign)
+    GROUP BY c.semester, c.subject_id
+    ON CONFLICT (semester, subject_id) DO UPDATE SET
+        row_count = s.row_count + EXCLUDED.row_count,
+        score_count = s.score_count + EXCLUDED.score_count,
+        score_sum = s.score_sum + EXCLUDED.score_sum,
+        score_sumsq = s.score_sumsq + EXCLUDED.score_sumsq,
+        score_min = LEAST(s.score_min, EXCLUDED.score_min),
+        score_max = GREATEST(s.score_max, EXCLUDED.score_max);
+
+    UPDATE class_subject_summary s
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.semester = s.semester AND sc.subject_id = s.subject_id
+    )
+    FROM (
+        SELECT DISTINCT c.semester, c.subject_id, c.total_score
+        FROM unnest(sems, subject_ids, totals, signs) AS c(semester, subject_id, total_score, sign)
+        WHERE c.sign = -1 AND c.total_score IS NOT NULL
+    ) removed
+    WHERE s.semester = removed.semester AND s.subject_id = removed.subject_id
+      AND (removed.total_score <= s.score_min OR removed.total_score >= s.score_max);
+
+    DELETE FROM class_subject_summary WHERE row_count <= 0;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER score_summaries_insert
+    AFTER INSERT ON student_scores
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_score_summaries();
+
+CREATE TRIGGER score_summaries_update
+    AFTER UPDATE ON student_scores
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_score_summaries();
+
+CREATE TRIGGER score_summaries_delete
+    AFTER DELETE ON student_scores
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_score_summaries();
+
+SELECT rebuild_score_summaries();
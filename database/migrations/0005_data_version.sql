@@ -0,0 +1,38 @@
+-- A version number that moves on every statement that changes students,
+-- student_scores or subjects, so readers such as the HTTP API
+-- (api/server.py) can tell whether anything they cached may be stale
+-- without re-running their queries.
+--
+-- It is a sequence rather than a counter row: nextval() holds no lock until
+-- commit, so concurrent writers never wait for each other. Sequence values
+-- are handed out when a statement runs, not when it commits, so a new value
+-- can be visible before its change is. Each writing transaction therefore
+-- also sends a notification on the apt_data_version channel, which is only
+-- delivered when it commits; a reader that caches LISTENs and takes a fresh
+-- value after each notification.
+
+CREATE SEQUENCE IF NOT EXISTS data_version_seq;
+
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM nextval('data_version_seq');
+    -- Same payload every time, so a transaction sends one notification.
+    PERFORM pg_notify('apt_data_version', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS data_version_scores ON student_scores;
+CREATE TRIGGER data_version_scores
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON student_scores
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+
+DROP TRIGGER IF EXISTS data_version_students ON students;
+CREATE TRIGGER data_version_students
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON students
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+
+DROP TRIGGER IF EXISTS data_version_subjects ON subjects;
+CREATE TRIGGER data_version_subjects
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON subjects
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
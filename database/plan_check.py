@@ -0,0 +1,259 @@
+"""
+Query-plan check for DBOperations.
+
+Seeds a large synthetic cohort inside a transaction, runs every
+DBOperations query method against it with each statement EXPLAINed first,
+and fails if any plan uses a sequential scan on a permanent table that
+the method is not expected to read in full (whole-table exports, the
+all-students overview, the per-subject summary). Everything happens in
+one transaction that is rolled back, so it is safe to run against a
+development database; the schema should be at the latest migration
+(`python -m database.schema upgrade`).
+
+Usage (from the project root):
+    python -m database.plan_check --students 20000
+"""
+import argparse
+import io
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+import psycopg2.extensions
+from database.db_operations import DBOperations, get_connection
+from database.schema import current_version, MIGRATIONS
+
+# Scanning subjects, a small dimension table, is always fine.
+PERMANENT_TABLES = {
+    "students", "faculty", "student_scores", "faculty_logs",
+    "student_semester_summary", "class_subject_summary",
+}
+
+# Methods that are meant to read these tables in full.
+ALLOWED_SEQ_SCANS = {
+    "fetch_all_scores": {"student_scores"},
+    "fetch_all_student_scores": {"student_scores"},
+    "iter_all_student_scores": {"student_scores"},
+    "fetch_all_students": {"students"},
+    "fetch_student_overall_averages": {"students", "student_semester_summary"},
+    "fetch_class_subject_summary": {"class_subject_summary"},
+    "fetch_semester_subjects": {"class_subject_summary"},
+    # Joins a whole class roster to students; with every seeded student in
+    # the class a hash join over students is the cheapest plan.
+    "fetch_subject_roster": {"students"},
+}
+
+SUBJECTS = {
+    1: ["Software Engineering (SE)", "Physics (PHY)", "MATHS I (MATHS-I)", "JAVA-I"],
+    2: ["Data Structures (DS)", "Digital Electronics (DE)", "MATHS II (MATHS-II)", "JAVA-II"],
+    3: ["Operating Systems (OS)", "Database Management Systems (DBMS)",
+        "Computer Networks (CN)", "Probability Theory (IPT)"],
+}
+
+# EXECUTE covers the prepared hot lookups (db_operations.PREPARED_QUERIES).
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "EXECUTE")
+
+
+class PlanRecorder:
+    def __init__(self):
+        self.method = None
+        self.plans = []   # (method, statement, seq-scanned tables)
+        self.errors = []  # (method, error)
+
+    def explain(self, conn, query, params):
+        if not query.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        with psycopg2.extensions.cursor(conn) as cur:
+            cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+            plan = cur.fetchone()[0][0]["Plan"]
+        self.plans.append((self.method, " ".join(query.split()), seq_scanned_tables(plan)))
+
+
+def seq_scanned_tables(plan):
+    """Returns the permanent tables read by Seq Scan nodes anywhere in an EXPLAIN JSON plan."""
+    tables = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in PERMANENT_TABLES:
+            tables.add(node["Relation Name"])
+        stack.extend(node.get("Plans", []))
+    return tables
+
+
+_recorder = PlanRecorder()
+
+
+class ExplainingCursor(psycopg2.extensions.cursor):
+    """Cursor that EXPLAINs every statement before running it."""
+
+    def execute(self, query, vars=None):
+        _recorder.explain(self.connection, query, vars)
+        try:
+            return super().execute(query, vars)
+        except Exception as e:
+            _recorder.errors.append((_recorder.method, str(e).strip()))
+            raise
+
+
+class _UncommittedConnection:
+    """Wraps the check's connection so DBOperations cannot commit the seed data."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return self._conn.cursor(*args, cursor_factory=ExplainingCursor, **kwargs)
+
+    def commit(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _SingleConnectionPool:
+    def __init__(self, conn):
+        self._conn = _UncommittedConnection(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        yield self._conn
+
+
+def seed(cur, students):
+    """Inserts a synthetic cohort: students, 1 faculty per 10 students, scores and audit logs."""
+    cur.execute("""
+        INSERT INTO students (enrolment_id, fullname, password, semester)
+        SELECT 'P' || lpad(i::text, 13, '0'), 'Plan Check ' || i, 'x', 1 + i %% 3
+        FROM generate_series(1, %s) AS i
+    """, (students,))
+    cur.execute("""
+        INSERT INTO faculty (faculty_id, name, password)
+        SELECT 'PF' || lpad(i::text, 8, '0'), 'Plan Faculty ' || i, 'x'
+        FROM generate_series(1, GREATEST(%s / 10, 1)) AS i
+    """, (students,))
+    subjects = [(sem, subject) for sem, names in SUBJECTS.items() for subject in names]
+    cur.execute("""
+        WITH s AS MATERIALIZED (
+            SELECT semester, get_subject_id(subject) AS subject_id
+            FROM unnest(%s::int[], %s::text[]) AS u(semester, subject)
+        )
+        INSERT INTO student_scores (enrolment_id, semester, subject_id, T1, T2, T3, T4, total_score)
+        SELECT 'P' || lpad(i::text, 13, '0'), s.semester, s.subject_id, t.t1, t.t2, t.t3, t.t4,
+               t.t1 + t.t2 + t.t3 + t.t4
+        FROM generate_series(1, %s) AS i
+        CROSS JOIN s
+        CROSS JOIN LATERAL (
+            SELECT (i * 7 + s.semester) %% 26 AS t1, (i * 11) %% 26 AS t2,
+                   (i * 13 + 5) %% 26 AS t3, (i * 17 + 3) %% 26 AS t4
+        ) t
+    """, ([s[0] for s in subjects], [s[1] for s in subjects], students))
+    cur.execute("""
+        INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value, timestamp)
+        SELECT 'PF' || lpad((1 + i %% GREATEST(%s / 10, 1))::text, 8, '0'),
+               'P' || lpad((1 + i %% %s)::text, 13, '0'),
+               'Updated Data Structures (DS) T1: 10 -> 12', '10', '12',
+               TIMESTAMP '2024-01-01' + i * INTERVAL '1 minute'
+        FROM generate_series(1, %s * 5) AS i
+    """, (students, students, students))
+    for table in PERMANENT_TABLES | {"subjects"}:
+        cur.execute(f"ANALYZE {table}")
+
+
+def method_calls(students):
+    """(method name, args) for every DBOperations query method."""
+    enrolment_id = "P" + str(students // 2).rjust(13, "0")
+    faculty_id = "PF" + "1".rjust(8, "0")
+    subject = SUBJECTS[2][0]
+    csv_file = io.StringIO(
+        "enrolment_id,semester,subject,T1,T2,T3,T4\n"
+        f"{enrolment_id},2,{subject},10,11,12,13\n"
+    )
+    return [
+        ("fetch_student_by_enrolment", (enrolment_id,)),
+        ("fetch_faculty_password", (faculty_id,)),
+        ("update_student_score", (enrolment_id, subject, 50)),
+        ("fetch_student_scores", (enrolment_id, 2)),
+        ("fetch_all_semester_scores", (enrolment_id,)),
+        ("fetch_semester_scores_all_students", (2,)),
+        ("fetch_test_scores_for_subject", (enrolment_id, 2, subject.upper())),
+        ("fetch_subjects_for_semester", (enrolment_id, 2)),
+        ("fetch_all_scores", ()),
+        ("fetch_all_students", ()),
+        ("fetch_student_overall_averages", (40, 60)),
+        ("fetch_all_student_scores", ()),
+        ("iter_all_student_scores", ()),
+        ("fetch_student_semester_summary", (enrolment_id,)),
+        ("fetch_class_subject_summary", (2,)),
+        ("fetch_faculty_logs", (faculty_id,)),
+        ("fetch_faculty_logs_page", (faculty_id, 20)),
+        ("fetch_faculty_logs_page", (faculty_id, 20, (datetime(2024, 1, 5), 10**9), enrolment_id)),
+        ("fetch_faculty_logs_page", (faculty_id, 20, None, None, datetime(2024, 1, 2), datetime(2024, 1, 9), "DS")),
+        ("update_student_test_score", (enrolment_id, 2, subject, "T1", 20)),
+        ("apply_score_edits", (faculty_id, [(enrolment_id, 2, subject, "T2", 21)])),
+        ("fetch_subject_roster", (2, subject)),
+        ("fetch_semester_subjects", (2,)),
+        ("fetch_subjects", ()),
+        ("fetch_data_version", ()),
+        ("insert_faculty_log", (faculty_id, enrolment_id, "Plan check", "1", "2")),
+        ("bulk_import_scores", (csv_file,)),
+    ]
+
+
+def run_plan_check(conn, students=20000):
+    """
+    Seeds `students` synthetic students on conn, runs every method and
+    rolls everything back. Returns (violations, recorder) where violations
+    is a list of (method, table, statement).
+    """
+    _recorder.__init__()
+    db = DBOperations(pool=_SingleConnectionPool(conn))
+    try:
+        with conn.cursor() as cur:
+            seed(cur, students)
+            for name, args in method_calls(students):
+                _recorder.method = name
+                cur.execute("SAVEPOINT plan_check")
+                result = getattr(db, name)(*args)
+                if name.startswith("iter_"):
+                    for _ in result:
+                        pass
+                cur.execute("ROLLBACK TO SAVEPOINT plan_check")
+    finally:
+        conn.rollback()
+
+    violations = []
+    for method, statement, tables in _recorder.plans:
+        for table in sorted(tables - ALLOWED_SEQ_SCANS.get(method, set())):
+            violations.append((method, table, statement))
+    return violations, _recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20000, help="synthetic students to seed")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        version = current_version(conn)
+        if version < MIGRATIONS[-1][0]:
+            print(f"warning: schema is at version {version}; run `python -m database.schema upgrade` first")
+        violations, recorder = run_plan_check(conn, args.students)
+    finally:
+        conn.close()
+
+    print(f"Checked {len(recorder.plans)} statements from "
+          f"{len({p[0] for p in recorder.plans})} methods on {args.students} seeded students")
+    for method, error in recorder.errors:
+        print(f"ERROR  {method}: {error}")
+    for method, table, statement in violations:
+        print(f"FAIL   {method}: sequential scan on {table}\n       {statement[:160]}")
+    if violations or recorder.errors:
+        sys.exit(1)
+    print("OK: no unexpected sequential scans")
+
+
+if __name__ == "__main__":
+    main()
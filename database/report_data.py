@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ReportBundle:
+    """Everything needed to build one student's PDF report."""
+    enrolment_id: str
+    fullname: str
+    semester: int
+    # (semester, subject, T1, T2, T3, T4, total_score), ordered by semester and subject
+    scores: list = field(default_factory=list)
+    # {semester: [(enrolment_id, subject, total_score), ...]} for every semester
+    # the student has scores in; shared between the bundles of one load
+    class_scores: dict = field(default_factory=dict)
+
+    @property
+    def student(self):
+        """The (enrolment_id, fullname, semester) record build_student_report expects."""
+        return (self.enrolment_id, self.fullname, self.semester)
+
+    @property
+    def semesters(self):
+        return sorted({row[0] for row in self.scores})
+
+
+def load_report_bundles(db, enrolment_ids=None, semester=None):
+    """
+    Loads report data for many students in one query (db.fetch_report_data).
+    Select students by a list of enrolment IDs, by current semester, or
+    (with neither) all students.
+    Returns (bundles, class_scores): bundles maps enrolment_id -> ReportBundle
+    for the students that exist, and class_scores is the shared
+    {semester: rows} dict referenced by every bundle. Returns ({}, {}) on error.
+    """
+    data = db.fetch_report_data(enrolment_ids, semester)
+    if data is None:
+        return {}, {}
+
+    class_scores = {
+        int(sem): [tuple(row) for row in rows]
+        for sem, rows in data["class_scores"].items()
+    }
+    bundles = {}
+    for s in data["students"]:
+        bundles[s["enrolment_id"]] = ReportBundle(
+            enrolment_id=s["enrolment_id"],
+            fullname=s["fullname"],
+            semester=s["semester"],
+            scores=[tuple(row) for row in s["scores"]],
+            class_scores=class_scores,
+        )
+    return bundles, class_scores
+
+
+def load_report_bundle(db, enrolment_id):
+    """Loads one student's ReportBundle in a single query, or returns None if the student does not exist."""
+    bundles, _ = load_report_bundles(db, enrolment_ids=[enrolment_id])
+    return bundles.get(enrolment_id)
@@ -0,0 +1,121 @@
+"""
+Versioned schema migrations.
+
+Each migration is a SQL file applied once, in order, inside its own
+transaction; applied versions are recorded in the schema_version table.
+Version 1 is database/db_init.sql, which only uses IF NOT EXISTS / OR
+REPLACE statements, so databases created by hand from it can be brought
+under version control by simply running the upgrade.
+
+Usage (from the project root):
+    python -m database.schema status
+    python -m database.schema upgrade [--target N]
+"""
+import argparse
+import os
+
+from psycopg2 import Error
+from database.db_operations import get_connection
+from utils.error_handling import log_error
+
+DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (version, description, path relative to database/)
+MIGRATIONS = [
+    (1, "initial schema and score summaries", "db_init.sql"),
+    (2, "indexes for hot queries", "migrations/0002_query_indexes.sql"),
+    (3, "faculty log index for per-student audit pages", "migrations/0003_faculty_logs_student_index.sql"),
+    (4, "subjects table; student_scores refers to subjects by id", "migrations/0004_subjects.sql"),
+    (5, "data version counter for cache validation", "migrations/0005_data_version.sql"),
+]
+
+# Serializes concurrent upgrades of the same database.
+MIGRATION_LOCK_ID = 74_121_001
+
+
+def ensure_version_table(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    conn.commit()
+
+
+def applied_versions(conn):
+    """Returns the set of migration versions already applied to the database."""
+    ensure_version_table(conn)
+    with conn.cursor() as cur:
+        cur.execute("SELECT version FROM schema_version")
+        versions = {row[0] for row in cur.fetchall()}
+    conn.commit()
+    return versions
+
+
+def current_version(conn):
+    return max(applied_versions(conn), default=0)
+
+
+def pending_migrations(conn, target=None):
+    applied = applied_versions(conn)
+    return [m for m in MIGRATIONS
+            if m[0] not in applied and (target is None or m[0] <= target)]
+
+
+def migrate(conn, target=None):
+    """
+    Applies every pending migration up to target (default: the latest),
+    each in its own transaction. Returns the list of versions applied.
+    Raises on failure after rolling back the failing migration.
+    """
+    applied = []
+    for version, description, path in pending_migrations(conn, target):
+        with open(os.path.join(DATABASE_DIR, path)) as f:
+            sql = f.read()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+                # Another process may have applied it while we waited for the lock.
+                cur.execute("SELECT 1 FROM schema_version WHERE version = %s", (version,))
+                if cur.fetchone() is None:
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                        (version, description)
+                    )
+                    applied.append(version)
+            conn.commit()
+        except Error as e:
+            conn.rollback()
+            log_error(f"Migration {version} ({description}) failed", e)
+            raise
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["status", "upgrade"])
+    parser.add_argument("--target", type=int, help="upgrade only up to this version")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.command == "status":
+            applied = applied_versions(conn)
+            for version, description, _ in MIGRATIONS:
+                state = "applied" if version in applied else "pending"
+                print(f"{version:4d}  {state:8s}  {description}")
+        else:
+            versions = migrate(conn, target=args.target)
+            if versions:
+                print(f"Applied migrations: {', '.join(map(str, versions))}")
+            print(f"Schema is at version {current_version(conn)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
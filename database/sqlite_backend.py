@@ -0,0 +1,822 @@
+"""
+Embedded SQLite storage backend.
+
+SQLiteOperations implements the same StorageBackend interface as the
+PostgreSQL DBOperations, over the same schema (database/sqlite_init.sql),
+so the CLI, analytics and reports run unchanged against a local database
+file or an in-memory one. Select it with APT_DB_BACKEND=sqlite (see
+database/backend.py).
+
+A snapshot of the PostgreSQL database can be copied into a file for
+offline analysis:
+    python -m database.sqlite_backend snapshot academic.sqlite3
+    APT_DB_BACKEND=sqlite APT_SQLITE_PATH=academic.sqlite3 python main.py trends
+"""
+import argparse
+import csv
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+
+from database.backend import StorageBackend
+from database.instrumentation import note_error
+from utils.error_handling import log_error
+from utils.input_validation import get_acronym
+
+TEST_FIELDS = ('T1', 'T2', 'T3', 'T4')
+STREAM_ITERSIZE = int(os.environ.get("APT_DB_ITERSIZE", "5000"))
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "sqlite_init.sql")
+
+# Timestamps are stored as fixed-width ISO 8601 text (always six fractional
+# digits, so text order is time order) and read back as datetime, matching
+# what psycopg2 returns for PostgreSQL TIMESTAMP columns.
+sqlite3.register_adapter(datetime, lambda value: value.strftime("%Y-%m-%d %H:%M:%S.%f"))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+_NUMBER = re.compile(r"^\s*-?[0-9]+(\.[0-9]+)?\s*$")
+_SEMESTER = re.compile(r"^\s*[1-3]\s*$")
+
+
+class SQLiteOperations(StorageBackend):
+    def __init__(self, path=":memory:"):
+        """
+        Opens (creating if needed) the SQLite database at path, or a private
+        in-memory database for ":memory:". One connection is shared by all
+        threads; each query or transaction holds it exclusively.
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                    check_same_thread=False, isolation_level=None)
+        self.conn.create_function("sqrt", 1, math.sqrt, deterministic=True)
+        self.conn.create_function("subject_acronym", 1, get_acronym, deterministic=True)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self._lock = threading.RLock()
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """
+        Creates any missing table, index or trigger of sqlite_init.sql.
+        A database from before the subjects table (subject names stored on
+        every student_scores row) is converted first.
+        """
+        with open(SCHEMA_FILE) as f:
+            script = f.read()
+        with self._lock:
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(student_scores)")}
+            if "subject" in columns:
+                script = _SUBJECT_IDS_UPGRADE.format(schema=script)
+            self.conn.executescript(script)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @contextmanager
+    def cursor(self):
+        """
+        Yields a cursor inside a transaction on the shared connection.
+        Commits when the block succeeds and rolls back if it raises.
+        """
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                yield cur
+            except BaseException as e:
+                cur.execute("ROLLBACK")
+                if isinstance(e, Exception):
+                    note_error()
+                raise
+            else:
+                cur.execute("COMMIT")
+            finally:
+                cur.close()
+
+    def _stream(self, query, params=(), itersize=None):
+        """
+        Yields lists of at most itersize rows. The connection is only held
+        while a chunk is being read, so the caller may run other queries
+        between chunks.
+        """
+        itersize = itersize or STREAM_ITERSIZE
+        try:
+            with self._lock:
+                cur = self.conn.execute(query, params)
+            try:
+                while True:
+                    with self._lock:
+                        rows = cur.fetchmany(itersize)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cur.close()
+        except sqlite3.Error:
+            note_error()
+            raise
+
+    def fetch_student_by_enrolment(self, enrolment_id):
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT * FROM students WHERE enrolment_id = ?", (enrolment_id,))
+                return cur.fetchone()
+        except sqlite3.Error as e:
+            log_error("Error fetching student", e)
+            return None
+
+    def fetch_faculty_password(self, faculty_id):
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT password FROM faculty WHERE faculty_id = ?", (faculty_id,))
+                row = cur.fetchone()
+                return row[0] if row else None
+        except sqlite3.Error as e:
+            log_error("Error fetching faculty credentials", e)
+            return None
+
+    def update_student_score(self, enrolment_id, subject, new_total_score):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    UPDATE student_scores
+                    SET total_score = ?
+                    WHERE enrolment_id = ? AND subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                """, (new_total_score, enrolment_id, subject))
+                return True
+        except sqlite3.Error as e:
+            log_error("Error updating student score", e)
+            return False
+
+    def fetch_student_scores(self, enrolment_id, semester):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.enrolment_id = ? AND sc.semester = ?
+                """, (enrolment_id, semester))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching student scores", e)
+            return []
+
+    def fetch_all_semester_scores(self, enrolment_id):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sc.semester, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.enrolment_id = ?
+                    ORDER BY sc.semester, sub.name
+                """, (enrolment_id,))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching all semester scores", e)
+            return []
+
+    def fetch_semester_scores_all_students(self, semester):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sc.enrolment_id, sub.name, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.semester = ?
+                    ORDER BY sub.name
+                """, (semester,))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching semester scores for all students", e)
+            return []
+
+    def fetch_test_scores_for_subject(self, enrolment_id, semester, subject):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sc.T1, sc.T2, sc.T3, sc.T4
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.enrolment_id = ?
+                      AND sc.semester = ?
+                      AND lower(sub.name) = lower(?)
+                    LIMIT 1
+                """, (enrolment_id, semester, subject))
+                return cur.fetchone()
+        except sqlite3.Error as e:
+            log_error("Error fetching test scores for subject", e)
+            return None
+
+    def fetch_subjects_for_semester(self, enrolment_id, semester):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT sub.name
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.enrolment_id = ? AND sc.semester = ?
+                    ORDER BY sub.name
+                """, (enrolment_id, semester))
+                return [row[0] for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            log_error("Error fetching subjects for semester", e)
+            return []
+
+    def fetch_all_scores(self):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sc.enrolment_id, sc.semester, sub.name, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    ORDER BY sub.name
+                """)
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching all scores", e)
+            return []
+
+    def fetch_all_students(self):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT enrolment_id, fullname, semester
+                    FROM students
+                    ORDER BY enrolment_id
+                """)
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching students", e)
+            return []
+
+    def fetch_student_overall_averages(self, min_avg=None, max_avg=None, scored_only=False):
+        having = []
+        params = []
+        overall_avg = "CAST(SUM(ss.score_sum) AS REAL) / NULLIF(SUM(ss.score_count), 0)"
+        if scored_only:
+            having.append("SUM(ss.score_count) > 0")
+        if min_avg is not None:
+            having.append(f"{overall_avg} >= ?")
+            params.append(min_avg)
+        if max_avg is not None:
+            having.append(f"{overall_avg} <= ?")
+            params.append(max_avg)
+        having_clause = f"HAVING {' AND '.join(having)}" if having else ""
+        try:
+            with self.cursor() as cur:
+                cur.execute(f"""
+                    SELECT s.enrolment_id, s.fullname, s.semester,
+                           {overall_avg} AS overall_avg,
+                           COALESCE(SUM(ss.score_count), 0) AS row_count
+                    FROM students s
+                    LEFT JOIN student_semester_summary ss ON ss.enrolment_id = s.enrolment_id
+                    GROUP BY s.enrolment_id, s.fullname, s.semester
+                    {having_clause}
+                    ORDER BY s.enrolment_id
+                """, params)
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching overall averages", e)
+            return []
+
+    def fetch_all_student_scores(self):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sc.enrolment_id, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score, sc.semester
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    ORDER BY sc.semester, sc.enrolment_id
+                """)
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching all student scores", e)
+            return []
+
+    def iter_all_student_scores(self, itersize=None):
+        try:
+            yield from self._stream("""
+                SELECT sc.enrolment_id, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score, sc.semester
+                FROM student_scores sc
+                JOIN subjects sub USING (subject_id)
+                ORDER BY sc.semester, sc.enrolment_id
+            """, itersize=itersize)
+        except sqlite3.Error as e:
+            log_error("Error streaming student scores", e)
+
+    def fetch_student_semester_summary(self, enrolment_id):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT semester, score_count, score_sum,
+                           CAST(score_sum AS REAL) / NULLIF(score_count, 0) AS avg_score,
+                           score_min, score_max
+                    FROM student_semester_summary
+                    WHERE enrolment_id = ?
+                    ORDER BY semester
+                """, (enrolment_id,))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching student semester summary", e)
+            return []
+
+    def fetch_class_subject_summary(self, semester=None):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT cs.semester, sub.name, cs.score_count, cs.score_sum,
+                           CAST(cs.score_sum AS REAL) / NULLIF(cs.score_count, 0) AS avg_score,
+                           cs.score_min, cs.score_max,
+                           sqrt(max(CAST(cs.score_sumsq AS REAL) / NULLIF(cs.score_count, 0)
+                                    - (CAST(cs.score_sum AS REAL) / NULLIF(cs.score_count, 0))
+                                      * (CAST(cs.score_sum AS REAL) / NULLIF(cs.score_count, 0)), 0)) AS stddev_score
+                    FROM class_subject_summary cs
+                    JOIN subjects sub USING (subject_id)
+                    WHERE ? IS NULL OR cs.semester = ?
+                    ORDER BY cs.semester, sub.name
+                """, (semester, semester))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching class subject summary", e)
+            return []
+
+    def rebuild_score_summaries(self):
+        try:
+            with self.cursor() as cur:
+                cur.execute("DELETE FROM student_semester_summary")
+                cur.execute("DELETE FROM class_subject_summary")
+                cur.execute("""
+                    INSERT INTO student_semester_summary
+                        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+                    SELECT enrolment_id, semester, COUNT(*), COUNT(total_score), COALESCE(SUM(total_score), 0),
+                           COALESCE(SUM(total_score * total_score), 0), MIN(total_score), MAX(total_score)
+                    FROM student_scores
+                    GROUP BY enrolment_id, semester
+                """)
+                cur.execute("""
+                    INSERT INTO class_subject_summary
+                        (semester, subject_id, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+                    SELECT semester, subject_id, COUNT(*), COUNT(total_score), COALESCE(SUM(total_score), 0),
+                           COALESCE(SUM(total_score * total_score), 0), MIN(total_score), MAX(total_score)
+                    FROM student_scores
+                    GROUP BY semester, subject_id
+                """)
+                return True
+        except sqlite3.Error as e:
+            log_error("Error rebuilding score summaries", e)
+            return False
+
+    def fetch_faculty_logs(self, faculty_id):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp
+                    FROM faculty_logs
+                    WHERE faculty_id = ?
+                    ORDER BY timestamp DESC
+                """, (faculty_id,))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching faculty logs", e)
+            return []
+
+    def fetch_faculty_logs_page(self, faculty_id, page_size=20, after=None, enrolment_id=None,
+                                date_from=None, date_to=None, action=None):
+        conditions = ["faculty_id = ?"]
+        params = [faculty_id]
+        if enrolment_id:
+            conditions.append("enrolment_id = ?")
+            params.append(enrolment_id)
+        if date_from is not None:
+            conditions.append("timestamp >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("timestamp < ?")
+            params.append(date_to)
+        if action:
+            # LIKE is case-insensitive for ASCII in SQLite, like ILIKE.
+            conditions.append("action LIKE ?")
+            params.append(f"%{action}%")
+        if after is not None:
+            conditions.append("(timestamp, log_id) < (?, ?)")
+            params.extend(after)
+        params.append(page_size + 1)
+        try:
+            with self.cursor() as cur:
+                cur.execute(f"""
+                    SELECT log_id, faculty_id, enrolment_id, action, old_value, new_value, timestamp
+                    FROM faculty_logs
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY timestamp DESC, log_id DESC
+                    LIMIT ?
+                """, params)
+                rows = cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching faculty log page", e)
+            return [], None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            return rows, (rows[-1][6], rows[-1][0])
+        return rows, None
+
+    def update_student_test_score(self, enrolment_id, semester, subject, test_field, new_value):
+        if test_field not in TEST_FIELDS:
+            return None
+        new_tests = " + ".join("?" if f == test_field else f for f in TEST_FIELDS)
+        try:
+            with self.cursor() as cur:
+                cur.execute(f"""
+                    SELECT {test_field} FROM student_scores
+                    WHERE enrolment_id = ? AND semester = ? AND subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                """, (enrolment_id, semester, subject))
+                old = cur.fetchone()
+                if old is None:
+                    return None
+                cur.execute(f"""
+                    UPDATE student_scores
+                    SET {test_field} = ?, total_score = {new_tests}
+                    WHERE enrolment_id = ? AND semester = ? AND subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                """, (new_value, new_value, enrolment_id, semester, subject))
+                cur.execute("""
+                    SELECT total_score FROM student_scores
+                    WHERE enrolment_id = ? AND semester = ? AND subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                """, (enrolment_id, semester, subject))
+                return (old[0], cur.fetchone()[0])
+        except sqlite3.Error as e:
+            log_error("Error updating test score", e)
+            return None
+
+    def apply_score_edits(self, faculty_id, edits, action_prefix="Updated"):
+        rows = {}  # (enrolment_id, semester, subject) -> {test_field: value}
+        for enrolment_id, semester, subject, test_field, value in edits:
+            if test_field not in TEST_FIELDS or value is None or not 0 <= value <= 25:
+                log_error("Invalid score edit", f"{enrolment_id} {subject} {test_field}={value}")
+                return None
+            rows.setdefault((enrolment_id, semester, subject), {})[test_field] = value
+        if not rows:
+            return []
+
+        # A local database has no round trips to save, so the edits are
+        # applied row by row inside one transaction.
+        applied = []
+        logs = []
+        try:
+            with self.cursor() as cur:
+                for (enrolment_id, semester, subject), new_values in rows.items():
+                    cur.execute("""
+                        SELECT T1, T2, T3, T4 FROM student_scores
+                        WHERE enrolment_id = ? AND semester = ? AND subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                    """, (enrolment_id, semester, subject))
+                    for old in cur.fetchall():
+                        old = dict(zip(TEST_FIELDS, old))
+                        new = {f: new_values.get(f, old[f]) for f in TEST_FIELDS}
+                        new_total = sum(new.values()) if None not in new.values() else None
+                        cur.execute("""
+                            UPDATE student_scores
+                            SET T1 = ?, T2 = ?, T3 = ?, T4 = ?, total_score = ?
+                            WHERE enrolment_id = ? AND semester = ? AND subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                        """, (*new.values(), new_total, enrolment_id, semester, subject))
+                        for field in sorted(new_values):
+                            old_text = "None" if old[field] is None else str(old[field])
+                            applied.append((enrolment_id, semester, subject, field,
+                                            old[field], new_values[field], new_total))
+                            logs.append((faculty_id, enrolment_id,
+                                         f"{action_prefix} {subject} {field}: {old_text} -> "
+                                         f"{new_values[field]}, new total score = {new_total}",
+                                         old_text, str(new_values[field])))
+                cur.executemany("""
+                    INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value)
+                    VALUES (?, ?, ?, ?, ?)
+                """, logs)
+        except sqlite3.Error as e:
+            log_error("Error applying score edits", e)
+            return None
+        return sorted(applied, key=lambda row: row[:4])
+
+    def fetch_subject_roster(self, semester, subject):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sc.enrolment_id, s.fullname, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+                    FROM student_scores sc
+                    JOIN students s ON s.enrolment_id = sc.enrolment_id
+                    WHERE sc.semester = ?
+                      AND sc.subject_id = (SELECT subject_id FROM subjects WHERE name = ?)
+                    ORDER BY sc.enrolment_id
+                """, (semester, subject))
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching subject roster", e)
+            return []
+
+    def fetch_semester_subjects(self, semester):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT sub.name
+                    FROM class_subject_summary cs
+                    JOIN subjects sub USING (subject_id)
+                    WHERE cs.semester = ?
+                    ORDER BY sub.name
+                """, (semester,))
+                return [row[0] for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            log_error("Error fetching semester subjects", e)
+            return []
+
+    def fetch_subjects(self):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    SELECT subject_id, name, acronym, max_marks
+                    FROM subjects
+                    ORDER BY name
+                """)
+                return cur.fetchall()
+        except sqlite3.Error as e:
+            log_error("Error fetching subjects", e)
+            return []
+
+    def fetch_data_version(self):
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT version FROM data_version")
+                row = cur.fetchone()
+                return row[0] if row else None
+        except sqlite3.Error as e:
+            log_error("Error fetching data version", e)
+            return None
+
+    def fetch_report_data(self, enrolment_ids=None, semester=None):
+        conditions = []
+        params = []
+        if enrolment_ids is not None:
+            enrolment_ids = list(enrolment_ids)
+            conditions.append(f"enrolment_id IN ({', '.join('?' * len(enrolment_ids))})"
+                              if enrolment_ids else "0")
+            params.extend(enrolment_ids)
+        if semester is not None:
+            conditions.append("semester = ?")
+            params.append(semester)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        try:
+            with self.cursor() as cur:
+                cur.execute(f"""
+                    SELECT enrolment_id, fullname, semester
+                    FROM students {where}
+                    ORDER BY enrolment_id
+                """, params)
+                students = {row[0]: {"enrolment_id": row[0], "fullname": row[1], "semester": row[2],
+                                     "scores": []} for row in cur.fetchall()}
+                # Own scores and the class-wide rows of every semester they cover.
+                cur.execute("CREATE TEMP TABLE IF NOT EXISTS report_selected (enrolment_id TEXT PRIMARY KEY)")
+                cur.execute("DELETE FROM report_selected")
+                cur.executemany("INSERT INTO report_selected VALUES (?)", [(e,) for e in students])
+                cur.execute("""
+                    SELECT sc.enrolment_id, sc.semester, sub.name, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+                    FROM student_scores sc
+                    JOIN report_selected USING (enrolment_id)
+                    JOIN subjects sub USING (subject_id)
+                    ORDER BY sc.enrolment_id, sc.semester, sub.name
+                """)
+                for row in cur.fetchall():
+                    students[row[0]]["scores"].append(list(row[1:]))
+                cur.execute("""
+                    SELECT sc.semester, sc.enrolment_id, sub.name, sc.total_score
+                    FROM student_scores sc
+                    JOIN subjects sub USING (subject_id)
+                    WHERE sc.semester IN (
+                        SELECT DISTINCT s.semester FROM student_scores s JOIN report_selected USING (enrolment_id)
+                    )
+                    ORDER BY sc.semester, sub.name, sc.enrolment_id
+                """)
+                class_scores = {}
+                for row in cur.fetchall():
+                    class_scores.setdefault(str(row[0]), []).append(list(row[1:]))
+        except sqlite3.Error as e:
+            log_error("Error loading report data", e)
+            return None
+        return {"students": list(students.values()), "class_scores": class_scores}
+
+    def insert_faculty_log(self, faculty_id, enrolment_id, action, old_value, new_value):
+        try:
+            with self.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (faculty_id, enrolment_id, action, old_value, new_value))
+                return True
+        except sqlite3.Error as e:
+            log_error("Error inserting faculty log", e)
+            return False
+
+    def bulk_import_scores(self, csv_file, faculty_id=None):
+        """
+        Same contract and validation rules as DBOperations.bulk_import_scores;
+        the CSV is parsed and checked in Python instead of a staging table.
+        """
+        start = time.perf_counter()
+
+        def clean(value):
+            # COPY reads an empty unquoted field as NULL.
+            return None if value is None or value == "" else value
+
+        try:
+            with self.cursor() as cur:
+                cur.execute("SELECT enrolment_id FROM students")
+                known = {row[0] for row in cur.fetchall()}
+
+                reader = csv.reader(csv_file)
+                next(reader, None)  # header
+                checked = []
+                for line_no, fields in enumerate(reader, start=2):
+                    if len(fields) != 7:
+                        raise ValueError(f"line {line_no}: expected 7 columns, got {len(fields)}")
+                    enrolment_id, semester, subject, *tests = (clean(v) for v in fields)
+                    enrolment_id = enrolment_id.strip(" ") if enrolment_id is not None else None
+                    subject = subject.strip(" ") if subject is not None else None
+                    if not enrolment_id or not subject:
+                        reason = "missing enrolment_id or subject"
+                    elif semester is None or not _SEMESTER.match(semester):
+                        reason = "semester must be 1, 2 or 3"
+                    elif any(t is None or not _NUMBER.match(t) for t in tests):
+                        reason = "T1-T4 must all be numbers"
+                    elif any(not 0 <= Decimal(t) <= 25 for t in tests):
+                        reason = "test scores must be between 0 and 25"
+                    elif any(Decimal(t) % 1 for t in tests):
+                        reason = "test scores must be whole numbers"
+                    elif enrolment_id not in known:
+                        reason = "unknown enrolment_id"
+                    else:
+                        reason = None
+                    semester = semester.strip(" ") if semester is not None else None
+                    checked.append([line_no, enrolment_id, semester, subject, tests, reason])
+
+                # Among valid rows the last line for a student/semester/subject wins.
+                seen = set()
+                for row in reversed(checked):
+                    if row[5] is None:
+                        key = (row[1], row[2], row[3])
+                        if key in seen:
+                            row[5] = "duplicate row, superseded by a later line"
+                        seen.add(key)
+
+                rejected = [(r[0], r[1], r[2], r[3], r[5]) for r in checked if r[5] is not None]
+                valid = []
+                for _, enrolment_id, semester, subject, tests, reason in checked:
+                    if reason is None:
+                        tests = [int(Decimal(t)) for t in tests]
+                        valid.append((enrolment_id, int(semester), subject, *tests, sum(tests)))
+
+                updated = inserted = 0
+                subject_ids = {}
+                for enrolment_id, semester, subject, t1, t2, t3, t4, total in valid:
+                    if subject not in subject_ids:
+                        subject_ids[subject] = _subject_id(cur, subject)
+                    cur.execute("""
+                        UPDATE student_scores
+                        SET T1 = ?, T2 = ?, T3 = ?, T4 = ?, total_score = ?
+                        WHERE enrolment_id = ? AND semester = ? AND subject_id = ?
+                    """, (t1, t2, t3, t4, total, enrolment_id, semester, subject_ids[subject]))
+                    if cur.rowcount:
+                        updated += cur.rowcount
+                    else:
+                        cur.execute("""
+                            INSERT INTO student_scores (enrolment_id, semester, subject_id, T1, T2, T3, T4, total_score)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """, (enrolment_id, semester, subject_ids[subject], t1, t2, t3, t4, total))
+                        inserted += 1
+
+                if faculty_id is not None:
+                    cur.execute("""
+                        INSERT INTO faculty_logs (faculty_id, enrolment_id, action, old_value, new_value)
+                        VALUES (?, NULL, ?, NULL, NULL)
+                    """, (faculty_id, f"Bulk score import: {updated} updated, {inserted} inserted, "
+                                      f"{len(rejected)} rejected of {len(checked)} rows"))
+        except (sqlite3.Error, ValueError, csv.Error) as e:
+            log_error("Error importing scores", e)
+            return None
+
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": len(checked),
+            "updated": updated,
+            "inserted": inserted,
+            "rejected": rejected,
+            "elapsed": elapsed,
+            "rows_per_second": len(checked) / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def _subject_id(cur, name):
+    """The subject_id of the named subject, adding the subject if it is new."""
+    cur.execute("SELECT subject_id FROM subjects WHERE name = ?", (name,))
+    row = cur.fetchone()
+    if row is not None:
+        return row[0]
+    cur.execute("INSERT INTO subjects (name, acronym) VALUES (?, subject_acronym(?))", (name, name))
+    return cur.lastrowid
+
+
+# Converts student_scores.subject (the name) to subject_id, the SQLite
+# counterpart of migrations/0004_subjects.sql; {schema} is sqlite_init.sql.
+_SUBJECT_IDS_UPGRADE = """
+BEGIN;
+DROP TRIGGER IF EXISTS score_summaries_insert;
+DROP TRIGGER IF EXISTS score_summaries_delete;
+DROP TRIGGER IF EXISTS score_summaries_update;
+DROP INDEX IF EXISTS student_scores_student_semester_subject_idx;
+DROP INDEX IF EXISTS student_scores_semester_subject_idx;
+DROP TABLE class_subject_summary;
+ALTER TABLE student_scores RENAME TO student_scores_by_name;
+{schema}
+INSERT OR IGNORE INTO subjects (name, acronym)
+SELECT DISTINCT subject, subject_acronym(subject) FROM student_scores_by_name ORDER BY subject;
+-- The insert trigger rebuilds both summaries.
+DELETE FROM student_semester_summary;
+INSERT INTO student_scores (enrolment_id, semester, subject_id, T1, T2, T3, T4, total_score)
+SELECT sc.enrolment_id, sc.semester, sub.subject_id, sc.T1, sc.T2, sc.T3, sc.T4, sc.total_score
+FROM student_scores_by_name sc
+JOIN subjects sub ON sub.name = sc.subject;
+DROP TABLE student_scores_by_name;
+COMMIT;
+"""
+
+
+SNAPSHOT_TABLES = {
+    "students": ["enrolment_id", "fullname", "password", "semester"],
+    "faculty": ["faculty_id", "name", "password"],
+    "subjects": ["subject_id", "name", "acronym", "max_marks"],
+    "student_scores": ["enrolment_id", "semester", "subject_id", "T1", "T2", "T3", "T4", "total_score"],
+    "faculty_logs": ["log_id", "faculty_id", "enrolment_id", "action", "old_value", "new_value", "timestamp"],
+}
+
+
+def snapshot_from_postgres(pg_conn, path, batch_size=10000):
+    """
+    Copies every table of the PostgreSQL database behind pg_conn into a
+    fresh SQLite database at path (replacing any existing file) and builds
+    its score summaries. Returns {table: rows copied}.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    target = SQLiteOperations(path)
+    counts = {}
+    try:
+        with target.cursor() as dest:
+            # Summaries are rebuilt once at the end instead of row by row.
+            dest.execute("DROP TRIGGER score_summaries_insert")
+            for table, columns in SNAPSHOT_TABLES.items():
+                counts[table] = 0
+                with pg_conn.cursor(name=f"snapshot_{table}") as src:
+                    src.itersize = batch_size
+                    src.execute(f"SELECT {', '.join(columns)} FROM {table}")
+                    while True:
+                        rows = src.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        dest.executemany(
+                            f"INSERT INTO {table} ({', '.join(columns)}) "
+                            f"VALUES ({', '.join('?' * len(columns))})",
+                            rows,
+                        )
+                        counts[table] += len(rows)
+        pg_conn.commit()
+        target.rebuild_score_summaries()
+        target.ensure_schema()  # restores the dropped trigger
+    finally:
+        target.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite backend utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    snapshot = subparsers.add_parser("snapshot", help="copy the PostgreSQL database into a SQLite file")
+    snapshot.add_argument("path", help="SQLite file to create (replaced if it exists)")
+    args = parser.parse_args()
+
+    from database.db_operations import get_connection
+    start = time.perf_counter()
+    conn = get_connection()
+    try:
+        counts = snapshot_from_postgres(conn, args.path)
+    finally:
+        conn.close()
+    print(f"Wrote {args.path} in {time.perf_counter() - start:.1f}s: "
+          + ", ".join(f"{n} {table}" for table, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+-- SQLite version of db_init.sql and the migrations in database/migrations/,
+-- used by database/sqlite_backend.py. Keep the two in step: same tables,
+-- columns, constraints and indexes.
+
+CREATE TABLE IF NOT EXISTS students (
+    enrolment_id VARCHAR(14) PRIMARY KEY,
+    fullname VARCHAR(50) NOT NULL,
+    password VARCHAR(50) NOT NULL,
+    semester INT NOT NULL CHECK (semester >= 1 AND semester <= 3)
+);
+
+CREATE TABLE IF NOT EXISTS faculty (
+    faculty_id VARCHAR(10) PRIMARY KEY,
+    name VARCHAR(50) NOT NULL,
+    password VARCHAR(50) NOT NULL
+);
+
+-- Acronyms are derived with utils.input_validation.get_acronym, which
+-- sqlite_backend.py registers as the subject_acronym() SQL function.
+CREATE TABLE IF NOT EXISTS subjects (
+    subject_id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    acronym VARCHAR(100) NOT NULL,
+    max_marks INT NOT NULL DEFAULT 100 CHECK (max_marks > 0)
+);
+
+CREATE TABLE IF NOT EXISTS student_scores (
+    enrolment_id VARCHAR(14) REFERENCES students(enrolment_id),
+    semester INT CHECK (semester >= 1 AND semester <= 3),
+    subject_id INTEGER NOT NULL REFERENCES subjects(subject_id),
+    T1 INT CHECK (T1 >= 0 AND T1 <= 25),
+    T2 INT CHECK (T2 >= 0 AND T2 <= 25),
+    T3 INT CHECK (T3 >= 0 AND T3 <= 25),
+    T4 INT CHECK (T4 >= 0 AND T4 <= 25),
+    total_score INT CHECK (total_score >= 0 AND total_score <= 100)
+);
+
+-- Timestamps are stored as local-time 'YYYY-MM-DD HH:MM:SS.ffffff' text,
+-- which sorts correctly and is read back as datetime (see sqlite_backend.py).
+CREATE TABLE IF NOT EXISTS faculty_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    faculty_id VARCHAR(10) REFERENCES faculty(faculty_id),
+    enrolment_id VARCHAR(14) REFERENCES students(enrolment_id),
+    action TEXT,
+    old_value TEXT,
+    new_value TEXT,
+    timestamp TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS student_semester_summary (
+    enrolment_id VARCHAR(14) REFERENCES students(enrolment_id),
+    semester INT,
+    row_count INT NOT NULL DEFAULT 0,
+    score_count INT NOT NULL DEFAULT 0,
+    score_sum BIGINT NOT NULL DEFAULT 0,
+    score_sumsq BIGINT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    PRIMARY KEY (enrolment_id, semester)
+);
+
+CREATE TABLE IF NOT EXISTS class_subject_summary (
+    semester INT,
+    subject_id INTEGER REFERENCES subjects(subject_id),
+    row_count INT NOT NULL DEFAULT 0,
+    score_count INT NOT NULL DEFAULT 0,
+    score_sum BIGINT NOT NULL DEFAULT 0,
+    score_sumsq BIGINT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    PRIMARY KEY (semester, subject_id)
+);
+
+-- Bumped by every change to students, student_scores or subjects (see
+-- migrations/0005_data_version.sql); per row here, as SQLite has no
+-- statement-level triggers.
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+
+CREATE INDEX IF NOT EXISTS subjects_lower_name_idx
+    ON subjects (lower(name));
+CREATE INDEX IF NOT EXISTS student_scores_student_semester_subject_idx
+    ON student_scores (enrolment_id, semester, subject_id);
+CREATE INDEX IF NOT EXISTS student_scores_semester_subject_idx
+    ON student_scores (semester, subject_id);
+CREATE INDEX IF NOT EXISTS faculty_logs_faculty_timestamp_idx
+    ON faculty_logs (faculty_id, timestamp DESC, log_id DESC);
+CREATE INDEX IF NOT EXISTS faculty_logs_faculty_student_timestamp_idx
+    ON faculty_logs (faculty_id, enrolment_id, timestamp DESC, log_id DESC);
+CREATE INDEX IF NOT EXISTS students_semester_idx
+    ON students (semester);
+
+------------------------------
+-- Score Summaries
+------------------------------
+-- SQLite has no statement-level triggers, so the summaries are maintained
+-- per row with the same bookkeeping as maintain_score_summaries() in
+-- db_init.sql: counts and sums are adjusted incrementally, and min/max are
+-- only recomputed for a group that lost a boundary value. An UPDATE is
+-- applied as removing the old row and adding the new one.
+-- SQLite's two-argument min()/max() return NULL if either side is NULL,
+-- hence the COALESCEs.
+
+CREATE TRIGGER IF NOT EXISTS score_summaries_insert
+AFTER INSERT ON student_scores
+BEGIN
+    INSERT INTO student_semester_summary
+        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    VALUES (NEW.enrolment_id, NEW.semester, 1, NEW.total_score IS NOT NULL, COALESCE(NEW.total_score, 0),
+            COALESCE(NEW.total_score * NEW.total_score, 0), NEW.total_score, NEW.total_score)
+    ON CONFLICT (enrolment_id, semester) DO UPDATE SET
+        row_count = row_count + 1,
+        score_count = score_count + excluded.score_count,
+        score_sum = score_sum + excluded.score_sum,
+        score_sumsq = score_sumsq + excluded.score_sumsq,
+        score_min = COALESCE(min(score_min, excluded.score_min), score_min, excluded.score_min),
+        score_max = COALESCE(max(score_max, excluded.score_max), score_max, excluded.score_max);
+
+    INSERT INTO class_subject_summary
+        (semester, subject_id, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    VALUES (NEW.semester, NEW.subject_id, 1, NEW.total_score IS NOT NULL, COALESCE(NEW.total_score, 0),
+            COALESCE(NEW.total_score * NEW.total_score, 0), NEW.total_score, NEW.total_score)
+    ON CONFLICT (semester, subject_id) DO UPDATE SET
+        row_count = row_count + 1,
+        score_count = score_count + excluded.score_count,
+        score_sum = score_sum + excluded.score_sum,
+        score_sumsq = score_sumsq + excluded.score_sumsq,
+        score_min = COALESCE(min(score_min, excluded.score_min), score_min, excluded.score_min),
+        score_max = COALESCE(max(score_max, excluded.score_max), score_max, excluded.score_max);
+END;
+
+CREATE TRIGGER IF NOT EXISTS score_summaries_delete
+AFTER DELETE ON student_scores
+BEGIN
+    UPDATE student_semester_summary
+    SET row_count = row_count - 1,
+        score_count = score_count - (OLD.total_score IS NOT NULL),
+        score_sum = score_sum - COALESCE(OLD.total_score, 0),
+        score_sumsq = score_sumsq - COALESCE(OLD.total_score * OLD.total_score, 0)
+    WHERE enrolment_id = OLD.enrolment_id AND semester = OLD.semester;
+    UPDATE student_semester_summary
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.enrolment_id = OLD.enrolment_id AND sc.semester = OLD.semester
+    )
+    WHERE enrolment_id = OLD.enrolment_id AND semester = OLD.semester
+      AND (OLD.total_score <= score_min OR OLD.total_score >= score_max);
+    DELETE FROM student_semester_summary
+    WHERE enrolment_id = OLD.enrolment_id AND semester = OLD.semester AND row_count <= 0;
+
+    UPDATE class_subject_summary
+    SET row_count = row_count - 1,
+        score_count = score_count - (OLD.total_score IS NOT NULL),
+        score_sum = score_sum - COALESCE(OLD.total_score, 0),
+        score_sumsq = score_sumsq - COALESCE(OLD.total_score * OLD.total_score, 0)
+    WHERE semester = OLD.semester AND subject_id = OLD.subject_id;
+    UPDATE class_subject_summary
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.semester = OLD.semester AND sc.subject_id = OLD.subject_id
+    )
+    WHERE semester = OLD.semester AND subject_id = OLD.subject_id
+      AND (OLD.total_score <= score_min OR OLD.total_score >= score_max);
+    DELETE FROM class_subject_summary
+    WHERE semester = OLD.semester AND subject_id = OLD.subject_id AND row_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS score_summaries_update
+AFTER UPDATE OF enrolment_id, semester, subject_id, total_score ON student_scores
+BEGIN
+    -- Remove the old row...
+    UPDATE student_semester_summary
+    SET row_count = row_count - 1,
+        score_count = score_count - (OLD.total_score IS NOT NULL),
+        score_sum = score_sum - COALESCE(OLD.total_score, 0),
+        score_sumsq = score_sumsq - COALESCE(OLD.total_score * OLD.total_score, 0)
+    WHERE enrolment_id = OLD.enrolment_id AND semester = OLD.semester;
+    UPDATE class_subject_summary
+    SET row_count = row_count - 1,
+        score_count = score_count - (OLD.total_score IS NOT NULL),
+        score_sum = score_sum - COALESCE(OLD.total_score, 0),
+        score_sumsq = score_sumsq - COALESCE(OLD.total_score * OLD.total_score, 0)
+    WHERE semester = OLD.semester AND subject_id = OLD.subject_id;
+
+    -- ...recompute min/max if it was a boundary (student_scores already
+    -- holds the new row, so the recomputed values include it)...
+    UPDATE student_semester_summary
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.enrolment_id = OLD.enrolment_id AND sc.semester = OLD.semester
+    )
+    WHERE enrolment_id = OLD.enrolment_id AND semester = OLD.semester
+      AND (OLD.total_score <= score_min OR OLD.total_score >= score_max);
+    UPDATE class_subject_summary
+    SET (score_min, score_max) = (
+        SELECT MIN(sc.total_score), MAX(sc.total_score)
+        FROM student_scores sc
+        WHERE sc.semester = OLD.semester AND sc.subject_id = OLD.subject_id
+    )
+    WHERE semester = OLD.semester AND subject_id = OLD.subject_id
+      AND (OLD.total_score <= score_min OR OLD.total_score >= score_max);
+    DELETE FROM student_semester_summary
+    WHERE enrolment_id = OLD.enrolment_id AND semester = OLD.semester AND row_count <= 0;
+    DELETE FROM class_subject_summary
+    WHERE semester = OLD.semester AND subject_id = OLD.subject_id AND row_count <= 0;
+
+    -- ...and add the new one.
+    INSERT INTO student_semester_summary
+        (enrolment_id, semester, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    VALUES (NEW.enrolment_id, NEW.semester, 1, NEW.total_score IS NOT NULL, COALESCE(NEW.total_score, 0),
+            COALESCE(NEW.total_score * NEW.total_score, 0), NEW.total_score, NEW.total_score)
+    ON CONFLICT (enrolment_id, semester) DO UPDATE SET
+        row_count = row_count + 1,
+        score_count = score_count + excluded.score_count,
+        score_sum = score_sum + excluded.score_sum,
+        score_sumsq = score_sumsq + excluded.score_sumsq,
+        score_min = COALESCE(min(score_min, excluded.score_min), score_min, excluded.score_min),
+        score_max = COALESCE(max(score_max, excluded.score_max), score_max, excluded.score_max);
+    INSERT INTO class_subject_summary
+        (semester, subject_id, row_count, score_count, score_sum, score_sumsq, score_min, score_max)
+    VALUES (NEW.semester, NEW.subject_id, 1, NEW.total_score IS NOT NULL, COALESCE(NEW.total_score, 0),
+            COALESCE(NEW.total_score * NEW.total_score, 0), NEW.total_score, NEW.total_score)
+    ON CONFLICT (semester, subject_id) DO UPDATE SET
+        row_count = row_count + 1,
+        score_count = score_count + excluded.score_count,
+        score_sum = score_sum + excluded.score_sum,
+        score_sumsq = score_sumsq + excluded.score_sumsq,
+        score_min = COALESCE(min(score_min, excluded.score_min), score_min, excluded.score_min),
+        score_max = COALESCE(max(score_max, excluded.score_max), score_max, excluded.score_max);
+END;
+
+------------------------------
+-- Data Version
+------------------------------
+
+CREATE TRIGGER IF NOT EXISTS data_version_scores_insert AFTER INSERT ON student_scores
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_scores_update AFTER UPDATE ON student_scores
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_scores_delete AFTER DELETE ON student_scores
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_students_insert AFTER INSERT ON students
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_students_update AFTER UPDATE ON students
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_students_delete AFTER DELETE ON students
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_subjects_insert AFTER INSERT ON subjects
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_subjects_update AFTER UPDATE ON subjects
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_version_subjects_delete AFTER DELETE ON subjects
+BEGIN
+    UPDATE data_version SET version = version + 1;
+END;
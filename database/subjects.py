@@ -0,0 +1,47 @@
+"""
+Subject acronyms from the subjects table.
+
+Each subject's acronym is stored once in the subjects table, so screens and
+reports look it up instead of deriving it from the name for every row.
+The table is read on first use and re-read when an unknown name (e.g. a
+subject added by a CSV import since) is looked up, at most once every
+RELOAD_INTERVAL seconds.
+"""
+import threading
+import time
+
+from utils.input_validation import get_acronym
+
+RELOAD_INTERVAL = 60
+
+_acronyms = {}
+_loaded_at = None
+_lock = threading.Lock()
+
+
+def load_subject_acronyms(db=None):
+    """
+    (Re)reads the acronyms from db, by default the backend get_db()
+    selects. Call it with an explicit backend when not using get_db().
+    """
+    from database.backend import get_db
+
+    global _loaded_at
+    rows = (db or get_db()).fetch_subjects()
+    # rows -> (subject_id, name, acronym, max_marks)
+    with _lock:
+        _acronyms.update((name, acronym) for _, name, acronym, _ in rows)
+        _loaded_at = time.monotonic()
+
+
+def subject_acronym(subject):
+    """
+    The stored acronym of a subject name. Names missing from the subjects
+    table fall back to get_acronym(), the rule the table was filled with.
+    """
+    acronym = _acronyms.get(subject)
+    if acronym is not None:
+        return acronym
+    if _loaded_at is None or time.monotonic() - _loaded_at > RELOAD_INTERVAL:
+        load_subject_acronyms()
+    return _acronyms.get(subject) or get_acronym(subject)
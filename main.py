@@ -1,3 +1,4 @@
+import sys
 from rich.console import Console
 from cli.faculty_cli import faculty_menu
 from cli.student_cli import student_menu
@@ -14,15 +15,22 @@ def main():
 
         choice = input("Enter your choice: ").strip()
         if choice == "1":
-            faculty_menu()
+            exit_app = faculty_menu()
         elif choice == "2":
-            student_menu()
+            exit_app = student_menu()
         elif choice == "3":
-            console.print("[green]Exiting the application. Goodbye![/green]")
-            break
+            exit_app = True
         else:
             console.print("[red]Invalid choice. Please try again.[/red]")
+            continue
+        if exit_app:
+            console.print("[green]Exiting the application. Goodbye![/green]")
+            break
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Scripted use, e.g. `python main.py interventions --max-avg 40 --format csv`
+        from cli.commands import run
+        sys.exit(run(sys.argv[1:]))
     main()
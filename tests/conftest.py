@@ -0,0 +1,19 @@
+"""Fixtures shared by the tests."""
+import pytest
+
+from benchmarks.datagen import seed_sqlite
+from database.backend import get_db
+
+
+@pytest.fixture
+def cohort(tmp_path, monkeypatch):
+    """
+    get_db() on a SQLite file seeded with benchmarks.datagen's 6-student
+    cohort. Student i has scores in semesters 1 to 1 + i % 3.
+    """
+    monkeypatch.setenv("APT_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("APT_SQLITE_PATH", str(tmp_path / "cohort.sqlite3"))
+    db = get_db()
+    seed_sqlite(db, 6)
+    yield db
+    db.close()
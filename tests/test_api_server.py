@@ -0,0 +1,135 @@
+"""
+The HTTP API (api/server.py) served from a small SQLite cohort: login,
+access control, ETag revalidation and the data version behind it.
+
+    python -m pytest -q tests
+"""
+import http.client
+import json
+import threading
+
+import pytest
+
+import auth.sessions as sessions
+import database.subjects as subjects
+from api.server import APIServer
+from auth.sessions import LoginThrottle, SessionManager
+from auth.student_auth import expected_student_password
+from benchmarks.datagen import SUBJECTS, enrolment_id, faculty_id
+
+SUBJECT = SUBJECTS[1][0]
+
+
+@pytest.fixture
+def server(cohort, tmp_path, monkeypatch):
+    directory = str(tmp_path / "sessions")
+    monkeypatch.setattr(sessions, "_sessions", SessionManager(directory=directory, secret=b"test-key", ttl=60))
+    monkeypatch.setattr(sessions, "_throttle", LoginThrottle(max_failures=3, lockout=30, directory=directory))
+    # Acronyms read by one test must not leak into the next.
+    monkeypatch.setattr(subjects, "_acronyms", {})
+    monkeypatch.setattr(subjects, "_loaded_at", None)
+
+    server = APIServer(("127.0.0.1", 0), cohort)
+    server.api.version.poll_interval = 0  # see every change at once
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def request(server, method, path, body=None, headers=None):
+    """Returns (status, headers, decoded JSON body or None)."""
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        data = response.read()
+        return response.status, response.headers, json.loads(data) if data else None
+    finally:
+        conn.close()
+
+
+def login(server, cohort, enrolment):
+    fullname = cohort.fetch_student_by_enrolment(enrolment)[1]
+    status, _, body = request(server, "POST", "/api/login", json.dumps({
+        "role": "student", "id": enrolment, "password": expected_student_password(fullname, enrolment),
+    }))
+    assert status == 200
+    return {"Authorization": f"Bearer {body['token']}"}
+
+
+def test_scores_and_revalidation(server, cohort):
+    student = enrolment_id(1)
+    auth = login(server, cohort, student)
+
+    status, headers, body = request(server, "GET", f"/api/students/{student}/scores?semester=1", headers=auth)
+    assert status == 200
+    assert [row["subject"] for row in body["scores"]] == [s for s, *_ in cohort.fetch_student_scores(student, 1)]
+    etag = headers["ETag"]
+
+    status, headers, body = request(server, "GET", f"/api/students/{student}/scores?semester=1",
+                                    headers={**auth, "If-None-Match": etag})
+    assert (status, headers["ETag"], body) == (304, etag, None)
+
+    # A score edit moves the version, so the old ETag no longer matches.
+    t1 = cohort.fetch_test_scores_for_subject(student, 1, SUBJECT)[0]
+    cohort.update_student_test_score(student, 1, SUBJECT, "T1", (t1 + 1) % 26)
+    status, headers, _ = request(server, "GET", f"/api/students/{student}/scores?semester=1",
+                                 headers={**auth, "If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+
+
+def test_subject_changes_move_the_data_version(server, cohort):
+    student = enrolment_id(1)
+    auth = login(server, cohort, student)
+    path = f"/api/students/{student}/scores?semester=1"
+    _, headers, body = request(server, "GET", path, headers=auth)
+    before = cohort.fetch_data_version()
+    assert {row["acronym"] for row in body["scores"] if row["subject"] == SUBJECT} != {"RENAMED"}
+
+    with cohort.cursor() as cur:
+        cur.execute("UPDATE subjects SET acronym = 'RENAMED' WHERE name = ?", (SUBJECT,))
+    assert cohort.fetch_data_version() > before
+
+    status, _, body = request(server, "GET", path, headers={**auth, "If-None-Match": headers["ETag"]})
+    assert status == 200
+    assert {row["acronym"] for row in body["scores"] if row["subject"] == SUBJECT} == {"RENAMED"}
+
+
+def test_students_only_read_their_own_scores(server, cohort):
+    auth = login(server, cohort, enrolment_id(1))
+    status, _, _ = request(server, "GET", f"/api/students/{enrolment_id(2)}/scores", headers=auth)
+    assert status == 403
+
+    faculty = {"Authorization": f"Bearer {sessions.get_sessions().issue('faculty', faculty_id(1))}"}
+    status, _, body = request(server, "GET", f"/api/students/{enrolment_id(2)}/scores", headers=faculty)
+    assert status == 200 and body["scores"]
+
+    status, headers, _ = request(server, "GET", f"/api/students/{enrolment_id(2)}/scores")
+    assert (status, headers["WWW-Authenticate"]) == (401, "Bearer")
+
+
+def test_comparison(server, cohort):
+    student = enrolment_id(2)
+    auth = login(server, cohort, student)
+    status, _, body = request(server, "GET", f"/api/students/{student}/comparison?semester=1", headers=auth)
+    assert status == 200
+    assert len(body["subjects"]) == len(cohort.fetch_student_scores(student, 1))
+    assert all(0 < row["percentile"] <= 100 for row in body["subjects"])
+
+    status, _, _ = request(server, "GET", f"/api/students/{student}/comparison", headers=auth)
+    assert status == 400
+
+
+@pytest.mark.parametrize("length", ["-1", "+5", "1_0", "abc", "99999"])
+def test_login_rejects_a_bad_content_length(server, length):
+    status, _, body = request(server, "POST", "/api/login", body=b"{}", headers={"Content-Length": length})
+    assert status == 400 and "role, id and password" in body["error"]
+
+
+def test_login_lockout(server, cohort):
+    student = enrolment_id(1)
+    wrong = json.dumps({"role": "student", "id": student, "password": "wrong"})
+    assert [request(server, "POST", "/api/login", wrong)[0] for _ in range(4)] == [401, 401, 401, 429]
@@ -0,0 +1,38 @@
+"""
+get_db() backend selection and sharing.
+
+    python -m pytest -q tests
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from database.backend import get_db
+
+
+def _child_backend():
+    # A forked child sees a copy of its parent's memory, so an inherited
+    # backend keeps the parent's id().
+    db = get_db()
+    return id(db), len(db.fetch_all_students())
+
+
+def test_sqlite_backend_is_shared_per_file(cohort):
+    assert get_db() is cohort
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_worker_opens_its_own_sqlite_connection(cohort):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as pool:
+        child_db, students = pool.submit(_child_backend).result()
+    assert child_db != id(cohort)
+    assert students == len(cohort.fetch_all_students()) == 6
+    # The parent's connection is untouched and still usable.
+    assert get_db() is cohort and cohort.fetch_student_by_enrolment(cohort.fetch_all_students()[0][0])
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setenv("APT_DB_BACKEND", "oracle")
+    with pytest.raises(ValueError):
+        get_db()
@@ -0,0 +1,68 @@
+"""
+Bulk score import through get_db() on the SQLite backend: row validation,
+the update/insert merge and the audit log entry.
+
+    python -m pytest -q tests
+"""
+import io
+
+from benchmarks.datagen import SUBJECTS, enrolment_id, faculty_id
+
+SE = SUBJECTS[1][0]
+DS = SUBJECTS[2][0]
+
+
+def test_bulk_import_validates_and_merges(cohort):
+    # Students 1, 2 and 4 have semester-1 scores; student 3 has no semester 2.
+    e1, e2, e3, e4, e5 = (enrolment_id(i) for i in range(1, 6))
+    csv_text = "\n".join([
+        "enrolment_id,semester,subject,T1,T2,T3,T4",
+        f"{e1},1,{SE},10,11,12,13",            # 2: updates an existing row
+        f"{e3},2,{DS},1,2,3,4",                # 3: inserts a new row
+        f"{e2},4,{SE},1,1,1,1",                # 4: bad semester
+        f"{e2},1,{SE},12.5,1,1,1",             # 5: fractional
+        f"{e2},1,{SE},26,1,1,1",               # 6: out of range
+        f"NOSUCHSTUDENT,1,{SE},1,1,1,1",       # 7: unknown student
+        f"{e2},1,{SE},1,,1,1",                 # 8: missing number
+        f",1,{SE},1,1,1,1",                    # 9: missing enrolment_id
+        f"{e4},1,{SE},5,5,5,5",                # 10: superseded by line 11
+        f"{e4},1,{SE},6,6,6,7.0",              # 11: updates; 7.0 is whole
+        f"{e5},1,New Subject (NS),1,2,3,4",    # 12: inserts, adding the subject
+    ]) + "\n"
+    faculty = faculty_id(1)
+    e2_before = cohort.fetch_test_scores_for_subject(e2, 1, SE)
+
+    result = cohort.bulk_import_scores(io.StringIO(csv_text), faculty_id=faculty)
+
+    assert result["rejected"] == [
+        (4, e2, "4", SE, "semester must be 1, 2 or 3"),
+        (5, e2, "1", SE, "test scores must be whole numbers"),
+        (6, e2, "1", SE, "test scores must be between 0 and 25"),
+        (7, "NOSUCHSTUDENT", "1", SE, "unknown enrolment_id"),
+        (8, e2, "1", SE, "T1-T4 must all be numbers"),
+        (9, None, "1", SE, "missing enrolment_id or subject"),
+        (10, e4, "1", SE, "duplicate row, superseded by a later line"),
+    ]
+    assert (result["rows"], result["updated"], result["inserted"]) == (11, 2, 2)
+
+    assert cohort.fetch_test_scores_for_subject(e1, 1, SE) == (10, 11, 12, 13)
+    assert cohort.fetch_test_scores_for_subject(e3, 2, DS) == (1, 2, 3, 4)
+    assert cohort.fetch_test_scores_for_subject(e4, 1, SE) == (6, 6, 6, 7)
+    assert cohort.fetch_test_scores_for_subject(e5, 1, "New Subject (NS)") == (1, 2, 3, 4)
+    assert ("New Subject (NS)", "NS") in [(name, acronym) for _, name, acronym, _ in cohort.fetch_subjects()]
+    # Totals are recomputed, and rejected rows leave the data alone.
+    assert (1, SE, 46) in [(sem, subject, total) for sem, subject, *_, total in cohort.fetch_all_semester_scores(e1)]
+    assert cohort.fetch_test_scores_for_subject(e2, 1, SE) == e2_before
+
+    actions = [row[3] for row in cohort.fetch_faculty_logs(faculty)]
+    assert "Bulk score import: 2 updated, 2 inserted, 7 rejected of 11 rows" in actions
+
+
+def test_bulk_import_without_valid_rows_changes_nothing(cohort):
+    before = cohort.fetch_all_student_scores()
+    result = cohort.bulk_import_scores(io.StringIO(
+        "enrolment_id,semester,subject,T1,T2,T3,T4\n"
+        f"{enrolment_id(1)},1,{SE},30,1,1,1\n"
+    ))
+    assert (result["updated"], result["inserted"], len(result["rejected"])) == (0, 0, 1)
+    assert cohort.fetch_all_student_scores() == before
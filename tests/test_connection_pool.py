@@ -0,0 +1,62 @@
+"""
+The connection pool, and how DBOperations behaves when the pool has no
+connection to give. No database server is needed: the pool is filled with
+placeholder connections that are never queried.
+
+    python -m pytest -q tests
+"""
+import io
+
+import pytest
+from psycopg2 import Error
+
+from database.connection_pool import ConnectionPool, PoolExhaustedError
+from database.db_operations import DBOperations
+
+
+class IdleConnection:
+    """Stands in for a psycopg2 connection that is only checked out and returned."""
+
+    closed = False
+
+    def get_transaction_status(self):
+        return 0  # TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def drained_db():
+    pool = ConnectionPool(IdleConnection, min_size=0, max_size=1, timeout=0.05)
+    held = pool.getconn()
+    yield DBOperations(pool=pool, prepare=False)
+    pool.putconn(held)
+    pool.closeall()
+
+
+def test_exhausted_pool_raises_a_psycopg2_error():
+    pool = ConnectionPool(IdleConnection, min_size=0, max_size=1, timeout=0.05)
+    held = pool.getconn()
+    with pytest.raises(PoolExhaustedError) as exc:
+        pool.getconn()
+    assert isinstance(exc.value, Error)
+    pool.putconn(held)
+    assert pool.getconn() is held
+
+
+def test_backend_methods_fall_back_when_the_pool_is_exhausted(drained_db):
+    assert drained_db.fetch_student_by_enrolment("23002171410016") is None
+    assert drained_db.fetch_faculty_password("F001") is None
+    assert drained_db.fetch_student_overall_averages() == []
+    assert drained_db.fetch_faculty_logs_page("F001") == ([], None)
+    assert drained_db.apply_score_edits("F001", [("23002171410016", 1, "JAVA-I", "T1", 10)]) is None
+    assert drained_db.bulk_import_scores(io.StringIO("enrolment_id,semester,subject,T1,T2,T3,T4\n")) is None
+
+
+def test_backend_methods_fall_back_when_the_pool_is_closed():
+    pool = ConnectionPool(IdleConnection, min_size=0, max_size=1, timeout=0.05)
+    pool.closeall()
+    db = DBOperations(pool=pool, prepare=False)
+    assert db.fetch_student_by_enrolment("23002171410016") is None
+    assert db.fetch_all_students() == []
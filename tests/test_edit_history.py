@@ -0,0 +1,123 @@
+"""
+The circular-buffer stack and the undo/redo history of score edits, the
+latter replayed against a small SQLite cohort.
+
+    python -m pytest -q tests
+"""
+import pytest
+
+from benchmarks.datagen import SUBJECTS, enrolment_id, faculty_id
+from utils.Stack_DSA import Stack_DSA
+from utils.edit_history import EditHistory
+
+FACULTY = faculty_id(1)
+SUBJECT = SUBJECTS[1][0]
+
+
+def test_stack_is_lifo():
+    stack = Stack_DSA(3)
+    for item in "abc":
+        stack.push(item)
+    assert stack.get_all() == ["c", "b", "a"]
+    assert [stack.pop(), stack.pop(), stack.pop(), stack.pop()] == ["c", "b", "a", None]
+    assert stack.is_empty() and stack.peek() is None
+
+
+def test_full_stack_evicts_the_oldest_item():
+    stack = Stack_DSA(3)
+    assert [stack.push(item) for item in "abcde"] == [None, None, None, "a", "b"]
+    assert stack.size() == 3
+    assert stack.get_all() == ["e", "d", "c"]
+
+
+def test_stack_wraps_around_the_buffer():
+    stack = Stack_DSA(3)
+    for item in "abcd":  # "d" overwrites "a"'s slot at the start of the buffer
+        stack.push(item)
+    assert stack.pop() == "d"
+    stack.push("e")
+    stack.push("f")  # full again: evicts "b", the bottom item
+    assert stack.get_all() == ["f", "e", "c"]
+    assert [stack.pop() for _ in range(3)] == ["f", "e", "c"]
+    stack.push("g")
+    assert stack.get_all() == ["g"]
+
+
+def test_unbounded_stack_grows():
+    stack = Stack_DSA()
+    assert all(stack.push(i) is None for i in range(20))
+    assert stack.size() == 20
+    assert stack.get_all() == list(range(19, -1, -1))
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        Stack_DSA(0)
+
+
+def t1(db, student):
+    return db.fetch_test_scores_for_subject(student, 1, SUBJECT)[0]
+
+
+def edit_t1(db, history, student, value):
+    results = db.apply_score_edits(FACULTY, [(student, 1, SUBJECT, "T1", value)])
+    history.record(f"T1 of {student}", results)
+    return results
+
+
+def test_undo_after_redo(cohort):
+    student = enrolment_id(1)
+    history = EditHistory()
+    original = t1(cohort, student)
+    edit_t1(cohort, history, student, (original + 1) % 26)
+
+    assert history.undo(cohort, FACULTY)[0] == f"T1 of {student}"
+    assert t1(cohort, student) == original
+    assert history.redo(cohort, FACULTY) is not None
+    assert t1(cohort, student) == (original + 1) % 26
+    assert not history.can_redo()
+
+    label, applied, skipped = history.undo(cohort, FACULTY)
+    assert t1(cohort, student) == original
+    assert applied[0][4:6] == ((original + 1) % 26, original) and skipped == 0
+    assert not history.can_undo() and history.can_redo()
+
+
+def test_new_edit_clears_redo(cohort):
+    student = enrolment_id(1)
+    history = EditHistory()
+    original = t1(cohort, student)
+    edit_t1(cohort, history, student, (original + 1) % 26)
+    history.undo(cohort, FACULTY)
+    assert history.can_redo()
+
+    edit_t1(cohort, history, student, (original + 2) % 26)
+    assert not history.can_redo()
+    assert history.redo(cohort, FACULTY) is None
+    assert t1(cohort, student) == (original + 2) % 26
+
+
+def test_history_keeps_only_the_latest_batches(cohort):
+    history = EditHistory(capacity=2)
+    students = [enrolment_id(i) for i in (1, 2, 3)]
+    originals = [t1(cohort, s) for s in students]
+    for student, value in zip(students, originals):
+        edit_t1(cohort, history, student, (value + 1) % 26)
+
+    assert history.undo(cohort, FACULTY)[0] == f"T1 of {students[2]}"
+    assert history.undo(cohort, FACULTY)[0] == f"T1 of {students[1]}"
+    # The first batch was evicted, so it can no longer be undone.
+    assert history.undo(cohort, FACULTY) is None
+    assert t1(cohort, students[0]) == (originals[0] + 1) % 26
+
+
+def test_failed_undo_keeps_the_batch(cohort):
+    class FailingDB:
+        def apply_score_edits(self, *args, **kwargs):
+            return None
+
+    student = enrolment_id(1)
+    history = EditHistory()
+    edit_t1(cohort, history, student, (t1(cohort, student) + 1) % 26)
+    assert history.undo(FailingDB(), FACULTY) is None
+    assert history.can_undo() and not history.can_redo()
@@ -0,0 +1,76 @@
+"""
+PercentileEngine's one-pass ranking checked against a naive per-row
+percentile (share of the subject's class scoring at or below the row).
+
+    python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+import analytics.percentiles as percentiles
+from analytics.percentiles import PercentileEngine
+
+
+@pytest.fixture(autouse=True)
+def acronyms(monkeypatch):
+    # Subject names here are their own acronyms; no database lookup.
+    monkeypatch.setattr(percentiles, "subject_acronym", lambda subject: subject)
+
+
+def naive_ranks(rows):
+    """{(enrolment_id, subject): (avg_score, percentile)} by brute force."""
+    ranks = {}
+    for enrolment_id, subject, score in rows:
+        scores = [s for _, other, s in rows if other == subject]
+        ranks[(enrolment_id, subject)] = (
+            sum(scores) / len(scores),
+            sum(s <= score for s in scores) / len(scores) * 100,
+        )
+    return ranks
+
+
+def random_rows(seed):
+    rng = np.random.default_rng(seed)
+    return [(f"S{i:02d}", subject, float(rng.integers(0, 4)) * 0.5 + offset)
+            for i in range(30)
+            for subject, offset in (("DS", 0), ("JAVA", 40), ("OS", -3))
+            if rng.random() < 0.8]
+
+
+@pytest.mark.parametrize("rows", [
+    # Ties inside a subject, a one-student subject, and subjects whose
+    # score ranges overlap or lie far apart.
+    [("S1", "DS", 50), ("S2", "DS", 50), ("S3", "DS", 70), ("S4", "DS", 40),
+     ("S1", "OS", 90), ("S2", "OS", 10), ("S3", "OS", 90), ("S4", "OS", 90),
+     ("S1", "ML", 0),
+     ("S2", "CN", 100), ("S3", "CN", 99.5), ("S4", "CN", 100)],
+    random_rows(1),
+    random_rows(2),
+])
+def test_rank_semester_matches_a_naive_percentile(rows):
+    engine = PercentileEngine.from_class_scores({1: rows})
+    ranked = engine.rank_semester(1)
+
+    expected = naive_ranks(rows)
+    assert len(ranked) == len(expected)
+    for enrolment_id, row in ranked.iterrows():
+        avg, percentile = expected[(enrolment_id, row["subject"])]
+        assert row["avg_score"] == pytest.approx(avg)
+        assert row["percentile"] == pytest.approx(percentile)
+        assert engine.percentile(1, row["acronym"], row["total_score"]) == pytest.approx(percentile)
+
+
+def test_student_comparison_and_empty_semesters():
+    engine = PercentileEngine.from_class_scores({1: [
+        ("S1", "OS", 60), ("S2", "OS", 60), ("S3", "OS", 80), ("S1", "DS", 75), ("S2", "DS", None),
+    ]})
+    comparison = engine.student_comparison(1, "S1")
+    assert comparison.to_dict("list") == {
+        "acronym": ["DS", "OS"],
+        "total_score": [75.0, 60.0],
+        "avg_score": [75.0, pytest.approx(200 / 3)],
+        "percentile": [100.0, pytest.approx(200 / 3)],
+    }
+    assert engine.student_comparison(1, "S9").empty
+    assert engine.rank_semester(2).empty
+    assert np.isnan(engine.percentiles(2, "OS", [1, 2])).all()
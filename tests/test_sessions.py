@@ -0,0 +1,146 @@
+"""
+Session tokens (signature, expiry, revocation, per-terminal resume) and
+the persisted login throttle.
+
+    python -m pytest -q tests
+"""
+import os
+import types
+
+import pytest
+
+import auth.sessions as sessions
+from auth.sessions import LoginThrottle, SessionManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces auth.sessions' wall clock; advance it with clock.now += seconds."""
+    fake = types.SimpleNamespace(now=1_700_000_000.0)
+    monkeypatch.setattr(sessions, "time", types.SimpleNamespace(time=lambda: fake.now))
+    return fake
+
+
+@pytest.fixture
+def manager(tmp_path, clock):
+    return SessionManager(directory=str(tmp_path), secret=b"test-key", ttl=60)
+
+
+def test_token_round_trip(manager):
+    token = manager.issue("faculty", "F001")
+    session = manager.validate(token, "faculty", "F001")
+    assert (session.role, session.subject) == ("faculty", "F001")
+    assert manager.validate(token, "student") is None
+    assert manager.validate(token, "faculty", "F002") is None
+
+
+def test_token_expires(manager, clock):
+    token = manager.issue("student", "S1")
+    clock.now += 59
+    assert manager.validate(token) is not None
+    clock.now += 1
+    assert manager.validate(token) is None
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda t: t[:-2] + ("AA" if t[-2:] != "AA" else "BB"),       # signature
+    lambda t: t.replace(t.split(".")[1], t.split(".")[1][::-1]),  # payload
+    lambda t: "v2" + t[2:],                                      # version
+    lambda t: t.rsplit(".", 1)[0],                               # missing part
+    lambda t: None,
+])
+def test_tampered_token_is_rejected(manager, tamper):
+    assert manager.validate(tamper(manager.issue("faculty", "F001"))) is None
+
+
+def test_token_signed_with_another_key_is_rejected(manager, tmp_path):
+    other = SessionManager(directory=str(tmp_path), secret=b"other-key", ttl=60)
+    assert manager.validate(other.issue("faculty", "F001")) is None
+
+
+def test_revoked_token(manager, tmp_path):
+    revoked, kept = manager.issue("faculty", "F001"), manager.issue("faculty", "F001")
+    manager.revoke(revoked)
+    assert manager.validate(revoked) is None
+    assert manager.validate(kept) is not None
+    # The revocation list is shared through the session directory.
+    other_process = SessionManager(directory=str(tmp_path), secret=b"test-key", ttl=60)
+    assert other_process.validate(revoked) is None
+
+
+def test_revoke_user_only_affects_earlier_tokens(manager, clock):
+    old = manager.issue("student", "S1")
+    other_user = manager.issue("student", "S2")
+    clock.now += 1
+    manager.revoke_user("student", "S1")
+    clock.now += 1
+    new = manager.issue("student", "S1")
+    assert manager.validate(old) is None
+    assert manager.validate(other_user) is not None
+    assert manager.validate(new) is not None
+
+
+def test_resume_is_limited_to_the_saving_terminal(manager, monkeypatch):
+    terminal = types.SimpleNamespace(id="/dev/pts/1:100")
+    monkeypatch.setattr(sessions, "_terminal_id", lambda: terminal.id)
+    token = manager.issue("faculty", "F001")
+    manager.save(token)
+
+    assert manager.resume("faculty", "F001") == token
+    assert manager.resume("faculty", "F002") is None
+    terminal.id = "/dev/pts/2:200"
+    assert manager.resume("faculty", "F001") is None
+    terminal.id = None
+    assert manager.resume("faculty", "F001") is None
+
+    terminal.id = "/dev/pts/1:100"
+    manager.logout(token)
+    assert manager.resume("faculty", "F001") is None
+
+
+@pytest.fixture
+def throttle(tmp_path, clock):
+    return LoginThrottle(max_failures=3, lockout=30, directory=str(tmp_path))
+
+
+def test_lockout_after_max_failures(throttle, clock, tmp_path):
+    for _ in range(2):
+        throttle.failure("faculty", "F001")
+    assert throttle.retry_after("faculty", "F001") == 0
+    # Failures short of a lockout are not written to disk.
+    assert not os.path.exists(tmp_path / "failures.json")
+
+    throttle.failure("faculty", "F001")
+    assert throttle.retry_after("faculty", "F001") == 30
+    assert throttle.retry_after("faculty", "F002") == 0
+    clock.now += 30
+    assert throttle.retry_after("faculty", "F001") == 0
+
+    # Each further failure doubles the lockout.
+    throttle.failure("faculty", "F001")
+    assert throttle.retry_after("faculty", "F001") == 60
+
+
+def test_lockout_survives_a_restart(throttle, tmp_path):
+    for _ in range(3):
+        throttle.failure("student", "S1")
+    restarted = LoginThrottle(max_failures=3, lockout=30, directory=str(tmp_path))
+    assert restarted.retry_after("student", "S1") == 30
+    restarted.success("student", "S1")
+    assert throttle.retry_after("student", "S1") == 0
+
+
+def test_failures_file_is_only_written_when_a_lockout_changes(throttle, tmp_path, monkeypatch):
+    writes = []
+    write_private = sessions._write_private
+    monkeypatch.setattr(sessions, "_write_private", lambda path, data: (writes.append(path), write_private(path, data)))
+
+    throttle.failure("faculty", "F001")
+    throttle.success("faculty", "F001")
+    for _ in range(3):
+        throttle.failure("faculty", "F001")
+    assert len(writes) == 1
+    throttle.success("faculty", "F002")
+    assert len(writes) == 1
+    throttle.success("faculty", "F001")
+    assert len(writes) == 2
@@ -0,0 +1,87 @@
+"""
+Exporting and re-exporting the columnar snapshot while it is being read.
+
+    python -m pytest -q tests
+"""
+import os
+import threading
+
+import numpy as np
+
+from analytics.snapshot import CURRENT, VERSION_PREFIX, GradebookSnapshot, export_snapshot, get_snapshot
+from benchmarks.datagen import enrolment_id
+
+
+def versions(directory):
+    return sorted(entry for entry in os.listdir(directory) if entry.startswith(VERSION_PREFIX))
+
+
+def test_export_round_trip(cohort, tmp_path):
+    directory = str(tmp_path / "snapshot")
+    manifest = export_snapshot(cohort, directory)
+    snapshot = GradebookSnapshot.open(directory)
+
+    assert snapshot.rows == manifest["rows"] == len(cohort.fetch_all_student_scores())
+    expected = sorted((e, s, float(t)) for e, s, t in cohort.fetch_semester_scores_all_students(1))
+    frame = snapshot.semester_scores(1)
+    assert sorted(zip(frame["enrolment_id"], frame["subject"], frame["total_score"])) == expected
+
+
+def test_reexport_keeps_one_previous_version(cohort, tmp_path, monkeypatch):
+    directory = str(tmp_path / "snapshot")
+    monkeypatch.setenv("APT_ANALYTICS_SNAPSHOT", directory)
+    export_snapshot(cohort, directory)
+    first = get_snapshot()
+    first_totals = np.array(first.columns["total"])
+
+    cohort.update_student_test_score(enrolment_id(1), 1, first.subjects[0], "T1", 0)
+    export_snapshot(cohort, directory)
+    second = get_snapshot()
+    assert second is not first and second.directory != first.directory
+    assert get_snapshot() is second
+    # The replaced version stays readable for readers that still have it.
+    assert np.array_equal(first.columns["total"], first_totals)
+
+    export_snapshot(cohort, directory)
+    assert len(versions(directory)) == 2
+    assert not os.path.exists(first.directory)
+
+
+def test_readers_always_find_a_snapshot(cohort, tmp_path):
+    directory = str(tmp_path / "snapshot")
+    export_snapshot(cohort, directory)
+    rows = GradebookSnapshot.open(directory).rows
+    errors, done = [], threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                snapshot = GradebookSnapshot.open(directory)
+                assert len(snapshot.columns["total"]) == snapshot.rows == rows
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for _ in range(20):
+        export_snapshot(cohort, directory)
+    done.set()
+    reader.join()
+    assert errors == []
+
+
+def test_reexport_replaces_an_unversioned_snapshot(cohort, tmp_path):
+    # Snapshots used to be written straight into the directory.
+    directory = str(tmp_path / "snapshot")
+    export_snapshot(cohort, directory)
+    old = os.path.join(directory, versions(directory)[0])
+    for entry in os.listdir(old):
+        os.rename(os.path.join(old, entry), os.path.join(directory, entry))
+    os.rmdir(old)
+    os.remove(os.path.join(directory, CURRENT))
+    assert GradebookSnapshot.open(directory).directory == directory
+
+    export_snapshot(cohort, directory)
+    assert GradebookSnapshot.open(directory).directory != directory
+    export_snapshot(cohort, directory)
+    assert sorted(os.listdir(directory)) == sorted([CURRENT] + versions(directory))
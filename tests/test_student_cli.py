@@ -0,0 +1,39 @@
+"""
+Smoke tests for the student charts, run against a small SQLite cohort.
+
+    python -m pytest -q tests
+"""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pytest
+
+from benchmarks.datagen import enrolment_id
+from cli.student_cli import view_semester_performance
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+def test_view_semester_performance(cohort, monkeypatch):
+    shown = []
+    monkeypatch.setattr(plt, "show", lambda: shown.append(plt.gcf()))
+
+    # Student 2 has scores in semesters 1 to 3.
+    view_semester_performance(enrolment_id(2))
+
+    assert len(shown) == 1
+    line, heatmap = shown[0].axes[:2]
+    assert list(line.lines[0].get_xdata()) == [1, 2, 3]
+    assert [label.get_text() for label in heatmap.get_xticklabels()] == ["Sem 1", "Sem 2", "Sem 3"]
+
+
+def test_view_semester_performance_without_scores(cohort, monkeypatch):
+    monkeypatch.setattr(plt, "show", lambda: pytest.fail("no chart expected"))
+
+    view_semester_performance("NOSUCHSTUDENT")
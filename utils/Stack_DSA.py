@@ -1,28 +1,66 @@
 class Stack_DSA:
-    def __init__(self):
-        self.stack = []
+    """
+    Array-backed stack on a circular buffer.
+
+    With a capacity, push/pop/peek are O(1) and pushing onto a full stack
+    evicts the oldest (bottom) item, so the stack never holds more than
+    `capacity` items. Without one, the buffer doubles as needed.
+    """
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.stack = [None] * (capacity or 8)
+        self._bottom = 0  # index of the oldest item
+        self._size = 0
+
+    def _index(self, offset):
+        return (self._bottom + offset) % len(self.stack)
 
     def push(self, item):
-        self.stack.append(item)
+        """Pushes item; returns the evicted oldest item if the stack was full, else None."""
+        evicted = None
+        if self._size == len(self.stack):
+            if self.capacity is None:
+                self.stack = self.get_all()[::-1] + [None] * len(self.stack)
+                self._bottom = 0
+            else:
+                evicted = self.stack[self._bottom]
+                self.stack[self._bottom] = None
+                self._bottom = self._index(1)
+                self._size -= 1
+        self.stack[self._index(self._size)] = item
+        self._size += 1
+        return evicted
 
     def pop(self):
         if not self.is_empty():
-            return self.stack.pop()
+            top = self._index(self._size - 1)
+            item = self.stack[top]
+            self.stack[top] = None
+            self._size -= 1
+            return item
         else:
             return None
 
     def peek(self):
         if not self.is_empty():
-            return self.stack[-1]
+            return self.stack[self._index(self._size - 1)]
         else:
             return None
 
     def is_empty(self):
-        return len(self.stack) == 0
+        return self._size == 0
 
     def size(self):
-        return len(self.stack)
+        return self._size
+
+    def clear(self):
+        self.stack = [None] * len(self.stack)
+        self._bottom = 0
+        self._size = 0
 
     def get_all(self):
         # Returns a list of all elements, with the top element first.
-        return self.stack[::-1]
+        return [self.stack[self._index(i)] for i in range(self._size - 1, -1, -1)]
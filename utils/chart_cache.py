@@ -0,0 +1,180 @@
+"""
+Content-addressed on-disk cache for rendered chart PNGs.
+
+A chart is identified by a SHA-256 of its kind and the exact data it
+plots, so an unchanged chart (e.g. a subject whose T1-T4 have not changed
+since the last report run, or two students with the same marks) is read
+back from disk instead of being re-rendered by matplotlib.
+
+The cache is shared by every process using the same directory (batch
+report workers included). Its total size is capped; when a write pushes
+it over the cap, the least recently used files (oldest modification time,
+which is bumped on every hit) are evicted.
+
+Settings (environment variables):
+  APT_CHART_CACHE_DIR     cache directory (default ~/.cache/academic_performance_tracker/charts)
+  APT_CHART_CACHE_MAX_MB  size cap in MB (default 64; 0 disables the cache)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from io import BytesIO
+
+# Bump when chart code changes so stale renders are never reused.
+CHART_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "academic_performance_tracker", "charts")
+
+
+class ChartCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get("APT_CHART_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("APT_CHART_CACHE_MAX_MB", "64")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.enabled = max_bytes > 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = None  # estimated bytes on disk, scanned lazily
+
+    def key(self, kind, data):
+        """Hex digest identifying a chart of `kind` drawn from `data` (any JSON-serializable value)."""
+        payload = json.dumps([CHART_CACHE_VERSION, _matplotlib_version(), kind, data],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".png")
+
+    def get(self, key):
+        """Returns the cached PNG bytes for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return png
+
+    def put(self, key, png):
+        """Stores PNG bytes under key, evicting least recently used entries if over the size cap."""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial PNG.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # caching is best-effort; the chart was rendered anyway
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(png)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_or_render(self, kind, data, render):
+        """
+        Returns an in-memory PNG buffer for the chart: from the cache if the
+        same kind/data was rendered before, otherwise by calling render()
+        (which must return a PNG buffer) and caching the result.
+        """
+        if not self.enabled:
+            return render()
+        key = self.key(kind, data)
+        png = self.get(key)
+        if png is None:
+            buffer = render()
+            png = buffer.getvalue()
+            self.put(key, png)
+        return BytesIO(png)
+
+    def _entries(self):
+        """[(mtime, size, path)] for every cached PNG."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".png"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Re-scan, since other processes may have added or evicted files;
+        # then delete oldest-first until the cache is 10% under its cap.
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+        self._size = total
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self._size if self._size is not None else self._scan_size(),
+                "max_bytes": self.max_bytes,
+                "directory": self.directory,
+            }
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._size = 0
+
+
+@lru_cache(maxsize=1)
+def _matplotlib_version():
+    # Read from package metadata so a cache hit never imports matplotlib.
+    try:
+        from importlib.metadata import version
+        return version("matplotlib")
+    except Exception:
+        return "unknown"
+
+
+_cache = None
+
+
+def get_chart_cache():
+    """Returns this process's ChartCache, created on first use."""
+    global _cache
+    if _cache is None:
+        _cache = ChartCache()
+    return _cache
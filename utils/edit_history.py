@@ -0,0 +1,68 @@
+from utils.Stack_DSA import Stack_DSA
+
+EDIT_HISTORY_SIZE = 20
+
+
+class EditHistory:
+    """
+    Bounded undo/redo history of score edits for one faculty session.
+
+    Each entry is one batch of edits as returned by
+    DBOperations.apply_score_edits: a list of
+    (enrolment_id, semester, subject, test_field, old_value, new_value, new_total).
+    Undo and redo replay a whole batch through apply_score_edits, so each
+    one is a single transaction with its own audit log entries. Only the
+    most recent `capacity` batches are kept; recording a new batch clears
+    the redo history.
+    """
+
+    def __init__(self, capacity=EDIT_HISTORY_SIZE):
+        self.undo_stack = Stack_DSA(capacity)
+        self.redo_stack = Stack_DSA(capacity)
+
+    def record(self, label, results):
+        """Records an applied batch (skipped if nothing changed)."""
+        if results:
+            self.undo_stack.push((label, results))
+            self.redo_stack.clear()
+
+    def can_undo(self):
+        return not self.undo_stack.is_empty()
+
+    def can_redo(self):
+        return not self.redo_stack.is_empty()
+
+    def undo(self, db, faculty_id):
+        """
+        Restores the previous values of the most recent batch.
+        Returns (label, results, skipped) or None if there is nothing to undo
+        or the update failed (the batch then stays on the undo stack).
+        skipped counts tests that had no previous value (NULL) and were left as they are.
+        """
+        return self._replay(db, faculty_id, self.undo_stack, self.redo_stack, "Undo", restore_old=True)
+
+    def redo(self, db, faculty_id):
+        """Re-applies the most recently undone batch. Same return value as undo."""
+        return self._replay(db, faculty_id, self.redo_stack, self.undo_stack, "Redo", restore_old=False)
+
+    @staticmethod
+    def _replay(db, faculty_id, source, target, action_prefix, restore_old):
+        if source.is_empty():
+            return None
+        label, results = source.peek()
+        edits = []
+        skipped = 0
+        for enrolment_id, semester, subject, test_field, old_value, new_value, _ in results:
+            value = old_value if restore_old else new_value
+            if value is None:
+                skipped += 1
+                continue
+            edits.append((enrolment_id, semester, subject, test_field, value))
+
+        applied = db.apply_score_edits(faculty_id, edits, action_prefix=action_prefix)
+        if applied is None:
+            return None
+        source.pop()
+        # Keep the original old/new orientation so the entry can be replayed back.
+        target.push((label, results))
+        return label, applied, skipped
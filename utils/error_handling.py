@@ -1,6 +1,8 @@
 from rich.console import Console
 
-console = Console()
+# Errors go to stderr so they never mix with data written to stdout
+# (e.g. JSON/CSV emitted by the scripted subcommands).
+console = Console(stderr=True)
 
 def log_error(message, error):
     console.print(f"[red]{message}: {error}[/red]")